@@ -1,7 +1,8 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from src.audit_api.deps import get_audit_db
 from src.audit_api import service
-from src.audit_api.schemas import SessionOut, AuditEventOut
+from src.audit_api.schemas import SessionOut, TimelinePage
 
 app = FastAPI(
     title="MindForge Audit API",
@@ -15,12 +16,28 @@ def sessions(limit: int = 50, db=Depends(get_audit_db)):
     return service.list_sessions(db, limit)
 
 
-@app.get("/sessions/{session_id}/timeline", response_model=list[AuditEventOut])
-def timeline(session_id: str, db=Depends(get_audit_db)):
-    events = service.get_session_timeline(db, session_id)
-    if not events:
+@app.get("/sessions/{session_id}/timeline", response_model=TimelinePage)
+def timeline(
+    session_id: str,
+    cursor: int = Query(0, ge=0, description="id последнего полученного события"),
+    limit: int = Query(service.DEFAULT_PAGE_SIZE, ge=1, le=service.MAX_PAGE_SIZE),
+    db=Depends(get_audit_db),
+):
+    page = service.get_timeline_page(db, session_id, cursor, limit)
+    if not page["items"] and cursor == 0:
         raise HTTPException(status_code=404, detail="Session not found")
-    return events
+    return page
+
+
+@app.get("/sessions/{session_id}/timeline.ndjson")
+def timeline_export(session_id: str, db=Depends(get_audit_db)):
+    # 404 до начала стрима: после первого байта статус уже не поменять
+    if not service.session_has_events(db, session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return StreamingResponse(
+        service.iter_session_ndjson(db, session_id),
+        media_type="application/x-ndjson",
+    )
 
 
 @app.get("/sessions/{session_id}/why")
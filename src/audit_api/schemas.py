@@ -13,6 +13,7 @@ class SessionOut(BaseModel):
 
 
 class AuditEventOut(BaseModel):
+    id: Optional[int] = None
     ts: str
     event_type: str
     action: str
@@ -21,3 +22,8 @@ class AuditEventOut(BaseModel):
     policy: Optional[str]
     source: Optional[str]
     payload: Dict[str, Any]
+
+
+class TimelinePage(BaseModel):
+    items: List[AuditEventOut]
+    next_cursor: Optional[int]    # id последнего события страницы
@@ -1,78 +1,174 @@
-from typing import List, Dict, Any
+import json
+from typing import Any, Dict, Iterator, List, Optional
 from src.core.audit.db import AuditDB
 
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+SQL_LIST_SESSIONS = """
+    SELECT *
+    FROM sessions
+    ORDER BY started_at DESC
+    LIMIT ?
+"""
+
+_TIMELINE_COLUMNS = """
+    SELECT
+        id,
+        ts,
+        event_type,
+        action,
+        state,
+        decision,
+        policy,
+        source,
+        payload
+    FROM audit_events
+"""
+
+# keyset pagination по (ts, id): курсор = id последнего отданного события
+# (idx_audit_session_ts содержит rowid → без временной сортировки)
+SQL_TIMELINE_FIRST = _TIMELINE_COLUMNS + """
+    WHERE session_id = ?
+    ORDER BY ts, id
+    LIMIT ?
+"""
+
+SQL_TIMELINE_PAGE = _TIMELINE_COLUMNS + """
+    WHERE session_id = ?
+      AND (ts, id) > (SELECT ts, id FROM audit_events WHERE id = ?)
+    ORDER BY ts, id
+    LIMIT ?
+"""
+
+SQL_SESSION_HAS_EVENTS = """
+    SELECT 1
+    FROM audit_events
+    WHERE session_id = ?
+    LIMIT 1
+"""
+
+SQL_DECISION_COUNTS = """
+    SELECT decision, COUNT(*) AS n
+    FROM audit_events
+    WHERE session_id = ?
+    GROUP BY decision
+"""
+
+SQL_DISTINCT_POLICIES = """
+    SELECT DISTINCT policy
+    FROM audit_events
+    WHERE session_id = ? AND policy IS NOT NULL
+"""
+
 
 def list_sessions(db: AuditDB, limit: int = 50) -> List[Dict]:
-    with db._conn() as conn:
-        rows = conn.execute(
-            """
-            SELECT *
-            FROM sessions
-            ORDER BY started_at DESC
-            LIMIT ?
-            """,
-            (limit,),
-        ).fetchall()
+    with db._read() as conn:
+        rows = conn.execute(SQL_LIST_SESSIONS, (limit,)).fetchall()
 
     return [dict(r) for r in rows]
 
 
+def session_has_events(db: AuditDB, session_id: str) -> bool:
+    with db._read() as conn:
+        return conn.execute(SQL_SESSION_HAS_EVENTS, (session_id,)).fetchone() is not None
+
+
+def _fetch_page(db: AuditDB, session_id: str, cursor: int, limit: int) -> List[Any]:
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    with db._read() as conn:
+        if not cursor:
+            return conn.execute(SQL_TIMELINE_FIRST, (session_id, limit)).fetchall()
+        return conn.execute(SQL_TIMELINE_PAGE, (session_id, cursor, limit)).fetchall()
+
+
+def _iter_rows(db: AuditDB, session_id: str, page_size: int) -> Iterator[Any]:
+    """
+    Весь таймлайн страницами: память = одна страница,
+    reader-соединение берётся на время страницы, а не на весь обход.
+    """
+    cursor = 0
+
+    while True:
+        rows = _fetch_page(db, session_id, cursor, page_size)
+        if not rows:
+            return
+
+        yield from rows
+        cursor = rows[-1]["id"]
+
+
+def _event(row: Any) -> Dict[str, Any]:
+    item = dict(row)
+    item["payload"] = json.loads(item["payload"]) if item.get("payload") else {}
+    return item
+
+
+def get_timeline_page(
+    db: AuditDB,
+    session_id: str,
+    cursor: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Dict[str, Any]:
+    """
+    Одна страница таймлайна. next_cursor=None → событий больше нет.
+    """
+    rows = _fetch_page(db, session_id, cursor, limit)
+    items = [_event(r) for r in rows]
+
+    next_cursor: Optional[int] = None
+    if len(rows) >= max(1, min(limit, MAX_PAGE_SIZE)):
+        next_cursor = rows[-1]["id"]
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
 def get_session_timeline(db: AuditDB, session_id: str) -> List[Dict]:
-    with db._conn() as conn:
-        rows = conn.execute(
-            """
-            SELECT
-                ts,
-                event_type,
-                action,
-                state,
-                decision,
-                policy,
-                source,
-                payload
-            FROM audit_events
-            WHERE session_id = ?
-            ORDER BY ts
-            """,
-            (session_id,),
-        ).fetchall()
-
-    result = []
-    for r in rows:
-        item = dict(r)
-        if item.get("payload"):
-            import json
-            item["payload"] = json.loads(item["payload"])
-        else:
-            item["payload"] = {}
-        result.append(item)
+    """
+    Полный таймлайн сессии (ORDER BY ts), читается страницами.
+    """
+    return [_event(r) for r in _iter_rows(db, session_id, DEFAULT_PAGE_SIZE)]
 
-    return result
+
+def iter_session_ndjson(
+    db: AuditDB,
+    session_id: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[str]:
+    """
+    Потоковый экспорт (NDJSON). Память = одна страница.
+    payload уже хранится как JSON — вставляется без повторного парсинга.
+    """
+    for r in _iter_rows(db, session_id, page_size):
+        item = dict(r)
+        payload = item.pop("payload") or "{}"
+        head = json.dumps(item, ensure_ascii=False)
+        yield f'{head[:-1]}, "payload": {payload}}}\n'
 
 
 def explain_session(db: AuditDB, session_id: str) -> Dict[str, Any]:
     """
     WHY API — краткое объяснение, что происходило
+    (агрегация на стороне SQL, таймлайн не загружается)
     """
-    timeline = get_session_timeline(db, session_id)
+    with db._read() as conn:
+        counts = {
+            r["decision"]: r["n"]
+            for r in conn.execute(SQL_DECISION_COUNTS, (session_id,)).fetchall()
+        }
+        policies = [
+            r["policy"]
+            for r in conn.execute(SQL_DISTINCT_POLICIES, (session_id,)).fetchall()
+        ]
 
     summary = {
         "session_id": session_id,
-        "total_events": len(timeline),
-        "denies": 0,
-        "allows": 0,
-        "policies_triggered": set(),
+        "total_events": sum(counts.values()),
+        "denies": counts.get("DENY", 0),
+        "allows": counts.get("ALLOW", 0),
+        "policies_triggered": policies,
     }
-
-    for e in timeline:
-        if e.get("decision") == "DENY":
-            summary["denies"] += 1
-        if e.get("decision") == "ALLOW":
-            summary["allows"] += 1
-        if e.get("policy"):
-            summary["policies_triggered"].add(e["policy"])
-
-    summary["policies_triggered"] = list(summary["policies_triggered"])
     summary["explanation"] = (
         "Система работала в контролируемом режиме. "
         "Все действия проходили через политики и FSM."
@@ -0,0 +1,331 @@
+# src/bot/ai/categorizer.py
+"""
+File: src/bot/ai/categorizer.py
+
+Purpose:
+Fast-path task categorization before falling back to the LLM.
+
+Responsibilities:
+- Keyword / regex scoring with patterns compiled once at import
+- Optional multinomial naive Bayes trained from tasks in the task store
+  whose category came from the LLM or from the user (bag of word stems)
+- LLM router only when neither path is confident enough
+- Report category, confidence and the path taken (keywords / classifier / llm)
+
+IMPORTANT:
+- The fast paths are pure CPU work (microseconds), no I/O
+- Retraining runs in a background thread; categorize() never waits for it
+- The classifier never learns from its own (or keyword) labels
+- Categories are the closed set used by the Task Manager
+"""
+
+import asyncio
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+from src.bot.config import settings
+
+log = logging.getLogger("mindforge.tasks.categorizer")
+
+CATEGORIES: Tuple[str, ...] = ("market", "osint", "analysis", "llm", "workflow", "build")
+DEFAULT_CATEGORY = "llm"
+
+CONFIDENCE_THRESHOLD = 0.6
+KEYWORD_SMOOTHING = 1.0      # conf = top / (total + smoothing)
+MIN_TRAINING_TASKS = 20
+MAX_TRAINING_TASKS = 5000    # newest labeled tasks used for a fit
+RETRAIN_INTERVAL = 600.0     # seconds
+
+PATH_KEYWORDS = "keywords"
+PATH_CLASSIFIER = "classifier"
+PATH_LLM = "llm"
+PATH_DEFAULT = "default"
+
+# категория указана пользователем явно (/taskadd <категория> <текст>)
+SOURCE_USER = "user"
+
+# чему классификатор может учиться: только внешним меткам, не своим
+TRAINING_SOURCES: Tuple[str, ...] = (SOURCE_USER, PATH_LLM)
+
+# category → ((weight, stems / phrases), ...); стемы матчятся с начала слова
+KEYWORDS: Dict[str, Tuple[Tuple[float, Tuple[str, ...]], ...]] = {
+    "market": (
+        (2.0, ("анализ рынка", "market research", "конкурентн")),
+        (1.0, ("рын", "конкурент", "цен", "спрос", "продаж", "маркет", "market", "ниш", "клиент", "бизнес")),
+    ),
+    "osint": (
+        (2.0, ("osint", "открыт источник", "whois")),
+        (1.0, ("развед", "соцсет", "профил", "домен", "утечк", "найди информац", "пробей", "досье")),
+    ),
+    "analysis": (
+        (1.0, ("анализ", "проанализ", "сравн", "отчет", "отчёт", "метрик", "статист", "данны", "исследов", "оцен")),
+    ),
+    "llm": (
+        (1.0, ("напиши", "сгенерир", "текст", "промпт", "перевед", "объясни", "стать", "пост", "письм", "резюм")),
+    ),
+    "workflow": (
+        (2.0, ("workflow", "pipeline", "пайплайн", "многошаг")),
+        (1.0, ("процесс", "автоматиз", "этап", "сценари", "интеграц", "цепочк")),
+    ),
+    "build": (
+        (2.0, ("фундамент", "котлован", "бетон")),
+        (1.0, ("строит", "арматур", "дом", "стен", "кровл", "смет", "кирпич", "участ")),
+    ),
+}
+
+
+def _compile(keywords) -> Dict[str, List[Tuple[float, Pattern]]]:
+    compiled: Dict[str, List[Tuple[float, Pattern]]] = {}
+    for category, groups in keywords.items():
+        compiled[category] = [
+            (
+                weight,
+                re.compile(
+                    r"\b(?:" + "|".join(re.escape(s) for s in stems) + r")\w*",
+                    re.IGNORECASE,
+                ),
+            )
+            for weight, stems in groups
+        ]
+    return compiled
+
+
+_PATTERNS = _compile(KEYWORDS)
+_TOKEN = re.compile(r"\w+")
+
+
+def parse_category(answer: str) -> Optional[str]:
+    """
+    Category from an LLM answer: the whole answer is one category, or
+    exactly one category occurs as a whole word. An echoed prompt (all
+    categories) or an error text → None.
+    """
+    answer = answer.lower()
+    word = answer.strip(" \t\n.,!:;\"'`")
+    if word in CATEGORIES:
+        return word
+
+    found = {w for w in _TOKEN.findall(answer) if w in CATEGORIES}
+    return found.pop() if len(found) == 1 else None
+
+
+def stems(text: str) -> List[str]:
+    # грубый стемминг: первые 6 букв (русская морфология), короткие слова — шум
+    return [t[:6] for t in _TOKEN.findall(text.lower()) if len(t) >= 3 and not t.isdigit()]
+
+
+@dataclass(frozen=True)
+class Categorization:
+    category: str
+    confidence: Optional[float]
+    path: str
+
+
+# =====================================================
+# Keyword scoring
+# =====================================================
+def keyword_scores(text: str) -> Dict[str, float]:
+    scores: Dict[str, float] = {}
+    for category, patterns in _PATTERNS.items():
+        score = sum(weight * len(p.findall(text)) for weight, p in patterns)
+        if score:
+            scores[category] = score
+    return scores
+
+
+def keyword_guess(text: str) -> Optional[Tuple[str, float]]:
+    scores = keyword_scores(text)
+    if not scores:
+        return None
+
+    best = max(scores, key=scores.get)
+    return best, scores[best] / (sum(scores.values()) + KEYWORD_SMOOTHING)
+
+
+# =====================================================
+# Naive Bayes (bag of stems)
+# =====================================================
+class NaiveBayesClassifier:
+    def __init__(self) -> None:
+        self.priors: Dict[str, float] = {}
+        self.likelihoods: Dict[str, Dict[str, float]] = {}
+        self.unknown: Dict[str, float] = {}
+        self.samples = 0
+
+    @property
+    def trained(self) -> bool:
+        return len(self.priors) >= 2
+
+    def fit(self, samples: Iterable[Tuple[str, str]]) -> "NaiveBayesClassifier":
+        docs: Dict[str, int] = Counter()
+        words: Dict[str, Counter] = {}
+
+        for text, category in samples:
+            docs[category] += 1
+            words.setdefault(category, Counter()).update(stems(text))
+
+        total = sum(docs.values())
+        vocabulary = {w for counter in words.values() for w in counter}
+        v = len(vocabulary) or 1
+
+        self.samples = total
+        self.priors = {c: math.log(n / total) for c, n in docs.items()}
+        self.likelihoods, self.unknown = {}, {}
+        for c, counter in words.items():
+            denom = sum(counter.values()) + v    # Laplace smoothing
+            self.likelihoods[c] = {w: math.log((n + 1) / denom) for w, n in counter.items()}
+            self.unknown[c] = math.log(1 / denom)
+        return self
+
+    def predict(self, text: str) -> Optional[Tuple[str, float]]:
+        if not self.trained:
+            return None
+
+        tokens = stems(text)
+        if not tokens:
+            return None
+
+        logp = {
+            c: prior + sum(self.likelihoods[c].get(t, self.unknown[c]) for t in tokens)
+            for c, prior in self.priors.items()
+        }
+
+        # softmax → вероятность лучшего класса как confidence
+        top = max(logp.values())
+        exp = {c: math.exp(v - top) for c, v in logp.items()}
+        best = max(exp, key=exp.get)
+        return best, exp[best] / sum(exp.values())
+
+
+# =====================================================
+# Categorizer
+# =====================================================
+class TaskCategorizer:
+    def __init__(
+        self,
+        threshold: float = CONFIDENCE_THRESHOLD,
+        *,
+        min_training_tasks: int = MIN_TRAINING_TASKS,
+        retrain_interval: float = RETRAIN_INTERVAL,
+    ) -> None:
+        self.threshold = threshold
+        self.min_training_tasks = min_training_tasks
+        self.retrain_interval = retrain_interval
+
+        self.classifier = NaiveBayesClassifier()
+        self._trained_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh: Optional[asyncio.Task] = None
+
+        self.paths: Counter = Counter()
+
+    # -------------------------------------------------
+    # Training
+    # -------------------------------------------------
+    def train(self, samples: Sequence[Tuple[str, str]]) -> bool:
+        samples = [(t, c) for t, c in samples if c in CATEGORIES and t]
+        self._trained_at = time.monotonic()
+
+        if len(samples) < self.min_training_tasks:
+            return False
+
+        classifier = NaiveBayesClassifier().fit(samples)
+        self.classifier = classifier  # атомарная замена ссылки
+        log.info("CATEGORIZER_TRAINED | samples=%s", classifier.samples)
+        return classifier.trained
+
+    def train_from_store(self, store) -> bool:
+        return self.train(store.labeled(TRAINING_SOURCES, MAX_TRAINING_TASKS))
+
+    def _retrain(self) -> None:
+        # worker thread: выборка из SQLite + fit
+        with self._lock:
+            try:
+                from src.bot.ai.task_store import task_store
+                self.train_from_store(task_store)
+            except Exception:
+                self._trained_at = time.monotonic()
+                log.exception("CATEGORIZER_TRAIN_FAILED")
+
+    def _maybe_retrain(self) -> None:
+        """
+        Start a background refresh when the model is stale; the current
+        model keeps serving until the new one is swapped in.
+        """
+        if self._trained_at is not None and time.monotonic() - self._trained_at < self.retrain_interval:
+            return
+        if self._refresh is not None and not self._refresh.done():
+            return
+
+        self._refresh = asyncio.ensure_future(asyncio.to_thread(self._retrain))
+
+    # -------------------------------------------------
+    # Fast path
+    # -------------------------------------------------
+    def categorize_local(self, text: str) -> Optional[Categorization]:
+        """
+        Keywords, then the classifier. None if neither is confident.
+        """
+        guess = keyword_guess(text)
+        if guess is not None and guess[1] >= self.threshold:
+            return Categorization(guess[0], round(guess[1], 3), PATH_KEYWORDS)
+
+        guess = self.classifier.predict(text)
+        if guess is not None and guess[1] >= self.threshold:
+            return Categorization(guess[0], round(guess[1], 3), PATH_CLASSIFIER)
+
+        return None
+
+    async def categorize(self, text: str) -> Categorization:
+        self._maybe_retrain()
+
+        result = self.categorize_local(text)
+        if result is None:
+            result = await self._ask_llm(text)
+
+        self.paths[result.path] += 1
+        log.debug("CATEGORIZED | %s | %s | %s", result.category, result.path, result.confidence)
+        return result
+
+    async def _ask_llm(self, text: str) -> Categorization:
+        from src.bot.ai.llm_router import generate_answer
+
+        prompt = (
+            "Определи категорию задачи одного слова из списка: "
+            f"{', '.join(CATEGORIES)}.\n"
+            f"Задача: {text}\nТолько одно слово:"
+        )
+        try:
+            # generate_answer поднимает ошибки: текст ошибки роутера — не метка
+            answer = await generate_answer(prompt)
+        except Exception:
+            log.warning("CATEGORIZER_LLM_FAILED", exc_info=True)
+            return Categorization(DEFAULT_CATEGORY, None, PATH_DEFAULT)
+
+        category = parse_category(answer)
+        if category is None:
+            return Categorization(DEFAULT_CATEGORY, None, PATH_DEFAULT)
+        return Categorization(category, None, PATH_LLM)
+
+    def stats(self) -> Dict[str, object]:
+        total = sum(self.paths.values())
+        local = self.paths[PATH_KEYWORDS] + self.paths[PATH_CLASSIFIER]
+        return {
+            "paths": dict(self.paths),
+            "local_ratio": (local / total) if total else None,
+            "classifier_samples": self.classifier.samples,
+            "threshold": self.threshold,
+        }
+
+
+# Global categorizer
+task_categorizer = TaskCategorizer(
+    threshold=settings.TASK_CATEGORIZER_THRESHOLD,
+    min_training_tasks=settings.TASK_CATEGORIZER_MIN_SAMPLES,
+)
@@ -0,0 +1,185 @@
+# src/bot/ai/llm_cache.py
+"""
+File: src/bot/ai/llm_cache.py
+
+Purpose:
+Response cache for LLM generations (local LLaMA calls cost seconds of CPU).
+
+Responsibilities:
+- Build a stable key: sha256(system prompt + normalized user text + generation params)
+- Memory tier: bounded LRU + TTL (src.core.cache, shared with the policy engine)
+- Optional disk tier: SQLite table that survives restarts
+- Count hits per tier / misses for observability
+- get_async / put_async for the event loop: SQLite runs in a worker thread
+
+IMPORTANT:
+- Callers opt out per call (route(..., use_cache=False)) for generations
+  that are expected to differ every time
+- Error responses must never be stored
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from src.core.cache import LRUTTLCache
+from src.core.sqlite_pool import SQLiteConnectionPool
+
+log = logging.getLogger("mindforge.llm.cache")
+
+DEFAULT_MAXSIZE = 512
+DEFAULT_TTL = 3600.0            # memory tier, seconds
+DEFAULT_DISK_TTL = 7 * 86400.0  # disk tier, seconds
+
+SQL_CREATE = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key        TEXT PRIMARY KEY,
+    response   TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
+"""
+SQL_GET = "SELECT response FROM llm_cache WHERE key=? AND expires_at>?"
+SQL_PUT = """
+INSERT OR REPLACE INTO llm_cache (key, response, created_at, expires_at)
+VALUES (?, ?, ?, ?)
+"""
+SQL_PURGE = "DELETE FROM llm_cache WHERE expires_at<=?"
+
+PURGE_EVERY = 256  # disk writes between expired-row purges
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFC + collapsed whitespace. Case is kept: it can change the answer.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(system_prompt: str, user_text: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    payload = json.dumps(
+        [system_prompt.strip(), normalize_text(user_text), dict(params or {})],
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        *,
+        db_path: Optional[str | Path] = None,
+        disk_ttl: float = DEFAULT_DISK_TTL,
+    ) -> None:
+        self.memory = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk_ttl = disk_ttl
+
+        self._pool: Optional[SQLiteConnectionPool] = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._pool = SQLiteConnectionPool(db_path, readers=2)
+            with self._pool.writer() as conn:
+                conn.executescript(SQL_CREATE)
+
+        self.disk_hits = 0
+        self.disk_writes = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None or self._pool is None:
+            return value
+        return self._get_disk(key)
+
+    def put(self, key: str, response: str) -> None:
+        self.memory.put(key, response)
+        if self._pool is not None:
+            self._put_disk(key, response)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        # memory tier — inline (O(1)), SQLite — не на event loop
+        value = self.memory.get(key)
+        if value is not None or self._pool is None:
+            return value
+        return await asyncio.to_thread(self._get_disk, key)
+
+    async def put_async(self, key: str, response: str) -> None:
+        self.memory.put(key, response)
+        if self._pool is not None:
+            await asyncio.to_thread(self._put_disk, key, response)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+    def _get_disk(self, key: str) -> Optional[str]:
+        try:
+            with self._pool.reader() as conn:
+                row = conn.execute(SQL_GET, (key, time.time())).fetchone()
+        except Exception:
+            log.exception("LLM_CACHE_DISK_READ_FAILED")
+            return None
+
+        if row is None:
+            return None
+
+        # promote в память: следующий hit без SQLite
+        self.disk_hits += 1
+        self.memory.put(key, row[0])
+        return row[0]
+
+    def _put_disk(self, key: str, response: str) -> None:
+        now = time.time()
+        try:
+            with self._pool.writer() as conn:
+                conn.execute(SQL_PUT, (key, response, now, now + self.disk_ttl))
+                self.disk_writes += 1
+                if self.disk_writes % PURGE_EVERY == 0:
+                    conn.execute(SQL_PURGE, (now,))
+        except Exception:
+            log.exception("LLM_CACHE_DISK_WRITE_FAILED")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        self.memory.clear()
+        if self._pool is not None:
+            with self._pool.writer() as conn:
+                conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self.memory.stats()
+
+        # memory miss, закрытый диском, — это hit кэша в целом
+        hits = memory["hits"] + self.disk_hits
+        misses = memory["misses"] - self.disk_hits
+        total = hits + misses
+
+        return {
+            "size": memory["size"],
+            "maxsize": memory["maxsize"],
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "hits": hits,
+            "misses": misses,
+            "evictions": memory["evictions"],
+            "hit_ratio": (hits / total) if total else None,
+            "disk": self._pool is not None,
+        }
@@ -6,9 +6,27 @@ LLM Client module:
 
 from pathlib import Path
 import asyncio
-from llama_cpp import Llama
+import threading
+from typing import Any, AsyncIterator, Dict, Hashable, Optional
+from src.bot.ai.llm_prefix import PrefixStateCache
+from src.bot.ai.llm_scheduler import InferenceScheduler
 from src.bot.config import settings
 
+# Параметры генерации по умолчанию (часть ключа LLM-кэша)
+GENERATION_DEFAULTS = {
+    "max_tokens": 256,
+    "temperature": 0.7,
+}
+
+
+WARMUP_PROMPT = "Привет"
+
+_STREAM_END = object()
+
+
+class ModelWarmingUp(RuntimeError):
+    """Model is being loaded by the startup warm-up; retry later."""
+
 
 # -------------------------------------------------------------------
 # 1. MOCK CLIENT (для тестов / fallback)
@@ -16,59 +34,204 @@ from src.bot.config import settings
 class LLMClient:
     """Mock LLM client."""
 
-    def generate(self, prompt: str) -> str:
+    is_ready = True
+
+    def start_warmup(self, prefix: str = ""):
+        return None
+
+    def generate(self, prompt: str, **params) -> str:
         return f"[MOCK LLM] Response to: {prompt}"
 
+    async def generate_stream(self, prompt: str, **params) -> AsyncIterator[str]:
+        for word in self.generate(prompt).split(" "):
+            yield word + " "
+
 
 # -------------------------------------------------------------------
 # 2. Local LLaMA Client
 # -------------------------------------------------------------------
 class LocalLLMClient:
-    """Local LLaMA model using llama-cpp-python."""
-
-    def __init__(self):
-        self._model = None
-
-    def _load_model(self):
-        if self._model is not None:
-            return
-
-        print("🔥 Local LLaMA loading...")
-
-        model_path = Path(settings.LOCAL_LLM_MODEL_PATH).resolve()
-
-        if not model_path.exists():
-            raise RuntimeError(
-                f"Local LLaMA model not found: {model_path}"
-            )
-
-        self._model = Llama(
-            model_path=str(model_path),
-            n_ctx=getattr(settings, "LOCAL_LLM_CTX", 4096),
-            n_threads=getattr(settings, "LOCAL_LLM_THREADS", 8),
-            n_gpu_layers=0,  # SAFE DEFAULT (portable)
-            verbose=False,
+    """
+    Local LLaMA model using llama-cpp-python.
+
+    Calls go through InferenceScheduler: a bounded queue, a fixed number
+    of workers (one Llama instance per worker) and round-robin by user.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None):
+        self.workers = workers or getattr(settings, "LOCAL_LLM_WORKERS", 1)
+        self.scheduler = InferenceScheduler(
+            workers=self.workers,
+            max_queue=max_queue or getattr(settings, "LOCAL_LLM_QUEUE_SIZE", 32),
         )
+        self._models: Dict[int, Any] = {}
+        self._load_lock = threading.Lock()
+        self.prefix_cache = PrefixStateCache()
+
+        self._ready = threading.Event()
+        self._warmup_thread: Optional[threading.Thread] = None
+        self.warmup_error: Optional[BaseException] = None
+
+    def _load_model(self, slot: int = 0):
+        model = self._models.get(slot)
+        if model is not None:
+            return model
+
+        with self._load_lock:
+            if slot in self._models:
+                return self._models[slot]
+
+            print(f"🔥 Local LLaMA loading (worker {slot})...")
+
+            model_path = Path(settings.LOCAL_LLM_MODEL_PATH).resolve()
+
+            if not model_path.exists():
+                raise RuntimeError(
+                    f"Local LLaMA model not found: {model_path}"
+                )
+
+            # lazy: модуль импортируется и без llama-cpp (mock / тесты)
+            from llama_cpp import Llama
+
+            # потоки CPU делятся между воркерами — без oversubscription
+            threads = getattr(settings, "LOCAL_LLM_THREADS", 8)
+
+            model = Llama(
+                model_path=str(model_path),
+                n_ctx=getattr(settings, "LOCAL_LLM_CTX", 4096),
+                n_threads=max(1, threads // self.workers),
+                n_gpu_layers=0,  # SAFE DEFAULT (portable)
+                use_mmap=getattr(settings, "LOCAL_LLM_USE_MMAP", True),
+                use_mlock=getattr(settings, "LOCAL_LLM_USE_MLOCK", False),
+                verbose=False,
+            )
+            self._models[slot] = model
 
         print("✅ Local LLaMA loaded!")
-
-    async def generate(self, prompt: str) -> str:
-        """Async-safe text generation."""
-
-        self._load_model()
-
-        loop = asyncio.get_running_loop()
-        output = await loop.run_in_executor(
-            None,
-            lambda: self._model(
-                prompt,
-                max_tokens=256,
-                temperature=0.7,
-            ),
+        return model
+
+    # ---------------------------------------------------------------
+    # Warm-up (startup, background thread)
+    # ---------------------------------------------------------------
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set() or (
+            self._warmup_thread is None and bool(self._models)
         )
 
+    @property
+    def warming_up(self) -> bool:
+        return self._warmup_thread is not None and self._warmup_thread.is_alive()
+
+    def warm_up(self, prefix: str = "") -> None:
+        """
+        Load every worker model and run a tiny prompt so the first real
+        request does not pay for page faults / allocations. With a prefix
+        (the router's system prompt) its KV state is evaluated as well.
+        """
+        try:
+            for slot in range(self.workers):
+                model = self._load_model(slot)
+                model(WARMUP_PROMPT, max_tokens=1, temperature=0.0)
+                self.prefix_cache.prepare(slot, model, prefix)
+            self._ready.set()
+            print("✅ Local LLaMA warmed up!")
+        except Exception as e:
+            # не роняем бота: первый запрос загрузит модель лениво
+            self.warmup_error = e
+            print(f"⚠️ Local LLaMA warm-up failed: {e}")
+
+    def start_warmup(self, prefix: str = "") -> threading.Thread:
+        if self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(
+                target=self.warm_up,
+                args=(prefix,),
+                name="llm-warmup",
+                daemon=True,
+            )
+            self._warmup_thread.start()
+        return self._warmup_thread
+
+    def _prepared_model(self, slot: int, prompt: str, prefix: str):
+        # worker thread: модель слота + KV-состояние статичного префикса
+        model = self._load_model(slot)
+        if prefix and prompt.startswith(prefix):
+            self.prefix_cache.prepare(slot, model, prefix)
+        return model
+
+    def _check_ready(self) -> None:
+        if self.warming_up:
+            raise ModelWarmingUp("local model is warming up")
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        user_id: Hashable = None,
+        prefix: str = "",
+        **params,
+    ) -> str:
+        """
+        Async-safe text generation.
+        `prefix` — static start of the prompt whose KV state is reused.
+        Raises SchedulerBusy when the inference queue is full and
+        ModelWarmingUp while the startup warm-up is still running.
+        """
+
+        self._check_ready()
+        params = {**GENERATION_DEFAULTS, **params}
+
+        def job(slot: int):
+            return self._prepared_model(slot, prompt, prefix)(prompt, **params)
+
+        output = await self.scheduler.submit(job, user_id=user_id)
         return output["choices"][0]["text"].strip()
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        user_id: Hashable = None,
+        prefix: str = "",
+        **params,
+    ) -> AsyncIterator[str]:
+        """
+        Token chunks as llama-cpp produces them (stream=True).
+        The worker slot is held until the stream ends or the consumer stops.
+        """
+
+        self._check_ready()
+        params = {**GENERATION_DEFAULTS, **params, "stream": True}
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+
+        def job(slot: int):
+            for part in self._prepared_model(slot, prompt, prefix)(prompt, **params):
+                if stopped.is_set():
+                    break  # потребитель ушёл — освобождаем воркер
+                loop.call_soon_threadsafe(chunks.put_nowait, part["choices"][0]["text"])
+
+        def finish(fut: asyncio.Future):
+            if not fut.cancelled():
+                fut.exception()  # отмечаем как прочитанное; поднимется в await done
+            chunks.put_nowait(_STREAM_END)
+
+        # результат job приходит после всех чанков (тот же call_soon_threadsafe)
+        done = asyncio.ensure_future(self.scheduler.submit(job, user_id=user_id))
+        done.add_done_callback(finish)
+
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is _STREAM_END:
+                    break
+                if chunk:
+                    yield chunk
+            await done  # SchedulerBusy / ошибки модели
+        finally:
+            stopped.set()
+
 
 # -------------------------------------------------------------------
 # 3. Factory
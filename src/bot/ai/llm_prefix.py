@@ -0,0 +1,114 @@
+# src/bot/ai/llm_prefix.py
+"""
+File: src/bot/ai/llm_prefix.py
+
+Purpose:
+KV-cache reuse for the static system-prompt prefix (llama-cpp).
+
+Responsibilities:
+- Evaluate the prefix ONCE per worker model and keep its state (save_state)
+- Before a request, make sure the model's KV cache starts with the prefix:
+  nothing to do if it still does, load_state() otherwise
+- Rebuild automatically when the prefix text changes (prompt file edited)
+
+IMPORTANT:
+- llama-cpp create_completion() skips the longest already-evaluated prefix,
+  so after prepare() only the dynamic suffix (date + user message) is evaluated
+- The prefix must end on a stable token boundary (the router uses "\\n\\n")
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+log = logging.getLogger("mindforge.llm.prefix")
+
+
+class _PrefixState:
+    __slots__ = ("digest", "tokens", "state")
+
+    def __init__(self, digest: str, tokens: List[int], state: Any):
+        self.digest = digest
+        self.tokens = tokens
+        self.state = state
+
+
+class PrefixStateCache:
+    def __init__(self) -> None:
+        # worker slot → evaluated prefix (model instances are per slot)
+        self._states: Dict[int, Optional[_PrefixState]] = {}
+        self._failed: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+        self.builds = 0
+        self.restores = 0
+        self.reuses = 0
+
+    @staticmethod
+    def _digest(prefix: str) -> str:
+        return hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _holds(model: Any, tokens: List[int]) -> bool:
+        n = len(tokens)
+        return model.n_tokens >= n and list(model.input_ids[:n]) == tokens
+
+    def prepare(self, slot: int, model: Any, prefix: str) -> bool:
+        """
+        Called on the worker thread right before model(prompt).
+        Returns True if the prefix is already evaluated in the model.
+        """
+        if not prefix:
+            return False
+
+        digest = self._digest(prefix)
+        entry = self._states.get(slot)
+
+        if entry is None or entry.digest != digest:
+            if self._failed.get(slot) == digest:
+                return False  # префикс не помещается / не поддерживается
+            return self._build(slot, model, prefix, digest)
+
+        if self._holds(model, entry.tokens):
+            self.reuses += 1
+            return True
+
+        model.load_state(entry.state)
+        self.restores += 1
+        return True
+
+    def _build(self, slot: int, model: Any, prefix: str, digest: str) -> bool:
+        try:
+            tokens = list(model.tokenize(prefix.encode("utf-8"), add_bos=True))
+            model.reset()
+            model.eval(tokens)
+            state = model.save_state()
+        except Exception as e:
+            log.warning("LLM_PREFIX_DISABLED | slot=%s | %s", slot, e)
+            with self._lock:
+                self._failed[slot] = digest
+                self._states.pop(slot, None)
+            model.reset()
+            return False
+
+        with self._lock:
+            self._states[slot] = _PrefixState(digest, tokens, state)
+            self._failed.pop(slot, None)
+            self.builds += 1
+
+        log.info("LLM_PREFIX_CACHED | slot=%s | tokens=%s", slot, len(tokens))
+        return True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._failed.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "slots": len(self._states),
+            "builds": self.builds,
+            "restores": self.restores,
+            "reuses": self.reuses,
+        }
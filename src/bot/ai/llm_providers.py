@@ -0,0 +1,112 @@
+# src/bot/ai/llm_providers.py
+"""
+File: src/bot/ai/llm_providers.py
+
+Purpose:
+Pluggable LLM providers for LLMRouter.
+
+Responsibilities:
+- One interface: ask(prompt) (sync) / ask_async(prompt) (event loop) /
+  ask_stream(prompt) (chunks; whole answer as one chunk by default)
+- MockProvider     — tests / dev fallback, deterministic "[name] ..." replies
+- LocalLlamaProvider — local GGUF model via LocalLLMClient (scheduler, prefix KV)
+- HTTPProvider     — OpenAI-compatible /v1/completions endpoint
+                     (llama.cpp server, vLLM, LM Studio) as a local stand-in
+
+IMPORTANT:
+- Providers raise on failure; health, fallback and limits live in the router
+- Routing-only params (user_id, prefix) are ignored by providers that
+  have no use for them
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Optional
+
+from src.bot.ai.llm_client import LocalLLMClient
+
+# params that describe the generation itself (sent to remote backends)
+GENERATION_PARAMS = ("max_tokens", "temperature", "top_p", "stop")
+
+
+class LLMProvider(ABC):
+    name: str = "base"
+    is_mock: bool = False
+
+    @abstractmethod
+    def ask(self, prompt: str, **params) -> str:
+        ...
+
+    async def ask_async(self, prompt: str, **params) -> str:
+        # блокирующие провайдеры уходят в поток, event loop свободен
+        return await asyncio.to_thread(self.ask, prompt, **params)
+
+    async def ask_stream(self, prompt: str, **params) -> AsyncIterator[str]:
+        # провайдер без стриминга: весь ответ одним чанком
+        yield await self.ask_async(prompt, **params)
+
+
+class MockProvider(LLMProvider):
+    is_mock = True
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def ask(self, prompt: str, **params) -> str:
+        return f"[{self.name}] Response to: {prompt}"
+
+
+class LocalLlamaProvider(LLMProvider):
+    def __init__(self, client: LocalLLMClient, name: str = "llama") -> None:
+        self.name = name
+        self.client = client
+
+    async def ask_async(self, prompt: str, **params) -> str:
+        return await self.client.generate(prompt, **params)
+
+    def ask_stream(self, prompt: str, **params) -> AsyncIterator[str]:
+        return self.client.generate_stream(prompt, **params)
+
+    def ask(self, prompt: str, **params) -> str:
+        # sync API — только вне event loop (скрипты); в боте — ask_async()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.client.generate(prompt, **params))
+        raise RuntimeError(f"{self.name}: sync ask() inside an event loop, use ask_async()")
+
+
+class HTTPProvider(LLMProvider):
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        *,
+        model: str = "local",
+        timeout: float = 60.0,
+        api_key: str = "",
+    ) -> None:
+        self.name = name
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.api_key = api_key
+        self._session: Optional[Any] = None
+
+    def _client(self):
+        if self._session is None:
+            import requests  # lazy: нужен только при настроенном URL
+
+            # keep-alive: одно TCP-соединение на провайдера
+            self._session = requests.Session()
+            if self.api_key:
+                self._session.headers["Authorization"] = f"Bearer {self.api_key}"
+        return self._session
+
+    def ask(self, prompt: str, **params) -> str:
+        payload: Dict[str, Any] = {"model": self.model, "prompt": prompt}
+        payload.update({k: params[k] for k in GENERATION_PARAMS if k in params})
+
+        response = self._client().post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["choices"][0]["text"].strip()
@@ -1,17 +1,32 @@
 """
-Minimal LLM Router for MindForge AI Bot.
-Works directly with llm_client (local LLaMA or Mock).
-No fallback, no cache, no rate limits — pure MVP.
-"""
+LLM Router for MindForge AI Bot.
 
-"""
-Minimal LLM Router for MindForge AI Bot.
-Uses local LLaMA via llm_client.
+- LLMRouter: pluggable providers (mock / local llama / HTTP stand-in),
+  token-bucket rate limits, circuit breakers, latency-aware fallback,
+  response cache and metrics
+- route() / route_stream(): system prompt + date + user message
 """
 
+import asyncio
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
-from src.bot.ai.llm_client import llm_client
+from typing import AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+from src.bot.ai.llm_cache import LLMResponseCache, make_key
+from src.bot.ai.llm_client import (
+    GENERATION_DEFAULTS,
+    LocalLLMClient,
+    ModelWarmingUp,
+    llm_client,
+)
+from src.bot.ai.llm_providers import HTTPProvider, LLMProvider, MockProvider, LocalLlamaProvider
+from src.bot.ai.llm_scheduler import SchedulerBusy
+from src.bot.ai.single_flight import SingleFlight, StreamFlights
+from src.bot.config import settings
+from src.bot.utils.rate_limit import TokenBucket
 
 # -------------------------------------------------------
 # Загружаем системный промпт
@@ -28,35 +43,749 @@ def load_system_prompt():
 
 
 SYSTEM_PROMPT = load_system_prompt()
+_prompt_signature = None
+
+
+def current_system_prompt() -> str:
+    """
+    SYSTEM_PROMPT, перечитанный при изменении файла (mtime / size).
+    Новый текст → новый префикс → KV-состояние и ключи кэша обновляются сами.
+    """
+    global SYSTEM_PROMPT, _prompt_signature
+
+    try:
+        st = os.stat(PROMPT_PATH)
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+
+    if signature != _prompt_signature:
+        _prompt_signature = signature
+        SYSTEM_PROMPT = load_system_prompt()
+
+    return SYSTEM_PROMPT
+
+
+def system_prefix() -> str:
+    # статичная часть промпта; заканчивается на "\n\n" — стабильная граница токенов
+    return current_system_prompt().strip() + "\n\n"
 
 
 # -------------------------------------------------------
-# Главная функция маршрутизации
+# Кэш ответов (memory LRU + опционально SQLite)
 # -------------------------------------------------------
 
-async def route(user_message: str) -> str:
-    """
-    Объединяем системный промпт + дату + сообщение пользователя,
-    отправляем в локальную модель LLaMA.
-    """
+response_cache = LLMResponseCache(
+    maxsize=settings.LLM_CACHE_SIZE,
+    ttl=settings.LLM_CACHE_TTL,
+    db_path=settings.LLM_CACHE_DB_PATH or None,
+    disk_ttl=settings.LLM_CACHE_DISK_TTL,
+)
 
-    today = datetime.now().strftime("%d.%m.%Y")
 
-    final_prompt = (
-        SYSTEM_PROMPT.strip()
-        + f"\n\n[ТЕКУЩАЯ ДАТА] {today}"
+# -------------------------------------------------------
+# LLMRouter: провайдеры, лимиты, circuit breaker, fallback
+# -------------------------------------------------------
+
+# provider → (refill tokens / second, burst capacity)
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    # очередь InferenceScheduler сама ограничивает llama (SchedulerBusy);
+    # bucket лишь срезает поток сверх того, что очередь способна принять
+    "llama": (2.0, settings.LOCAL_LLM_QUEUE_SIZE + settings.LOCAL_LLM_WORKERS),
+    "openai": (2.0, 30),
+    "mock": (100.0, 1000),
+}
+FALLBACK_RATE_LIMIT: Tuple[float, int] = (1.0, 20)
+
+BREAKER_THRESHOLD = 3     # consecutive failures → open
+BREAKER_COOLDOWN = 30.0   # seconds before a half-open trial
+LATENCY_WINDOW = 1024     # samples per provider for percentiles
+EWMA_ALPHA = 0.2
+
+HEALTH_PROMPT = "ping"
+
+# параметры маршрутизации, не влияющие на ответ (не входят в ключ кэша)
+ROUTING_PARAMS = ("user_id", "prefix")
+
+# провайдер жив, но перегружен → пропускаем без штрафа breaker'у
+SATURATION_ERRORS = (SchedulerBusy, ModelWarmingUp)
+
+# причины, по которым провайдер пропущен без вызова
+SKIP_CIRCUIT_OPEN = "circuit open"
+SKIP_RATE_LIMITED = "rate limited"
+
+
+class AllProvidersFailed(RuntimeError):
+    def __init__(self, errors: Dict[str, object]) -> None:
+        self.errors = errors
+        super().__init__(
+            "; ".join(f"{name}: {err}" for name, err in errors.items()) or "no providers"
+        )
+
+    def has(self, exc_type) -> bool:
+        return any(isinstance(err, exc_type) for err in self.errors.values())
+
+    def has_skip(self) -> bool:
+        return any(err in (SKIP_CIRCUIT_OPEN, SKIP_RATE_LIMITED) for err in self.errors.values())
+
+
+class CircuitBreaker:
+    __slots__ = ("threshold", "cooldown", "failures", "opened_at", "_trial")
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial:
+            self._trial = True  # ровно один пробный запрос
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial = False
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """
+        The trial call ended without a verdict (overloaded / cancelled):
+        the next call may probe again.
+        """
+        self._trial = False
+
+
+class _ProviderStats:
+    __slots__ = ("requests", "errors", "shed", "rate_limited", "fallbacks", "latencies", "ewma")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.shed = 0
+        self.rate_limited = 0
+        self.fallbacks = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.ewma: Optional[float] = None
+
+    def observe(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.ewma = latency if self.ewma is None else (
+            EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma
+        )
+
+    def snapshot(self) -> Dict[str, object]:
+        ordered = sorted(self.latencies)
+
+        def pct(q: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "shed": self.shed,
+            "rate_limited": self.rate_limited,
+            "fallbacks": self.fallbacks,
+            "latency_ms_p50": pct(0.50),
+            "latency_ms_p95": pct(0.95),
+            "latency_ms_p99": pct(0.99),
+        }
+
+
+def build_default_providers() -> Dict[str, LLMProvider]:
+    providers: Dict[str, LLMProvider] = {}
+
+    if isinstance(llm_client, LocalLLMClient):
+        providers["llama"] = LocalLlamaProvider(llm_client)
+    else:
+        providers["llama"] = MockProvider("llama")
+
+    if settings.LLM_HTTP_URL:
+        providers["openai"] = HTTPProvider(
+            "openai",
+            settings.LLM_HTTP_URL,
+            model=settings.LLM_HTTP_MODEL,
+            timeout=settings.LLM_HTTP_TIMEOUT,
+            api_key=settings.LLM_HTTP_API_KEY,
+        )
+    else:
+        providers["openai"] = MockProvider("openai")
+
+    providers["mock"] = MockProvider("mock")
+    return providers
+
+
+class LLMRouter:
+    def __init__(
+        self,
+        providers: Optional[Dict[str, LLMProvider]] = None,
+        *,
+        default: Optional[str] = None,
+        rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        cache: Optional[LLMResponseCache] = None,
+        fallback: bool = True,
+    ) -> None:
+        self.providers: Dict[str, LLMProvider] = providers or build_default_providers()
+        self.fallback = fallback
+        self.cache = cache if cache is not None else LLMResponseCache()
+
+        default = default or settings.LLM_DEFAULT_PROVIDER
+        self.active = default if default in self.providers else next(iter(self.providers))
+
+        limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.rate_limits: Dict[str, Tuple[float, int]] = {
+            name: limits.get(name, FALLBACK_RATE_LIMIT) for name in self.providers
+        }
+        self._buckets = {name: TokenBucket(*limit) for name, limit in self.rate_limits.items()}
+        self._breakers = {name: CircuitBreaker() for name in self.providers}
+        self._stats = {name: _ProviderStats() for name in self.providers}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+        self.total_requests = 0
+        self.error_count = 0
+
+    # ---------------------------------------------------
+    # Провайдеры
+    # ---------------------------------------------------
+    def list_providers(self) -> List[str]:
+        return list(self.providers)
+
+    def set_default(self, name: str) -> None:
+        if name not in self.providers:
+            raise ValueError(f"Unknown LLM provider: {name}")
+        self.active = name
+
+    @contextmanager
+    def temporary_provider(self, name: str) -> Iterator[None]:
+        previous = self.active
+        self.set_default(name)
+        try:
+            yield
+        finally:
+            self.active = previous
+
+    def _check_rate_limit(self, name: str) -> bool:
+        return self._buckets[name].try_acquire()
+
+    def _candidates(self, primary: str) -> List[str]:
+        if primary not in self.providers:
+            raise ValueError(f"Unknown LLM provider: {primary}")
+
+        if not self.fallback:
+            return [primary]
+
+        # реальный провайдер никогда не деградирует до mock-ответа
+        allow_mock = self.providers[primary].is_mock
+        others = [
+            name for name, p in self.providers.items()
+            if name != primary and (allow_mock or not p.is_mock)
+        ]
+
+        # сначала закрытые breaker'ы и реальные провайдеры, среди них — самые быстрые (EWMA)
+        def order(name: str):
+            ewma = self._stats[name].ewma
+            return (
+                self._breakers[name].state == "open",
+                self.providers[name].is_mock,
+                ewma if ewma is not None else float("inf"),
+            )
+
+        return [primary] + sorted(others, key=order)
+
+    # ---------------------------------------------------
+    # Учёт одного вызова
+    # ---------------------------------------------------
+    def _admit(self, name: str) -> Optional[str]:
+        """
+        None if the provider may be called now, otherwise the skip reason.
+        """
+        with self._lock:
+            breaker = self._breakers[name]
+            if breaker.state == "open":
+                return SKIP_CIRCUIT_OPEN
+            # лимит до allow(): отклонённый пробный запрос не занимает half-open слот
+            if not self._check_rate_limit(name):
+                self._stats[name].rate_limited += 1
+                return SKIP_RATE_LIMITED
+            if not breaker.allow():
+                return SKIP_CIRCUIT_OPEN
+            self._stats[name].requests += 1
+        return None
+
+    def _release(self, name: str) -> None:
+        with self._lock:
+            self._breakers[name].release()
+
+    def _record(self, name: str, primary: str, started: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            stats = self._stats[name]
+
+            if error is None:
+                stats.observe(time.monotonic() - started)
+                self._breakers[name].record_success()
+                if name != primary:
+                    stats.fallbacks += 1
+            elif isinstance(error, SATURATION_ERRORS):
+                stats.shed += 1
+                self._breakers[name].release()
+            else:
+                stats.errors += 1
+                self.error_count += 1
+                self._breakers[name].record_failure()
+
+    def _cache_key(self, name: str, prompt: str, params: dict) -> str:
+        relevant = {k: v for k, v in params.items() if k not in ROUTING_PARAMS}
+        return make_key(f"provider:{name}", prompt, relevant)
+
+    # ---------------------------------------------------
+    # Запросы
+    # ---------------------------------------------------
+    def ask(self, prompt: str, provider: Optional[str] = None, *, use_cache: bool = True, **params) -> str:
+        primary = provider or self.active
+        candidates = self._candidates(primary)
+        self.total_requests += 1
+
+        key = self._cache_key(primary, prompt, params) if use_cache else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        errors: Dict[str, object] = {}
+        for name in candidates:
+            reason = self._admit(name)
+            if reason is not None:
+                errors[name] = reason
+                continue
+
+            started = time.monotonic()
+            try:
+                result = self.providers[name].ask(prompt, **params)
+            except Exception as e:
+                self._record(name, primary, started, e)
+                errors[name] = e
+                continue
+
+            self._record(name, primary, started, None)
+            if key is not None:
+                self.cache.put(key, result)
+            return result
+
+        raise AllProvidersFailed(errors)
+
+    async def ask_async(self, prompt: str, provider: Optional[str] = None, *, use_cache: bool = True, **params) -> str:
+        primary = provider or self.active
+        candidates = self._candidates(primary)
+        self.total_requests += 1
+
+        if not use_cache:
+            return await self._ask_candidates(candidates, primary, prompt, params, None)
+
+        key = self._cache_key(primary, prompt, params)
+        cached = await self.cache.get_async(key)
+        if cached is not None:
+            return cached
+
+        # одинаковые одновременные запросы → одна генерация на всех
+        return await self._flights.do(
+            key,
+            lambda: self._ask_candidates(candidates, primary, prompt, params, key),
+        )
+
+    async def _ask_candidates(
+        self,
+        candidates: List[str],
+        primary: str,
+        prompt: str,
+        params: dict,
+        key: Optional[str],
+    ) -> str:
+        errors: Dict[str, object] = {}
+        for name in candidates:
+            reason = self._admit(name)
+            if reason is not None:
+                errors[name] = reason
+                continue
+
+            started = time.monotonic()
+            try:
+                result = await self.providers[name].ask_async(prompt, **params)
+            except Exception as e:
+                self._record(name, primary, started, e)
+                errors[name] = e
+                continue
+            except BaseException:
+                self._release(name)  # отмена: вердикта нет
+                raise
+
+            self._record(name, primary, started, None)
+            if key is not None:
+                await self.cache.put_async(key, result)
+            return result
+
+        raise AllProvidersFailed(errors)
+
+    async def ask_stream(self, prompt: str, provider: Optional[str] = None, **params) -> AsyncIterator[str]:
+        """
+        Streaming variant of ask_async() (no cache): same limits, breakers
+        and fallback. Fallback is possible only before the first chunk.
+        """
+        primary = provider or self.active
+        candidates = self._candidates(primary)
+        self.total_requests += 1
+
+        errors: Dict[str, object] = {}
+        for name in candidates:
+            reason = self._admit(name)
+            if reason is not None:
+                errors[name] = reason
+                continue
+
+            started = time.monotonic()
+            stream = self.providers[name].ask_stream(prompt, **params)
+            delivered = False
+            try:
+                async for chunk in stream:
+                    delivered = True
+                    yield chunk
+            except Exception as e:
+                self._record(name, primary, started, e)
+                if delivered:
+                    raise  # часть ответа уже отдана — переключаться поздно
+                errors[name] = e
+                continue
+            except BaseException:
+                # потребитель ушёл / отмена: провайдер жив, если успел ответить
+                if delivered:
+                    self._record(name, primary, started, None)
+                else:
+                    self._release(name)
+                raise
+            finally:
+                await stream.aclose()
+
+            self._record(name, primary, started, None)
+            return
+
+        raise AllProvidersFailed(errors)
+
+    # ---------------------------------------------------
+    # Health / metrics
+    # ---------------------------------------------------
+    def _health_entry(self, name: str, started: float, error: Optional[Exception]) -> Dict[str, object]:
+        with self._lock:
+            breaker = self._breakers[name]
+            if error is None:
+                breaker.record_success()
+                entry: Dict[str, object] = {
+                    "status": "healthy",
+                    "latency_ms": round((time.monotonic() - started) * 1000, 2),
+                }
+            elif isinstance(error, SATURATION_ERRORS):
+                # жив, но занят / прогревается — не отказ
+                breaker.release()
+                entry = {"status": "busy", "error": str(error)}
+            else:
+                breaker.record_failure()
+                entry = {"status": "error", "error": str(error)}
+            entry["circuit"] = breaker.state
+        return entry
+
+    def health_check(self) -> Dict[str, Dict[str, object]]:
+        """
+        Probe every provider directly (no rate limit, no cache) and
+        feed the result into its circuit breaker.
+        Sync API for scripts; inside the event loop use health_check_async().
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("health_check() inside an event loop: use await health_check_async()")
+
+        report: Dict[str, Dict[str, object]] = {}
+        for name, provider in self.providers.items():
+            started = time.monotonic()
+            try:
+                provider.ask(HEALTH_PROMPT, max_tokens=1)
+            except Exception as e:
+                report[name] = self._health_entry(name, started, e)
+            else:
+                report[name] = self._health_entry(name, started, None)
+
+        return report
+
+    async def health_check_async(self) -> Dict[str, Dict[str, object]]:
+        """
+        health_check() for the event loop: providers are probed concurrently
+        through their async path.
+        """
+        async def probe(name: str, provider: LLMProvider) -> Dict[str, object]:
+            started = time.monotonic()
+            try:
+                await provider.ask_async(HEALTH_PROMPT, max_tokens=1)
+            except Exception as e:
+                return self._health_entry(name, started, e)
+            return self._health_entry(name, started, None)
+
+        names = list(self.providers)
+        entries = await asyncio.gather(*(probe(n, self.providers[n]) for n in names))
+        return dict(zip(names, entries))
+
+    def get_metrics(self, reset: bool = False) -> Dict[str, object]:
+        with self._lock:
+            metrics = {
+                "total_requests": self.total_requests,
+                "error_count": self.error_count,
+                "active": self.active,
+                "providers": {
+                    name: {
+                        **stats.snapshot(),
+                        "circuit": self._breakers[name].state,
+                        "tokens": round(self._buckets[name].available, 2),
+                    }
+                    for name, stats in self._stats.items()
+                },
+                "cache": self.cache.stats(),
+                "single_flight": self._flights.stats(),
+            }
+
+            if reset:
+                self.total_requests = 0
+                self.error_count = 0
+                self._stats = {name: _ProviderStats() for name in self.providers}
+
+        return metrics
+
+
+llm_router = LLMRouter(cache=response_cache)
+
+# single-flight для route() / route_stream(): ключ = ключ кэша ответа
+route_flights = SingleFlight()
+stream_flights = StreamFlights()
+
+
+# -------------------------------------------------------
+# Сборка промпта и ключа кэша
+# -------------------------------------------------------
+
+BUSY_MESSAGE = "⏳ Модель сейчас занята, попробуйте через минуту."
+WARMING_MESSAGE = "🔥 Модель прогревается после запуска, попробуйте через минуту."
+
+
+def build_prompt(user_message: str, today: str) -> str:
+    return (
+        system_prefix()
+        + f"[ТЕКУЩАЯ ДАТА] {today}"
         + f"\n[ПОЛЬЗОВАТЕЛЬ]\n{user_message}"
         + "\n[ОТВЕТ АССИСТЕНТА]\n"
     )
 
+
+def _cache_key(user_message: str, today: str, params: dict, use_cache: bool):
+    if not (use_cache and settings.LLM_CACHE_ENABLED):
+        return None
+    # дата входит в промпт → и в ключ
+    return make_key(f"{current_system_prompt()}\n{today}", user_message, params)
+
+
+def failure_message(e: AllProvidersFailed) -> str:
+    """
+    Text for the user when no provider answered.
+    """
+    # все перегружены / на паузе — быстрый отказ вместо бесконечного ожидания
+    if e.has(SchedulerBusy) or e.has_skip():
+        return BUSY_MESSAGE
+    if e.has(ModelWarmingUp):
+        return WARMING_MESSAGE
+    return f"[LLM Router Error] {str(e)}"
+
+
+def _log_prompt(final_prompt: str) -> None:
     # ЛОГ (но не ломает импорт)
     print("\n====== LLM ROUTER PROMPT ======")
     print(final_prompt)
     print("================================\n")
 
+
+# -------------------------------------------------------
+# Главная функция маршрутизации
+# -------------------------------------------------------
+
+async def generate_answer(
+    user_message: str,
+    *,
+    use_cache: bool = True,
+    user_id=None,
+    **params,
+) -> str:
+    """
+    Ответ модели на сообщение пользователя (системный промпт + дата).
+    В отличие от route() ошибки не превращаются в текст:
+    AllProvidersFailed поднимается наружу (TaskRunner решает про retry).
+    """
+
+    today = datetime.now().strftime("%d.%m.%Y")
+    params = {**GENERATION_DEFAULTS, **params}
+
+    key = _cache_key(user_message, today, params, use_cache)
+    if key is not None:
+        cached = await response_cache.get_async(key)
+        if cached is not None:
+            return cached
+
+    final_prompt = build_prompt(user_message, today)
+    _log_prompt(final_prompt)
+
+    async def generate() -> str:
+        # провайдер по умолчанию + fallback; кэш уже проверен выше
+        response = (
+            await llm_router.ask_async(
+                final_prompt,
+                use_cache=False,
+                user_id=user_id,
+                prefix=system_prefix(),
+                **params,
+            )
+        ).strip()
+
+        if key is not None:
+            await response_cache.put_async(key, response)
+        return response
+
+    if key is None:
+        return await generate()
+    # одинаковый промпт уже генерируется → ждём тот же результат
+    return await route_flights.do(key, generate)
+
+
+async def route(
+    user_message: str,
+    *,
+    use_cache: bool = True,
+    user_id=None,
+    **params,
+) -> str:
+    """
+    Объединяем системный промпт + дату + сообщение пользователя,
+    отправляем в локальную модель LLaMA.
+
+    use_cache=False — для генераций, которые должны отличаться
+    при каждом вызове (например, новый вопрос интервью).
+    user_id — ключ честной очереди (chat id): запросы разных
+    пользователей обслуживаются по кругу.
+    """
+
     try:
-        response = await llm_client.generate(final_prompt)
-        return response.strip()
+        return await generate_answer(
+            user_message,
+            use_cache=use_cache,
+            user_id=user_id,
+            **params,
+        )
+
+    except AllProvidersFailed as e:
+        return failure_message(e)
 
     except Exception as e:
         return f"[LLM Router Error] {str(e)}"
+
+
+# -------------------------------------------------------
+# Потоковая генерация (чанки по мере готовности)
+# -------------------------------------------------------
+
+async def _generate_stream(
+    final_prompt: str,
+    key: Optional[str],
+    user_id,
+    params: dict,
+) -> AsyncIterator[str]:
+    _log_prompt(final_prompt)
+
+    parts = []
+    try:
+        # через LLMRouter: лимиты, breaker'ы и fallback, как у route()
+        async for chunk in llm_router.ask_stream(
+            final_prompt,
+            user_id=user_id,
+            prefix=system_prefix(),
+            **params,
+        ):
+            parts.append(chunk)
+            yield chunk
+
+    except AllProvidersFailed as e:
+        yield failure_message(e)
+        return
+
+    except Exception as e:
+        yield f"[LLM Router Error] {str(e)}"
+        return
+
+    if key is not None:
+        await response_cache.put_async(key, "".join(parts).strip())
+
+
+async def route_stream(
+    user_message: str,
+    *,
+    use_cache: bool = True,
+    user_id=None,
+    **params,
+) -> AsyncIterator[str]:
+    """
+    То же, что route(), но отдаёт текст чанками по мере генерации.
+    Полный ответ попадает в кэш, только если поток дошёл до конца.
+    Одинаковые одновременные запросы читают один общий поток.
+    """
+
+    today = datetime.now().strftime("%d.%m.%Y")
+    params = {**GENERATION_DEFAULTS, **params}
+
+    key = _cache_key(user_message, today, params, use_cache)
+    if key is not None:
+        cached = await response_cache.get_async(key)
+        if cached is not None:
+            yield cached
+            return
+
+    final_prompt = build_prompt(user_message, today)
+
+    if key is None:
+        stream = _generate_stream(final_prompt, None, user_id, params)
+    else:
+        # одинаковый промпт уже генерируется → подключаемся к тому же потоку
+        stream = stream_flights.stream(
+            key,
+            lambda: _generate_stream(final_prompt, key, user_id, params),
+        )
+
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        await stream.aclose()
@@ -0,0 +1,228 @@
+# src/bot/ai/llm_scheduler.py
+"""
+File: src/bot/ai/llm_scheduler.py
+
+Purpose:
+Concurrency-limited inference scheduler for the local LLM.
+
+Responsibilities:
+- Bounded request queue: reject fast (SchedulerBusy) instead of queueing forever
+- Fixed number of model workers (threads), each bound to its own slot
+- Per-user fairness: round-robin across user / chat ids
+- Queue depth, wait time and run time metrics
+
+IMPORTANT:
+- A job is fn(slot) → result; slot = worker index, so every worker can own
+  its own model instance (llama-cpp models are not thread-safe)
+- submit() never blocks the event loop: results come back through
+  loop.call_soon_threadsafe
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+log = logging.getLogger("mindforge.llm.scheduler")
+
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_QUEUE = 32
+LATENCY_WINDOW = 1024  # samples kept for wait / run percentiles
+
+
+class SchedulerBusy(RuntimeError):
+    pass
+
+
+class _Job:
+    __slots__ = ("fn", "future", "loop", "enqueued_at")
+
+    def __init__(self, fn: Callable[[int], Any], future: asyncio.Future, loop: asyncio.AbstractEventLoop):
+        self.fn = fn
+        self.future = future
+        self.loop = loop
+        self.enqueued_at = time.monotonic()
+
+
+def _percentile(samples: Deque[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _set_result(future: asyncio.Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+class InferenceScheduler:
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+
+        # user → его очередь; _order — пользователи с ожидающими задачами
+        self._queues: Dict[Hashable, Deque[_Job]] = {}
+        self._order: Deque[Hashable] = deque()
+        self._depth = 0
+
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+        self._wait_times: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._run_times: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.max_depth = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def submit(self, fn: Callable[[int], Any], *, user_id: Hashable = None) -> Any:
+        """
+        Run fn(slot) on a model worker. Raises SchedulerBusy when the
+        queue is full.
+        """
+        loop = asyncio.get_running_loop()
+        job = _Job(fn, loop.create_future(), loop)
+
+        with self._cond:
+            if self._closed:
+                raise SchedulerBusy("inference scheduler is closed")
+
+            if self._depth >= self.max_queue:
+                self.rejected += 1
+                raise SchedulerBusy(f"inference queue is full ({self._depth})")
+
+            self._ensure_workers()
+
+            queue = self._queues.get(user_id)
+            if queue is None:
+                queue = self._queues[user_id] = deque()
+                self._order.append(user_id)
+            queue.append(job)
+
+            self._depth += 1
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._depth)
+            self._cond.notify()
+
+        return await job.future
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        with self._cond:
+            self._closed = True
+            pending = [job for q in self._queues.values() for job in q]
+            self._queues.clear()
+            self._order.clear()
+            self._depth = 0
+            self._cond.notify_all()
+
+        for job in pending:
+            job.loop.call_soon_threadsafe(
+                _set_exception, job.future, SchedulerBusy("inference scheduler is closed")
+            )
+
+        for t in self._threads:
+            t.join(timeout)
+        self._threads.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "depth": self._depth,
+                "max_depth": self.max_depth,
+                "max_queue": self.max_queue,
+                "users_waiting": len(self._order),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_p50": _percentile(self._wait_times, 0.50),
+                "wait_p95": _percentile(self._wait_times, 0.95),
+                "wait_max": max(self._wait_times) if self._wait_times else None,
+                "run_p50": _percentile(self._run_times, 0.50),
+                "run_p95": _percentile(self._run_times, 0.95),
+            }
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _ensure_workers(self) -> None:
+        # caller holds self._cond
+        if self._threads:
+            return
+
+        for slot in range(self.workers):
+            t = threading.Thread(
+                target=self._run,
+                args=(slot,),
+                name=f"llm-worker-{slot}",
+                daemon=True,
+            )
+            self._threads.append(t)
+            t.start()
+
+    def _next_job(self) -> Optional[_Job]:
+        # caller holds self._cond; round-robin по пользователям
+        while self._order:
+            user_id = self._order.popleft()
+            queue = self._queues[user_id]
+            job = queue.popleft()
+            self._depth -= 1
+
+            if queue:
+                self._order.append(user_id)
+            else:
+                del self._queues[user_id]
+
+            if not job.future.cancelled():
+                return job
+        return None
+
+    def _run(self, slot: int) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    job = self._next_job()
+
+            started = time.monotonic()
+            try:
+                result = job.fn(slot)
+            except BaseException as e:
+                outcome, value = _set_exception, e
+            else:
+                outcome, value = _set_result, result
+            finished = time.monotonic()
+
+            with self._cond:
+                self._wait_times.append(started - job.enqueued_at)
+                self._run_times.append(finished - started)
+                if outcome is _set_result:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+            try:
+                job.loop.call_soon_threadsafe(outcome, job.future, value)
+            except RuntimeError:
+                log.warning("LLM_SCHEDULER | caller loop closed, result dropped")
@@ -0,0 +1,155 @@
+# src/bot/ai/single_flight.py
+"""
+File: src/bot/ai/single_flight.py
+
+Purpose:
+Single-flight deduplication of identical in-flight async calls.
+
+Responsibilities:
+- Concurrent callers with the same key share ONE running task
+- The result (or exception) is fanned out to every waiter
+- A cancelled waiter never cancels the shared task for the others
+- The task is cancelled only when its last waiter is gone
+- StreamFlights: the same for async streams — one producer, every joined
+  caller receives the full chunk sequence (already produced chunks are
+  replayed to late joiners)
+
+IMPORTANT:
+- Keys must identify deterministic work (the LLM cache key): calls that
+  opt out of caching must not be coalesced
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+
+        if flight is None or flight.task.done():
+            task = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t, key=key: self._forget(key, t))
+            flight = self._flights[key] = _Flight(task)
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: отмена одного ожидающего не отменяет общую задачу
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()  # ждать больше некому
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+
+class _StreamFlight:
+    __slots__ = ("chunks", "done", "error", "changed", "task", "listeners")
+
+    def __init__(self) -> None:
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.listeners = 0
+
+    def notify(self) -> None:
+        # новое событие на каждый шаг: ждущие просыпаются, следующие ждут заново
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class StreamFlights:
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _StreamFlight] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def _pump(self, key: Hashable, flight: _StreamFlight, source: AsyncIterator[Any]) -> None:
+        try:
+            async for chunk in source:
+                flight.chunks.append(chunk)
+                flight.notify()
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.notify()
+
+    async def stream(self, key: Hashable, fn: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        flight = self._flights.get(key)
+
+        if flight is None:
+            flight = self._flights[key] = _StreamFlight()
+            flight.task = asyncio.ensure_future(self._pump(key, flight, fn()))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        flight.listeners += 1
+        sent = 0
+        try:
+            while True:
+                changed = flight.changed
+                while sent < len(flight.chunks):
+                    yield flight.chunks[sent]
+                    sent += 1
+                if flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                await changed.wait()
+        finally:
+            flight.listeners -= 1
+            if flight.listeners == 0 and not flight.done:
+                # слушать больше некому: новые вызовы начнут свой поток
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
@@ -1,80 +1,73 @@
-import json
-import os
-from src.bot.ai.llm_router import route
-
-TASK_DB = "data/tasks.json"
+from typing import Any, Dict, Optional
+
+from src.bot.ai.categorizer import SOURCE_USER, task_categorizer
+from src.bot.ai.llm_router import generate_answer
+from src.bot.ai.task_store import (
+    STATUS_CANCELLED,
+    STATUS_DONE,
+    STATUS_ERROR,
+    STATUS_NEW,
+    STATUS_QUEUED,
+    STATUS_RUNNING,
+    task_store,
+)
+
+# /taskrun запускает только новые и упавшие задачи;
+# queued принадлежит TaskRunner, done / cancelled не перезапускаются
+RUNNABLE_STATUSES = (STATUS_NEW, STATUS_ERROR)
+
+NOT_RUNNABLE = {
+    STATUS_RUNNING: "Задача уже выполняется",
+    STATUS_QUEUED: "Задача уже в очереди /taskrunall",
+    STATUS_DONE: "Задача уже выполнена",
+    STATUS_CANCELLED: "Задача отменена",
+}
 
 
 # ---------------------------
-# загрузка / сохранение
-# ---------------------------
-def load_tasks():
-    if not os.path.exists(TASK_DB):
-        return []
-    with open(TASK_DB, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except:
-            return []
-
-
-def save_tasks(tasks):
-    with open(TASK_DB, "w", encoding="utf-8") as f:
-        json.dump(tasks, f, ensure_ascii=False, indent=2)
-
-
-def get_next_id(tasks):
-    if not tasks:
-        return 1
-    return max(t["id"] for t in tasks) + 1
-
-
-# ---------------------------
-# авто-категоризация (через LLM)
+# авто-категоризация (keywords / classifier, LLM — только при низкой уверенности)
 # ---------------------------
 async def auto_categorize(text: str) -> str:
-    prompt = (
-        "Определи категорию задачи одного слова из списка: "
-        "market, osint, analysis, llm, workflow, build.\n"
-        f"Задача: {text}\nТолько одно слово:"
-    )
+    decision = await task_categorizer.categorize(text)
+    return decision.category
 
-    answer = await route(prompt)
-    answer = answer.lower()
 
-    for c in ["market", "osint", "analysis", "llm", "workflow", "build"]:
-        if c in answer:
-            return c
+async def add_task(text: str, *, user_id: Optional[int] = None, category: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Create a task. Explicit category → source 'user', otherwise the
+    categorizer path is stored with it (the classifier trains only on
+    user / LLM labels).
+    """
+    if category is not None:
+        return task_store.add(text, category, user_id=user_id, category_source=SOURCE_USER)
 
-    return "llm"   # fallback
+    decision = await task_categorizer.categorize(text)
+    return task_store.add(text, decision.category, user_id=user_id, category_source=decision.path)
 
 
 # ---------------------------
 # выполнение задачи
 # ---------------------------
 async def run_task(task_id: int):
-    tasks = load_tasks()
-    task = next((t for t in tasks if t["id"] == task_id), None)
+    # атомарно: new/error → running (повторный запуск не задваивается)
+    task = task_store.claim(task_id, from_statuses=RUNNABLE_STATUSES)
 
     if not task:
-        return None, "Задача не найдена"
-
-    task["status"] = "running"
-    save_tasks(tasks)
+        existing = task_store.get(task_id)
+        if existing is None:
+            return None, "Задача не найдена"
+        return None, NOT_RUNNABLE.get(existing["status"], f"Задачу нельзя запустить ({existing['status']})")
 
     try:
-        # основной вызов LLM
+        # основной вызов LLM; generate_answer поднимает ошибки (route() вернул бы
+        # текст ошибки, и задача ушла бы в done вместо error)
         prompt = f"Выполни задачу: {task['task']}"
-        result = await route(prompt)
-
-        task["status"] = "done"
-        task["result"] = result
-        save_tasks(tasks)
-
-        return result, None
+        result = await generate_answer(prompt)
 
     except Exception as e:
-        task["status"] = "error"
-        task["result"] = str(e)
-        save_tasks(tasks)
-        return None, str(e)
+        error = str(e) or type(e).__name__
+        task_store.fail(task_id, error)
+        return None, error
+
+    task_store.complete(task_id, result)
+    return result, None
@@ -0,0 +1,280 @@
+# src/bot/ai/task_runner.py
+"""
+File: src/bot/ai/task_runner.py
+
+Purpose:
+Concurrent task execution engine (/taskrunall, UAG intent task_execute_bulk).
+
+Responsibilities:
+- asyncio worker pool with configurable concurrency
+- Priorities by category (build > market/osint > analysis/workflow > llm)
+- Retries with exponential backoff, per-task timeout
+- Cancellation of queued and running tasks
+- Persisted progress: the queue lives in the task store ('queued'),
+  so a restart resumes pending work (resume())
+- ONE worker pool per runner: overlapping run_pending() calls (startup
+  resume + /taskrunall) join it instead of starting their own
+
+IMPORTANT:
+- A bulk run takes ~max(task time), not sum(task times): real parallelism
+  is bounded by the LLM scheduler (LOCAL_LLM_WORKERS / queue size)
+- Status changes go through atomic TaskRepository transitions: a task is
+  never executed twice concurrently
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.bot.ai.llm_router import generate_answer
+from src.bot.ai.task_store import (
+    STATUS_CANCELLED,
+    STATUS_DONE,
+    STATUS_ERROR,
+    STATUS_NEW,
+    STATUS_QUEUED,
+    STATUS_RUNNING,
+    TaskRepository,
+    task_store,
+)
+from src.bot.config import settings
+
+log = logging.getLogger("mindforge.tasks.runner")
+
+CATEGORY_PRIORITY: Dict[str, int] = {
+    "build": 30,
+    "market": 20,
+    "osint": 20,
+    "analysis": 10,
+    "workflow": 10,
+    "interview": 5,
+    "llm": 0,
+}
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_TIMEOUT = 180.0      # seconds per attempt
+DEFAULT_BACKOFF = 2.0        # first retry delay, doubled each attempt
+DEFAULT_BACKOFF_MAX = 60.0
+
+# task_id → (final status, result or error text)
+Outcome = Tuple[str, Optional[str]]
+
+
+async def execute_with_llm(task: Dict[str, Any]) -> str:
+    # ошибки LLM поднимаются (AllProvidersFailed) → retry с backoff
+    return await generate_answer(
+        f"Выполни задачу: {task['task']}",
+        user_id=task.get("user_id"),
+    )
+
+
+class TaskRunner:
+    def __init__(
+        self,
+        store: TaskRepository = task_store,
+        execute: Callable[[Dict[str, Any]], Awaitable[str]] = execute_with_llm,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        timeout: float = DEFAULT_TIMEOUT,
+        backoff: float = DEFAULT_BACKOFF,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+    ) -> None:
+        self.store = store
+        self.execute = execute
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.timeout = timeout
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+        # task_id → asyncio.Task текущей попытки (для отмены)
+        self._running: Dict[int, asyncio.Task] = {}
+        self._cancelled: set = set()
+
+        # общий пул воркеров: живёт, пока в нём есть задачи
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        # task_id → future итога (задача в пуле: в очереди, выполняется или ждёт retry)
+        self._waiting: Dict[int, asyncio.Future] = {}
+
+    # ---------------------------------------------------
+    # Queue management (persisted)
+    # ---------------------------------------------------
+    @staticmethod
+    def priority_of(task: Dict[str, Any]) -> int:
+        return CATEGORY_PRIORITY.get(task.get("category"), 0)
+
+    def enqueue(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        return sum(
+            1 for t in tasks
+            if self.store.enqueue(t["id"], self.priority_of(t))
+        )
+
+    def enqueue_new(self) -> int:
+        return self.enqueue(self.store.list(status=STATUS_NEW))
+
+    def resume(self) -> int:
+        """
+        After a restart: interrupted 'running' tasks go back to the queue.
+        Returns the number of queued tasks waiting for run_pending().
+        """
+        interrupted = self.store.requeue_interrupted()
+        if interrupted:
+            log.info("TASK_RUNNER_RESUME | requeued %s interrupted tasks", interrupted)
+        return len(self.store.queued())
+
+    def cancel(self, task_id: int) -> bool:
+        if self.store.transition(task_id, STATUS_CANCELLED, from_statuses=(STATUS_QUEUED,)):
+            return True
+
+        running = self._running.get(task_id)
+        if running is not None and not running.done():
+            self._cancelled.add(task_id)
+            running.cancel()
+            return True
+
+        return False
+
+    # ---------------------------------------------------
+    # Execution
+    # ---------------------------------------------------
+    def _retry_delay(self, attempt: int) -> float:
+        return min(self.backoff_max, self.backoff * (2 ** (attempt - 1)))
+
+    async def run_pending(self) -> Dict[int, Outcome]:
+        """
+        Run every queued task (priority order) on the runner's worker pool
+        (`concurrency` workers in total, however many calls overlap).
+        Returns the final outcome per task scheduled by THIS call: tasks
+        already in the pool belong to the call that scheduled them.
+        """
+        loop = asyncio.get_running_loop()
+        mine: Dict[int, asyncio.Future] = {}
+
+        for t in self.store.queued():
+            if t["id"] in self._waiting:
+                continue
+            if self._queue is None:
+                self._start_pool()
+            mine[t["id"]] = self._waiting[t["id"]] = loop.create_future()
+            self._queue.put_nowait((-t["priority"], t["id"]))
+
+        if not mine:
+            return {}
+
+        # отмена вызывающего не останавливает пул (см. stop())
+        await asyncio.wait(mine.values())
+
+        outcomes: Dict[int, Outcome] = {}
+        for task_id, fut in mine.items():
+            if fut.cancelled():
+                raise asyncio.CancelledError()   # пул остановлен (stop)
+            if fut.result() is not None:
+                outcomes[task_id] = fut.result()
+        return outcomes
+
+    async def stop(self) -> None:
+        """
+        Shutdown: cancel the workers. Interrupted tasks go back to 'queued'
+        (resumed after a restart); pending run_pending() calls are cancelled.
+        """
+        workers, self._workers = self._workers, []
+        self._queue = None
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        waiting, self._waiting = self._waiting, {}
+        for fut in waiting.values():
+            fut.cancel()
+
+    # ---------------------------------------------------
+    # Worker pool
+    # ---------------------------------------------------
+    def _start_pool(self) -> None:
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.create_task(self._worker(self._queue), name=f"task-runner-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    def _settle(self, task_id: int, outcome: Optional[Outcome]) -> None:
+        fut = self._waiting.pop(task_id, None)
+        if fut is not None and not fut.done():
+            fut.set_result(outcome)
+
+        if not self._waiting:
+            # работы нет — пул завершается (следующий run_pending создаст новый)
+            workers, self._workers = self._workers, []
+            self._queue = None
+            for w in workers:
+                w.cancel()
+
+    async def _worker(self, queue: asyncio.PriorityQueue) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            neg_priority, task_id = await queue.get()
+
+            task = self.store.claim(task_id, from_statuses=(STATUS_QUEUED,))
+            if task is None:
+                # отменена в очереди → итог 'cancelled'; забрана кем-то ещё → не наша
+                current = self.store.get(task_id)
+                cancelled = current is not None and current["status"] == STATUS_CANCELLED
+                self._settle(task_id, (STATUS_CANCELLED, None) if cancelled else None)
+                continue
+
+            outcome = await self._attempt(task)
+            if outcome is None:
+                # retry: задача снова 'queued' в БД, в очередь — после паузы
+                delay = self._retry_delay(task["attempts"])
+                loop.call_later(delay, queue.put_nowait, (neg_priority, task_id))
+                continue
+
+            self._settle(task_id, outcome)
+
+    async def _attempt(self, task: Dict[str, Any]) -> Optional[Outcome]:
+        """
+        One attempt. Returns the final outcome, or None if the task was
+        put back into the queue for a retry.
+        """
+        task_id = task["id"]
+        self._running[task_id] = asyncio.ensure_future(
+            asyncio.wait_for(self.execute(task), self.timeout)
+        )
+
+        try:
+            result = await self._running[task_id]
+        except asyncio.CancelledError:
+            if task_id not in self._cancelled:
+                # отменили сам воркер (shutdown) — задача остаётся в очереди
+                self.store.transition(task_id, STATUS_QUEUED, from_statuses=(STATUS_RUNNING,))
+                raise
+            self._cancelled.discard(task_id)
+            self.store.transition(task_id, STATUS_CANCELLED, from_statuses=(STATUS_RUNNING,))
+            return STATUS_CANCELLED, None
+        except Exception as e:
+            error = "timeout" if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+
+            if task["attempts"] < self.max_attempts:
+                log.warning("TASK_RETRY | id=%s | attempt=%s | %s", task_id, task["attempts"], error)
+                self.store.transition(task_id, STATUS_QUEUED, from_statuses=(STATUS_RUNNING,), result=error)
+                return None
+
+            self.store.fail(task_id, error)
+            return STATUS_ERROR, error
+        finally:
+            self._running.pop(task_id, None)
+
+        self.store.complete(task_id, result)
+        return STATUS_DONE, result
+
+
+# Global runner
+task_runner = TaskRunner(
+    concurrency=settings.TASK_RUNNER_CONCURRENCY,
+    max_attempts=settings.TASK_RUNNER_MAX_ATTEMPTS,
+    timeout=settings.TASK_RUNNER_TIMEOUT,
+)
@@ -0,0 +1,349 @@
+# src/bot/ai/task_store.py
+"""
+File: src/bot/ai/task_store.py
+
+Purpose:
+SQLite task repository for the Task Manager (/taskadd, /taskrun, ...).
+
+Responsibilities:
+- Store tasks in data/tasks.db (AUTOINCREMENT ids, indexed status/category/user)
+- Atomic status transitions (conditional UPDATE, no read-modify-write)
+- One-shot import of the legacy data/tasks.json store
+- Schema versioned through PRAGMA user_version (same runner as the audit ledger)
+
+IMPORTANT:
+- Every operation touches only the rows it needs: O(log n) via indexes
+- Concurrent handlers cannot lose updates: writes go through one writer
+  connection and transitions check the current status in SQL
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.audit.migrations import apply_migrations
+from src.core.sqlite_pool import SQLiteConnectionPool
+
+log = logging.getLogger("mindforge.tasks")
+
+TASK_DB_PATH = "data/tasks.db"
+LEGACY_JSON_PATH = "data/tasks.json"
+READER_POOL_SIZE = 2
+
+STATUS_NEW = "new"
+STATUS_QUEUED = "queued"        # ждёт воркера TaskRunner (переживает рестарт)
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+STATUS_CANCELLED = "cancelled"
+
+_KEEP = object()
+
+
+# =====================================================
+# Schema (append-only migrations)
+# =====================================================
+MIGRATIONS = [
+    (1, "tasks", lambda: """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            task       TEXT NOT NULL,
+            category   TEXT NOT NULL,
+            status     TEXT NOT NULL DEFAULT 'new',
+            result     TEXT,
+            user_id    INTEGER,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_tasks_status   ON tasks(status, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_user     ON tasks(user_id, id);
+
+        CREATE TABLE IF NOT EXISTS task_store_meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """),
+
+    # очередь TaskRunner: приоритет, попытки, порядок выборки
+    (2, "runner_queue", lambda: """
+        ALTER TABLE tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE tasks ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0;
+
+        CREATE INDEX IF NOT EXISTS idx_tasks_queue ON tasks(status, priority DESC, id);
+    """),
+
+    # откуда категория: user | llm | keywords | classifier | default (NULL — старые строки)
+    (3, "category_source", lambda: """
+        ALTER TABLE tasks ADD COLUMN category_source TEXT;
+
+        CREATE INDEX IF NOT EXISTS idx_tasks_category_source ON tasks(category_source, id);
+    """),
+]
+
+
+# =====================================================
+# SQL
+# =====================================================
+SQL_INSERT = """
+    INSERT INTO tasks (task, category, category_source, status, result, user_id, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_WITH_ID = """
+    INSERT OR IGNORE INTO tasks
+    (id, task, category, status, result, user_id, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_GET = "SELECT * FROM tasks WHERE id = ?"
+
+SQL_LABELED = """
+    SELECT task, category FROM tasks
+    WHERE category_source IN ({sources})
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+SQL_QUEUED = """
+    SELECT * FROM tasks
+    WHERE status = 'queued'
+    ORDER BY priority DESC, id
+"""
+
+SQL_ENQUEUE = """
+    UPDATE tasks SET status = 'queued', priority = ?, attempts = 0, updated_at = ?
+    WHERE id = ? AND status IN ('new', 'error', 'cancelled')
+"""
+
+SQL_REQUEUE_INTERRUPTED = """
+    UPDATE tasks SET status = 'queued', updated_at = ?
+    WHERE status = 'running'
+"""
+
+SQL_META_GET = "SELECT value FROM task_store_meta WHERE key = ?"
+SQL_META_SET = "INSERT OR REPLACE INTO task_store_meta (key, value) VALUES (?, ?)"
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+class TaskRepository:
+    def __init__(
+        self,
+        db_path: str = TASK_DB_PATH,
+        readers: int = READER_POOL_SIZE,
+        legacy_json: Optional[str] = LEGACY_JSON_PATH,
+    ) -> None:
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._pool = SQLiteConnectionPool(db_path, readers=readers)
+
+        with self._pool.writer() as conn:
+            apply_migrations(conn, MIGRATIONS, label="Task store")
+
+        if legacy_json:
+            self.import_json(legacy_json)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    @staticmethod
+    def _row(row) -> Optional[Dict[str, Any]]:
+        return dict(row) if row is not None else None
+
+    # -------------------------------------------------
+    # Create / read
+    # -------------------------------------------------
+    def add(
+        self,
+        task: str,
+        category: str,
+        *,
+        user_id: Optional[int] = None,
+        status: str = STATUS_NEW,
+        category_source: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        now = _now()
+        with self._pool.writer() as conn:
+            cur = conn.execute(
+                SQL_INSERT, (task, category, category_source, status, None, user_id, now, now)
+            )
+            return self._row(conn.execute(SQL_GET, (cur.lastrowid,)).fetchone())
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        with self._pool.reader() as conn:
+            return self._row(conn.execute(SQL_GET, (task_id,)).fetchone())
+
+    def list(
+        self,
+        *,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        user_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        where, params = [], []
+        for column, value in (("status", status), ("category", category), ("user_id", user_id)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+
+        sql = "SELECT * FROM tasks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._pool.reader() as conn:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+    def labeled(self, sources: Iterable[str], limit: int) -> List[tuple]:
+        """
+        (task, category) of the newest `limit` tasks whose category came
+        from one of `sources`.
+        """
+        sources = list(sources)
+        sql = SQL_LABELED.format(sources=", ".join("?" * len(sources)))
+
+        with self._pool.reader() as conn:
+            return [tuple(r) for r in conn.execute(sql, [*sources, limit]).fetchall()]
+
+    # -------------------------------------------------
+    # Atomic transitions
+    # -------------------------------------------------
+    def transition(
+        self,
+        task_id: int,
+        to_status: str,
+        *,
+        from_statuses: Optional[Iterable[str]] = None,
+        result: Any = _KEEP,
+    ) -> bool:
+        """
+        Move a task to `to_status` only if its current status is in
+        `from_statuses` (any status if None). Returns True if it moved.
+        """
+        sets = ["status = ?", "updated_at = ?"]
+        params: List[Any] = [to_status, _now()]
+
+        if result is not _KEEP:
+            sets.append("result = ?")
+            params.append(result)
+
+        sql = f"UPDATE tasks SET {', '.join(sets)} WHERE id = ?"
+        params.append(task_id)
+
+        if from_statuses is not None:
+            allowed = list(from_statuses)
+            sql += f" AND status IN ({', '.join('?' * len(allowed))})"
+            params.extend(allowed)
+
+        with self._pool.writer() as conn:
+            return conn.execute(sql, params).rowcount == 1
+
+    def claim(
+        self,
+        task_id: int,
+        *,
+        from_statuses: Optional[Iterable[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        running ← `from_statuses` (any non-running status if None), attempts + 1.
+        None if the task does not exist or someone else already took it.
+        """
+        sql = "UPDATE tasks SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?"
+        params: List[Any] = [STATUS_RUNNING, _now(), task_id]
+
+        if from_statuses is None:
+            sql += " AND status != ?"
+            params.append(STATUS_RUNNING)
+        else:
+            allowed = list(from_statuses)
+            sql += f" AND status IN ({', '.join('?' * len(allowed))})"
+            params.extend(allowed)
+
+        with self._pool.writer() as conn:
+            if conn.execute(sql, params).rowcount != 1:
+                return None
+            return self._row(conn.execute(SQL_GET, (task_id,)).fetchone())
+
+    def complete(self, task_id: int, result: str) -> bool:
+        return self.transition(task_id, STATUS_DONE, from_statuses=(STATUS_RUNNING,), result=result)
+
+    def fail(self, task_id: int, error: str) -> bool:
+        return self.transition(task_id, STATUS_ERROR, from_statuses=(STATUS_RUNNING,), result=error)
+
+    # -------------------------------------------------
+    # Runner queue (persisted: a restart resumes it)
+    # -------------------------------------------------
+    def enqueue(self, task_id: int, priority: int = 0) -> bool:
+        with self._pool.writer() as conn:
+            return conn.execute(SQL_ENQUEUE, (priority, _now(), task_id)).rowcount == 1
+
+    def queued(self) -> List[Dict[str, Any]]:
+        with self._pool.reader() as conn:
+            return [dict(r) for r in conn.execute(SQL_QUEUED).fetchall()]
+
+    def requeue_interrupted(self) -> int:
+        """
+        Tasks left 'running' by a crashed / stopped process go back to the queue.
+        """
+        with self._pool.writer() as conn:
+            return conn.execute(SQL_REQUEUE_INTERRUPTED, (_now(),)).rowcount
+
+    # -------------------------------------------------
+    # Legacy import (data/tasks.json → SQLite, once)
+    # -------------------------------------------------
+    def import_json(self, path: str) -> int:
+        """
+        Import tasks from the legacy JSON store, keeping their ids.
+        Runs once per database; returns the number of imported tasks.
+        """
+        json_path = Path(path)
+
+        with self._pool.writer() as conn:
+            if conn.execute(SQL_META_GET, ("json_imported",)).fetchone():
+                return 0
+
+            if not json_path.exists():
+                return 0
+
+            try:
+                tasks = json.loads(json_path.read_text(encoding="utf-8") or "[]")
+            except json.JSONDecodeError:
+                log.warning("TASKS_JSON_UNREADABLE | %s", json_path)
+                tasks = []
+
+            now = _now()
+            rows = [
+                (
+                    t["id"],
+                    t.get("task", ""),
+                    t.get("category", "llm"),
+                    t.get("status", STATUS_NEW),
+                    t.get("result"),
+                    t.get("user_id"),
+                    now,
+                    now,
+                )
+                for t in tasks
+                if isinstance(t, dict) and "id" in t
+            ]
+
+            conn.executemany(SQL_INSERT_WITH_ID, rows)
+            conn.execute(SQL_META_SET, ("json_imported", f"{json_path}|{now}|{len(rows)}"))
+
+        log.info("TASKS_JSON_IMPORTED | %s | %s tasks", json_path, len(rows))
+        return len(rows)
+
+
+# Global repository
+task_store = TaskRepository()
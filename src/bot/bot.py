@@ -7,6 +7,13 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 
 from src.bot.config import settings
+from src.bot.ai.llm_client import llm_client
+from src.bot.ai.llm_router import system_prefix
+from src.bot.ai.task_runner import task_runner
+from src.bot.utils.system_chat_bridge import SystemChatBridge, parse_chat_ids
+from src.core.audit.bus import audit_bus
+from src.core.audit.writer import audit_writer
+from src.core.policy import policy_reloader
 
 # ---- ROUTERS ----
 from src.bot.handlers.start_menu import router as start_menu_router
@@ -62,8 +69,64 @@ async def main() -> None:
     dp.include_router(uag_schema_router)
     dp.include_router(session_replay_router)
 
+    # =====================================================
+    # LOCAL LLM WARM-UP (фон: polling стартует сразу)
+    # =====================================================
+    if settings.LOCAL_LLM_ENABLED and settings.LOCAL_LLM_WARMUP:
+        llm_client.start_warmup(prefix=system_prefix())
+        log.info("LLM | warm-up started in background")
+
+    # =====================================================
+    # TASK RUNNER: задачи, прерванные прошлым рестартом
+    # =====================================================
+    resume_run = None
+    if settings.TASK_RUNNER_RESUME and task_runner.resume():
+        resume_run = asyncio.create_task(task_runner.run_pending())
+        log.info("TASKS | resuming queued tasks in background")
+
+    # =====================================================
+    # POLICY HOT RELOAD (rules.yaml → без рестарта)
+    # =====================================================
+    if settings.POLICY_HOT_RELOAD:
+        policy_reloader.interval = settings.POLICY_RELOAD_INTERVAL
+        policy_reloader.start()
+
+    # =====================================================
+    # SYSTEM CHAT → TELEGRAM (digests, live message, quotas)
+    # =====================================================
+    bridge = None
+    bridge_chats = parse_chat_ids(settings.SYSTEM_CHAT_BRIDGE_CHAT_IDS)
+    if settings.SYSTEM_CHAT_BRIDGE_ENABLED and bridge_chats:
+        bridge = SystemChatBridge(
+            bot,
+            bridge_chats,
+            window=settings.SYSTEM_CHAT_DIGEST_WINDOW,
+            level=settings.SYSTEM_CHAT_BRIDGE_LEVEL,
+            global_rate=settings.SYSTEM_CHAT_BRIDGE_GLOBAL_RATE,
+            chat_rate=settings.SYSTEM_CHAT_BRIDGE_CHAT_RATE,
+        )
+        await bridge.start()
+
     log.info("BOT | polling start")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        policy_reloader.stop()
+
+        if bridge is not None:
+            await bridge.stop()
+            log.info("SYSTEM_CHAT_BRIDGE | stopped | %s", bridge.stats())
+
+        # незавершённые задачи остаются 'queued' → продолжатся после рестарта
+        await task_runner.stop()
+
+        # flush every audit bus sink (ring / logger / JSONL / ledger)
+        audit_bus.close()
+        log.info("AUDIT | bus drained | %s", audit_bus.stats())
+
+        # durable flush of the audit ledger (group commit queue)
+        audit_writer.close()
+        log.info("AUDIT | writer flushed | %s", audit_writer.stats())
 
 
 if __name__ == "__main__":
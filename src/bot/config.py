@@ -34,6 +34,8 @@ class Settings(BaseSettings):
     # -------------------------------------------------------------
     APP_ENV: str = "prod"                 # prod | demo
     DEFAULT_POLICY_MODE: str = "STRICT"   # STRICT | DEMO | OFF
+    POLICY_HOT_RELOAD: bool = True        # watch src/core/policy/rules.yaml
+    POLICY_RELOAD_INTERVAL: float = 1.0   # seconds between mtime polls
 
     # -------------------------------------------------------------
     # LOCAL LLaMA CONFIG (future use)
@@ -43,6 +45,53 @@ class Settings(BaseSettings):
     LOCAL_LLM_CTX: int = 4096
     LOCAL_LLM_THREADS: int = 6
     LOCAL_LLM_GPU_LAYERS: int = 0
+    LOCAL_LLM_WORKERS: int = 1            # model instances (RAM × N)
+    LOCAL_LLM_QUEUE_SIZE: int = 32        # pending requests before "busy"
+    LOCAL_LLM_WARMUP: bool = True         # load + warm the model at startup
+    LOCAL_LLM_USE_MMAP: bool = True       # map GGUF instead of reading it
+    LOCAL_LLM_USE_MLOCK: bool = False     # pin weights in RAM (needs ulimit -l)
+
+    # -------------------------------------------------------------
+    # LLM ROUTER (providers: llama | openai | mock)
+    # -------------------------------------------------------------
+    LLM_DEFAULT_PROVIDER: str = "llama"
+    LLM_HTTP_URL: str = ""                # OpenAI-compatible /v1/completions ("" = mock)
+    LLM_HTTP_MODEL: str = "local"
+    LLM_HTTP_TIMEOUT: float = 60.0
+    LLM_HTTP_API_KEY: str = ""
+
+    # -------------------------------------------------------------
+    # LLM RESPONSE CACHE
+    # -------------------------------------------------------------
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_SIZE: int = 512             # memory tier entries
+    LLM_CACHE_TTL: float = 3600.0         # memory tier, seconds
+    LLM_CACHE_DB_PATH: str = ""           # e.g. data/llm_cache.db ("" = memory only)
+    LLM_CACHE_DISK_TTL: float = 604800.0  # disk tier, seconds
+
+    # -------------------------------------------------------------
+    # TASK RUNNER (/taskrunall)
+    # -------------------------------------------------------------
+    TASK_RUNNER_CONCURRENCY: int = 4
+    TASK_RUNNER_MAX_ATTEMPTS: int = 3
+    TASK_RUNNER_TIMEOUT: float = 180.0    # seconds per attempt
+    TASK_RUNNER_RESUME: bool = True       # resume queued tasks at startup
+
+    # -------------------------------------------------------------
+    # TASK CATEGORIZER (/taskadd)
+    # -------------------------------------------------------------
+    TASK_CATEGORIZER_THRESHOLD: float = 0.6    # below → LLM router
+    TASK_CATEGORIZER_MIN_SAMPLES: int = 20     # tasks needed to train the classifier
+
+    # -------------------------------------------------------------
+    # SYSTEM CHAT → TELEGRAM (agent activity digests)
+    # -------------------------------------------------------------
+    SYSTEM_CHAT_BRIDGE_ENABLED: bool = False
+    SYSTEM_CHAT_BRIDGE_CHAT_IDS: str = ""          # comma-separated chat ids
+    SYSTEM_CHAT_BRIDGE_LEVEL: str = "INFO"         # INFO | WARN | ERROR
+    SYSTEM_CHAT_DIGEST_WINDOW: float = 2.0         # seconds a burst is collected
+    SYSTEM_CHAT_BRIDGE_GLOBAL_RATE: float = 25.0   # messages / s, all chats
+    SYSTEM_CHAT_BRIDGE_CHAT_RATE: float = 1.0      # messages / s, per chat
 
     # -------------------------------------------------------------
     # API (RAG / UAG / external services)
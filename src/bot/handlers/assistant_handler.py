@@ -2,7 +2,8 @@ from aiogram import Router, types
 from aiogram.filters import Command
 from datetime import datetime
 
-from src.bot.ai.llm_router import route
+from src.bot.ai.llm_router import route, route_stream
+from src.bot.utils.stream_reply import stream_reply
 from src.polygon.scenario_registry import ScenarioRegistry
 from src.polygon.scenario_formatter import format_scenario_for_telegram
 
@@ -72,10 +73,9 @@ async def ask_cmd(message: types.Message):
         return await message.answer("Использование: /ask <вопрос>")
 
     question = parts[1]
-    await message.answer("⏳ Думаю…")
 
-    resp = await route(question)
-    await message.answer(resp)
+    # ответ появляется по мере генерации (правки одного сообщения)
+    await stream_reply(message, route_stream(question, user_id=message.chat.id))
 
 
 # ------------------------------
@@ -89,7 +89,7 @@ async def plan_cmd(message: types.Message):
 
     await message.answer("⏳ Строю план…")
     query = f"Составь подробный пошаговый план: {parts[1]}"
-    resp = await route(query)
+    resp = await route(query, user_id=message.chat.id)
     await message.answer(resp)
 
 
@@ -168,7 +168,7 @@ async def general_dialogue(message: types.Message):
     if message.text.startswith("/"):
         return
 
-    resp = await route(message.text)
+    resp = await route(message.text, user_id=message.chat.id)
     await message.answer(resp)
 
 
@@ -35,7 +35,8 @@ async def generate_question(topic: str, context: Optional[str] = None) -> str:
     prompt = f"Сгенерируй один сложный и интересный вопрос по теме '{topic}'."
     if context:
         prompt += f"\nУчти контекст предыдущих вопросов: {context}"
-    return await route(prompt)
+    # каждый вопрос должен быть новым — ответ не кэшируем
+    return await route(prompt, use_cache=False)
 
 
 async def evaluate_answer(question: str, user_answer: str, topic: str) -> Dict[str, Any]:
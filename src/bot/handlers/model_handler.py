@@ -4,14 +4,12 @@ from aiogram import Router, types
 from aiogram.filters import Command
 from datetime import datetime
 
-from src.bot.ai.llm_router import route
-from src.bot.ai.task_engine import (
-    load_tasks,
-    save_tasks,
-    get_next_id,
-    auto_categorize,
-    run_task
-)
+from src.bot.ai.llm_router import route, route_stream
+from src.bot.utils.stream_reply import stream_reply
+from src.bot.ai.categorizer import PATH_KEYWORDS
+from src.bot.ai.task_engine import add_task, run_task
+from src.bot.ai.task_runner import task_runner
+from src.bot.ai.task_store import task_store
 
 router = Router()
 
@@ -70,7 +68,8 @@ async def help_cmd(message: types.Message):
         "/tasklist\n"
         "/taskstatus <id>\n"
         "/taskrun <id>\n"
-        "/taskrunall\n\n"
+        "/taskrunall\n"
+        "/taskcancel <id>\n\n"
         "🏗 Строительный агент запускается по словам: «хочу фундамент»."
     )
 
@@ -83,7 +82,7 @@ async def today_cmd(message: types.Message):
 
 @router.message(Command("who"))
 async def who_cmd(message: types.Message):
-    resp = await route("кто ты?")
+    resp = await route("кто ты?", user_id=message.chat.id)
     await message.answer(resp)
 
 
@@ -93,8 +92,7 @@ async def ask_cmd(message: types.Message):
     if len(parts) < 2:
         return await message.answer("Использование: /ask <вопрос>")
 
-    resp = await route(parts[1])
-    await message.answer(resp)
+    await stream_reply(message, route_stream(parts[1], user_id=message.chat.id))
 
 
 @router.message(Command("plan"))
@@ -104,7 +102,7 @@ async def plan_cmd(message: types.Message):
         return await message.answer("Использование: /plan <задача>")
 
     query = f"Составь детальный пошаговый план: {parts[1]}"
-    resp = await route(query)
+    resp = await route(query, user_id=message.chat.id)
     await message.answer(resp)
 
 
@@ -133,19 +131,10 @@ async def task_add(message: types.Message):
     else:
         # автоопределение категории
         text = " ".join(parts[1:])
-        category = await auto_categorize(text)
-
-    tasks = load_tasks()
-    t_id = get_next_id(tasks)
+        category = None
 
-    tasks.append({
-        "id": t_id,
-        "task": text,
-        "category": category,
-        "status": "new",
-        "result": None
-    })
-    save_tasks(tasks)
+    task = await add_task(text, user_id=message.from_user.id, category=category)
+    t_id, category = task["id"], task["category"]
 
     await message.answer(
         f"📝 Создана задача {t_id}\nКатегория: {category}\nТекст: {text}"
@@ -154,7 +143,7 @@ async def task_add(message: types.Message):
 
 @router.message(Command("tasklist"))
 async def task_list(message: types.Message):
-    tasks = load_tasks()
+    tasks = task_store.list()
     if not tasks:
         return await message.answer("📭 Нет задач.")
 
@@ -176,8 +165,7 @@ async def task_status(message: types.Message):
         return await message.answer("Использование: /taskstatus <id>")
 
     t_id = int(parts[1])
-    tasks = load_tasks()
-    t = next((x for x in tasks if x["id"] == t_id), None)
+    t = task_store.get(t_id)
 
     if not t:
         return await message.answer("❌ Задача не найдена.")
@@ -214,23 +202,39 @@ async def task_run(message: types.Message):
 
 @router.message(Command("taskrunall"))
 async def task_run_all(message: types.Message):
-    tasks = load_tasks()
-    new_tasks = [t for t in tasks if t["status"] == "new"]
+    queued = task_runner.enqueue_new()
 
-    if not new_tasks:
+    if not queued:
         return await message.answer("📭 Нет новых задач.")
 
-    await message.answer(f"⚙ Выполняю {len(new_tasks)} задач...")
+    await message.answer(
+        f"⚙ Выполняю {queued} задач (параллельно: {task_runner.concurrency})..."
+    )
+
+    outcomes = await task_runner.run_pending()
 
     results = []
-    for t in new_tasks:
-        result, err = await run_task(t["id"])
-        if err:
-            results.append(f"❌ {t['id']}: {err}")
+    for t_id, (status, detail) in sorted(outcomes.items()):
+        if status == "done":
+            results.append(f"✅ {t_id}: OK")
+        elif status == "cancelled":
+            results.append(f"⏹ {t_id}: отменена")
         else:
-            results.append(f"✅ {t['id']}: OK")
+            results.append(f"❌ {t_id}: {detail}")
 
-    await message.answer("\n".join(results))
+    await message.answer("\n".join(results) or "📭 Нет результатов.")
+
+
+@router.message(Command("taskcancel"))
+async def task_cancel(message: types.Message):
+    parts = message.text.split(maxsplit=1)
+    if len(parts) < 2 or not parts[1].isdigit():
+        return await message.answer("Использование: /taskcancel <id>")
+
+    if task_runner.cancel(int(parts[1])):
+        await message.answer(f"⏹ Задача {parts[1]} отменена.")
+    else:
+        await message.answer("❌ Задача не в очереди и не выполняется.")
 
 
 # =========================================================
@@ -247,17 +251,9 @@ async def foundation_or_chat(message: types.Message):
 
     # 1) Если это фундамент — перехватываем
     if any(w in text for w in FOUNDATION_KEYWORDS):
-        tasks = load_tasks()
-        t_id = get_next_id(tasks)
-
-        tasks.append({
-            "id": t_id,
-            "task": message.text,
-            "category": "build",
-            "status": "new",
-            "result": None
-        })
-        save_tasks(tasks)
+        t_id = task_store.add(
+            message.text, "build", user_id=message.from_user.id, category_source=PATH_KEYWORDS
+        )["id"]
 
         await message.answer(f"🏗 Создана строительная задача {t_id}. Запускаю расчёт...")
 
@@ -272,5 +268,5 @@ async def foundation_or_chat(message: types.Message):
         )
 
     # 2) Иначе — обычная беседа с ассистентом
-    resp = await route(message.text)
+    resp = await route(message.text, user_id=message.chat.id)
     await message.answer(resp)
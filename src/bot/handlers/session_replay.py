@@ -1,8 +1,10 @@
+import asyncio
 import logging
 from aiogram import Router, F
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from src.core.audit.db import audit_db
+from src.core.audit.writer import audit_writer
 
 log = logging.getLogger("mindforge.replay")
 
@@ -16,6 +18,10 @@ router = Router()
 async def session_replay_start(call: CallbackQuery):
     await call.answer()
 
+    # события пишутся group-commit'ом — дожидаемся хвоста сессии
+    # (flush ждёт на threading.Condition → не в event loop)
+    await asyncio.to_thread(audit_writer.flush, 0.5)
+
     session = audit_db.get_last_session_for_user(call.from_user.id)
     if not session:
         await call.message.answer("❌ Нет сессий для воспроизведения")
@@ -54,6 +60,7 @@ async def replay_step(call: CallbackQuery):
     step_str, session_id = raw.split(":")
     step = int(step_str)
 
+    await asyncio.to_thread(audit_writer.flush, 0.5)
     timeline = audit_db.get_session_timeline(session_id)
 
     if step >= len(timeline):
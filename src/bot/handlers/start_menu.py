@@ -12,6 +12,7 @@ from aiogram.fsm.context import FSMContext
 
 from src.bot.states.demo_states import DemoStates
 from src.core.audit.db import audit_db
+from src.core.audit.writer import audit_writer
 
 log = logging.getLogger("mindforge.handlers.start_menu")
 
@@ -48,7 +49,7 @@ async def cmd_start(message: Message, state: FSMContext):
     await state.update_data(session_id=session_id)
 
     # 🧾 AUDIT: UI_EVENT
-    audit_db.log_event(
+    audit_writer.log_event(
         session_id=session_id,
         user_id=user.id,
         username=user.username or "",
@@ -100,7 +101,7 @@ async def demo_start_callback(call: CallbackQuery, state: FSMContext):
         audit_db.update_state(session_id, "dashboard")
 
         # 🧾 AUDIT: FSM transition
-        audit_db.log_event(
+        audit_writer.log_event(
             session_id=session_id,
             user_id=user.id,
             username=user.username or "",
@@ -1,13 +1,9 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 
-from src.bot.ai.task_engine import (
-    load_tasks,
-    save_tasks,
-    get_next_id,
-    auto_categorize,
-    run_task
-)
+from src.bot.ai.categorizer import PATH_KEYWORDS
+from src.bot.ai.task_engine import add_task, run_task
+from src.bot.ai.task_store import task_store
 
 router = Router()
 
@@ -34,20 +30,10 @@ async def task_add(message: types.Message):
         text = parts[2]
     else:
         text = parts[1]
-        category = await auto_categorize(text)
+        category = None
 
-    tasks = load_tasks()
-    t_id = get_next_id(tasks)
-
-    tasks.append({
-        "id": t_id,
-        "task": text,
-        "category": category,
-        "status": "new",
-        "result": None
-    })
-
-    save_tasks(tasks)
+    task = await add_task(text, user_id=message.from_user.id, category=category)
+    t_id, category = task["id"], task["category"]
 
     await message.answer(f"📝 Задача создана (ID {t_id})\nКатегория: {category}\n{text}")
 
@@ -56,7 +42,7 @@ async def task_add(message: types.Message):
 # ---------------------------
 @router.message(Command("tasklist"))
 async def task_list(message: types.Message):
-    tasks = load_tasks()
+    tasks = task_store.list()
 
     if not tasks:
         return await message.answer("📭 Нет задач.")
@@ -96,18 +82,9 @@ async def foundation_detector(message: types.Message):
     text = (message.text or "").lower()
 
     if any(k in text for k in FOUNDATION_KEYWORDS):
-        tasks = load_tasks()
-        t_id = get_next_id(tasks)
-
-        tasks.append({
-            "id": t_id,
-            "task": message.text,
-            "category": "build",
-            "status": "new",
-            "result": None
-        })
-
-        save_tasks(tasks)
+        t_id = task_store.add(
+            message.text, "build", user_id=message.from_user.id, category_source=PATH_KEYWORDS
+        )["id"]
 
         await message.answer(f"🏗 Создана строительная задача ID {t_id}. Рассчитываю...")
 
@@ -1,8 +1,10 @@
+import asyncio
 import logging
 import json
 from aiogram import Router, F
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from src.core.audit.db import audit_db
+from src.core.audit.writer import audit_writer
 
 log = logging.getLogger("mindforge.uag")
 router = Router()
@@ -78,7 +80,7 @@ async def show_uag_schema(call: CallbackQuery):
         session_id = session["session_id"]
         audit_db.update_state(session_id, "why_dashboard")
 
-    audit_db.log_event(
+    audit_writer.log_event(
         session_id=session_id,
         user_id=user.id,
         username=user.username or "",
@@ -105,9 +107,13 @@ async def show_live_logs(call: CallbackQuery):
         return
 
     session_id = session["session_id"]
+
+    # события пишутся group-commit'ом — дожидаемся, чтобы показать «живые» логи
+    # (flush ждёт на threading.Condition → не в event loop)
+    await asyncio.to_thread(audit_writer.flush, 0.5)
     events = audit_db.get_events(session_id, limit=20)
 
-    audit_db.log_event(
+    audit_writer.log_event(
         session_id=session_id,
         user_id=user.id,
         username=user.username or "",
@@ -166,7 +172,7 @@ async def show_db_example(call: CallbackQuery):
         },
     }
 
-    audit_db.log_event(
+    audit_writer.log_event(
         session_id=session_id,
         user_id=user.id,
         username=user.username or "",
@@ -7,7 +7,7 @@ from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 
-from src.core.audit.db import audit_db
+from src.core.audit.writer import audit_writer
 
 log = logging.getLogger("mindforge.middleware.ui")
 
@@ -21,7 +21,7 @@ class UIButtonLoggerMiddleware(BaseMiddleware):
     UI Governance Middleware
     - предотвращает дублирующие клики
     - логирует ВСЕ события через Audit Ledger
-    - не имеет прямого доступа к БД
+    - не имеет прямого доступа к БД (пишет через audit_writer, group commit)
     """
 
     async def __call__(
@@ -64,7 +64,7 @@ class UIButtonLoggerMiddleware(BaseMiddleware):
             elapsed = now - _ui_locks[lock_key]
             if elapsed < LOCK_TIMEOUT:
                 # 🧾 AUDIT: POLICY DENY
-                audit_db.log_event(
+                audit_writer.log_event(
                     session_id=session_id,
                     user_id=user.id,
                     username=user.username or "",
@@ -99,7 +99,7 @@ class UIButtonLoggerMiddleware(BaseMiddleware):
 
         try:
             # 🧾 AUDIT: UI_EVENT
-            audit_db.log_event(
+            audit_writer.log_event(
                 session_id=session_id,
                 user_id=user.id,
                 username=user.username or "",
@@ -0,0 +1,268 @@
+# src/bot/utils/chat_digest.py
+"""
+File: src/bot/utils/chat_digest.py
+
+Purpose:
+Digest planning for the SystemChat → Telegram bridge (no Telegram I/O here).
+
+Responsibilities:
+- Coalesce a burst of SystemChat events into compact digest lines
+  (same message from many agents → one line with a counter)
+- Keep one "live" message per chat and plan in-place edits while it is
+  fresh and fits into 4096 chars, a new message otherwise
+- Enforce global and per-chat send quotas (TokenBucket): over quota the
+  lines stay pending and merge into the next digest
+- Re-queue lines after RetryAfter / failed edits, drop rejected sends
+
+IMPORTANT:
+- Single consumer (the bridge task): not thread-safe by design
+- Every send AND every edit costs one token from both buckets
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional
+
+from src.bot.utils.rate_limit import TokenBucket
+
+MESSAGE_LIMIT = 4096
+MAX_LINES = 30            # lines kept in the live message
+MAX_PENDING = 200         # lines waiting for quota per chat
+LIVE_TTL = 120.0          # seconds a live message keeps being edited
+MAX_IDS = 3               # agent ids listed on a coalesced line
+
+HEADER = "🛰 System Chat"
+LEVEL_ICONS = {"WARN": "⚠️ ", "WARNING": "⚠️ ", "ERROR": "❌ "}
+
+SEND = "send"
+EDIT = "edit"
+
+
+# =====================================================
+# Coalescing
+# =====================================================
+def _one_line(message: str) -> str:
+    return " · ".join(part.strip() for part in str(message).splitlines() if part.strip())
+
+
+def build_lines(events: Iterable[Dict]) -> List[str]:
+    """
+    One line per (agent_role, level, message), in first-seen order.
+    """
+    groups: Dict[tuple, Dict] = {}
+    for e in events:
+        key = (e.get("agent_role"), e.get("level"), e.get("message"))
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {"event": e, "ids": [e.get("agent_id")]}
+        else:
+            group["ids"].append(e.get("agent_id"))
+
+    lines = []
+    for (role, level, message), group in groups.items():
+        ids = list(dict.fromkeys(group["ids"]))   # уникальные, в порядке появления
+        clock = str(group["event"].get("timestamp_utc", ""))[11:19]
+        count = len(group["ids"])
+
+        if count == 1:
+            who = ids[0]
+        else:
+            shown = ", ".join(str(i) for i in ids[:MAX_IDS])
+            more = f", +{len(ids) - MAX_IDS}" if len(ids) > MAX_IDS else ""
+            who = f"{role} ×{count}: {shown}{more}"
+
+        lines.append(f"{clock} {LEVEL_ICONS.get(level, '')}[{who}] {_one_line(message)}".strip())
+    return lines
+
+
+def render(lines: Iterable[str], *, skipped: int = 0) -> str:
+    body = "\n".join(lines)
+    head = HEADER if not skipped else f"{HEADER} (+{skipped} пропущено)"
+    text = f"{head}\n{body}"
+    if len(text) > MESSAGE_LIMIT:
+        text = text[: MESSAGE_LIMIT - 1] + "…"
+    return text
+
+
+# =====================================================
+# Planner
+# =====================================================
+@dataclass
+class DigestAction:
+    chat_id: int
+    kind: str                       # send | edit
+    text: str
+    message_id: Optional[int]
+    lines: List[str]                # lines shown after the action
+    new_lines: List[str]            # lines taken from pending (re-queued on failure)
+    skipped: int = 0                # "(+N пропущено)" shown after the action
+
+
+@dataclass
+class _LiveMessage:
+    message_id: int
+    opened_at: float
+    lines: Deque[str] = field(default_factory=lambda: deque(maxlen=MAX_LINES))
+    skipped: int = 0                # shown in the header, grows with every edit
+
+
+class _ChatState:
+    __slots__ = ("bucket", "pending", "skipped", "live", "blocked_until")
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self.bucket = bucket
+        self.pending: Deque[str] = deque()
+        self.skipped = 0
+        self.live: Optional[_LiveMessage] = None
+        self.blocked_until = 0.0
+
+
+class DigestPlanner:
+    def __init__(
+        self,
+        *,
+        global_bucket: TokenBucket,
+        chat_rate: float,
+        chat_burst: int,
+        live_ttl: float = LIVE_TTL,
+        max_lines: int = MAX_LINES,
+        max_pending: int = MAX_PENDING,
+    ) -> None:
+        self.global_bucket = global_bucket
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.live_ttl = live_ttl
+        self.max_lines = max_lines
+        self.max_pending = max_pending
+
+        self._chats: Dict[int, _ChatState] = {}
+
+        self.stats: Dict[str, int] = {
+            "events": 0,
+            "lines": 0,
+            "sent": 0,
+            "edited": 0,
+            "deferred": 0,
+            "skipped": 0,
+            "retries": 0,
+        }
+
+    def _state(self, chat_id: int) -> _ChatState:
+        state = self._chats.get(chat_id)
+        if state is None:
+            state = self._chats[chat_id] = _ChatState(TokenBucket(self.chat_rate, self.chat_burst))
+        return state
+
+    # -------------------------------------------------
+    # Input
+    # -------------------------------------------------
+    def add(self, chat_id: int, events: List[Dict]) -> None:
+        lines = build_lines(events)
+        state = self._state(chat_id)
+        state.pending.extend(lines)
+
+        overflow = len(state.pending) - self.max_pending
+        for _ in range(max(0, overflow)):
+            state.pending.popleft()
+        if overflow > 0:
+            state.skipped += overflow
+            self.stats["skipped"] += overflow
+
+        self.stats["events"] += len(events)
+        self.stats["lines"] += len(lines)
+
+    def has_pending(self) -> bool:
+        return any(s.pending for s in self._chats.values())
+
+    def pending_chats(self) -> List[int]:
+        return [chat_id for chat_id, s in self._chats.items() if s.pending]
+
+    # -------------------------------------------------
+    # Planning
+    # -------------------------------------------------
+    def next_action(self, chat_id: int, now: Optional[float] = None) -> Optional[DigestAction]:
+        """
+        What to do for `chat_id` right now, or None (nothing pending,
+        RetryAfter pause or quota exhausted → lines stay pending).
+        """
+        now = time.monotonic() if now is None else now
+        state = self._state(chat_id)
+
+        if not state.pending or now < state.blocked_until:
+            return None
+
+        # проверяем оба лимита до списания, чтобы не сжечь токен чата впустую
+        if state.bucket.delay() > 0 or self.global_bucket.delay() > 0:
+            self.stats["deferred"] += 1
+            return None
+        state.bucket.try_acquire()
+        self.global_bucket.try_acquire()
+
+        new_lines = list(state.pending)
+        state.pending.clear()
+        skipped, state.skipped = state.skipped, 0
+
+        # live-сообщение свежее и вмещает новые строки → редактируем его
+        live = state.live
+        if live is not None and now - live.opened_at < self.live_ttl:
+            lines = list(live.lines) + new_lines
+            total = live.skipped + skipped
+            if len(lines) <= self.max_lines:
+                text = render(lines, skipped=total)
+                if len(text) < MESSAGE_LIMIT:
+                    return DigestAction(chat_id, EDIT, text, live.message_id, lines, new_lines, total)
+
+        lines = new_lines[-self.max_lines:]
+        skipped += len(new_lines) - len(lines)
+        return DigestAction(chat_id, SEND, render(lines, skipped=skipped), None, lines, new_lines, skipped)
+
+    # -------------------------------------------------
+    # Feedback from the bridge
+    # -------------------------------------------------
+    def confirm(self, action: DigestAction, message_id: Optional[int] = None, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        state = self._state(action.chat_id)
+
+        if action.kind == SEND:
+            if message_id is None:
+                raise ValueError("confirm(SEND) needs the message_id of the sent message")
+            state.live = _LiveMessage(
+                message_id, now, deque(action.lines, maxlen=self.max_lines), action.skipped
+            )
+            self.stats["sent"] += 1
+        else:
+            state.live.lines.extend(action.new_lines)
+            state.live.skipped = action.skipped
+            self.stats["edited"] += 1
+
+    def retry(
+        self,
+        action: DigestAction,
+        delay: float = 0.0,
+        *,
+        lost_live: bool = False,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Delivery failed: lines go back to the front of the queue.
+        lost_live → the live message is gone, the next digest is a new one.
+        """
+        now = time.monotonic() if now is None else now
+        state = self._state(action.chat_id)
+
+        state.pending.extendleft(reversed(action.new_lines))
+        state.blocked_until = max(state.blocked_until, now + delay)
+        if lost_live:
+            state.live = None
+        self.stats["retries"] += 1
+
+    def drop(self, action: DigestAction) -> None:
+        """
+        Delivery rejected for good (e.g. BadRequest on send): the lines
+        are not retried, they are counted as skipped.
+        """
+        self.stats["skipped"] += len(action.new_lines)
+
+    def forget(self, chat_id: int) -> None:
+        self._chats.pop(chat_id, None)
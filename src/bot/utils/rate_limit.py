@@ -0,0 +1,68 @@
+# src/bot/utils/rate_limit.py
+"""
+File: src/bot/utils/rate_limit.py
+
+Purpose:
+Token bucket rate limiter (LLM providers, Telegram send quotas).
+
+Responsibilities:
+- Allow bursts up to `capacity`, refill at `rate` tokens per second
+- Non-blocking try_acquire() for load shedding
+- Time until the next token (for callers that prefer to wait)
+
+IMPORTANT:
+- Thread-safe; never sleeps while holding the lock
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "_tokens", "_updated", "_lock")
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = float(rate)
+        self.capacity = int(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # caller holds self._lock
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """
+        Seconds until `tokens` are available (0.0 if available now).
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = tokens - self._tokens
+            if missing <= 0:
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return missing / self.rate
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tokens = float(self.capacity)
+            self._updated = time.monotonic()
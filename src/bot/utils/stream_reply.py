@@ -0,0 +1,87 @@
+# src/bot/utils/stream_reply.py
+"""
+File: src/bot/utils/stream_reply.py
+
+Purpose:
+Progressive Telegram reply for streamed LLM output.
+
+Responsibilities:
+- Send a placeholder at once, then edit it as chunks arrive
+- Throttle edits (per-message interval + minimal text delta)
+- Respect Telegram limits: RetryAfter, 4096-char messages
+- Finish with one final edit carrying the full text
+
+IMPORTANT:
+- Edits are sent as plain text: a half-generated answer is not valid Markdown
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterator
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import Message
+
+log = logging.getLogger("mindforge.ui.stream")
+
+EDIT_INTERVAL = 1.0    # seconds between edits of one message
+MIN_DELTA = 24         # skip edits that add fewer characters
+MESSAGE_LIMIT = 4096   # Telegram text limit
+
+
+async def _edit(sent: Message, text: str) -> None:
+    for _ in range(2):
+        try:
+            await sent.edit_text(text, parse_mode=None)
+            return
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+        except TelegramBadRequest as e:
+            if "not modified" not in str(e):
+                log.warning("STREAM_EDIT_FAILED | %s", e)
+            return
+
+
+async def stream_reply(
+    message: Message,
+    chunks: AsyncIterator[str],
+    *,
+    placeholder: str = "⏳ Думаю…",
+    interval: float = EDIT_INTERVAL,
+    min_delta: int = MIN_DELTA,
+) -> str:
+    """
+    Reply to `message` with text streamed from `chunks`.
+    Returns the full text.
+    """
+    sent = await message.answer(placeholder, parse_mode=None)
+
+    parts = []
+    text = ""     # текст текущего сообщения
+    shown = ""    # что уже видно пользователю
+    last_edit = time.monotonic()
+
+    async for chunk in chunks:
+        parts.append(chunk)
+        text += chunk
+
+        # переполнение — фиксируем сообщение и продолжаем в новом
+        while len(text) > MESSAGE_LIMIT:
+            head, text = text[:MESSAGE_LIMIT], text[MESSAGE_LIMIT:]
+            await _edit(sent, head)
+            sent = await message.answer("…", parse_mode=None)
+            shown = ""
+            last_edit = time.monotonic()
+
+        now = time.monotonic()
+        if now - last_edit >= interval and len(text) - len(shown) >= min_delta:
+            await _edit(sent, text)
+            shown = text
+            last_edit = now
+
+    final = text.strip() or "…"
+    if final != shown:
+        await _edit(sent, final)
+
+    return "".join(parts).strip()
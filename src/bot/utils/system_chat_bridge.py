@@ -0,0 +1,214 @@
+# src/bot/utils/system_chat_bridge.py
+"""
+File: src/bot/utils/system_chat_bridge.py
+
+Purpose:
+Forward SystemChat (agent fleet activity) to Telegram chats as digests.
+
+Responsibilities:
+- Async-iterator subscription to SYSTEM_CHAT (bounded queue, never
+  slows agents down)
+- Collect bursts within a window (SYSTEM_CHAT_DIGEST_WINDOW) into one digest
+- Edit a single "live" message per chat instead of sending new ones
+- Global and per-chat send quotas (TokenBucket), RetryAfter handling
+  (planning lives in chat_digest.DigestPlanner)
+
+IMPORTANT:
+- Messages are sent as plain text: agent messages may contain Markdown
+  fragments (`...`) that are not balanced after coalescing
+- stop() flushes what the quotas allow; the rest is dropped with a log line
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from src.bot.utils.chat_digest import EDIT, DigestAction, DigestPlanner
+from src.bot.utils.rate_limit import TokenBucket
+from src.core.system_chat import POLICY_DROP_OLDEST, SYSTEM_CHAT, SystemChat
+
+log = logging.getLogger("mindforge.ui.system_chat_bridge")
+
+DIGEST_WINDOW = 2.0       # seconds a burst is collected
+GLOBAL_RATE = 25.0        # messages / s over all chats (Telegram: ~30)
+GLOBAL_BURST = 25
+CHAT_RATE = 1.0           # messages / s per chat (Telegram: ~1, groups: 20 / min)
+CHAT_BURST = 3
+QUEUE_SIZE = 1000         # SystemChat subscription queue
+
+
+def parse_chat_ids(raw: str) -> List[int]:
+    return [int(part) for part in raw.replace(";", ",").split(",") if part.strip()]
+
+
+class SystemChatBridge:
+    def __init__(
+        self,
+        bot: Bot,
+        chat_ids: Iterable[int],
+        *,
+        chat: SystemChat = SYSTEM_CHAT,
+        window: float = DIGEST_WINDOW,
+        level: str = "INFO",
+        roles: Optional[Iterable[str]] = None,
+        global_rate: float = GLOBAL_RATE,
+        chat_rate: float = CHAT_RATE,
+        planner: Optional[DigestPlanner] = None,
+    ) -> None:
+        self.bot = bot
+        self.chat_ids = list(dict.fromkeys(chat_ids))
+        self.chat = chat
+        self.window = window
+        self.level = level
+        self.roles = roles
+
+        self.planner = planner or DigestPlanner(
+            global_bucket=TokenBucket(global_rate, GLOBAL_BURST),
+            chat_rate=chat_rate,
+            chat_burst=CHAT_BURST,
+        )
+
+        self._subscription = None
+        self._task: Optional[asyncio.Task] = None
+
+    # -------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self._subscription = self.chat.subscribe_async(
+            name="telegram-bridge",
+            level=self.level,
+            roles=self.roles,
+            maxsize=QUEUE_SIZE,
+            policy=POLICY_DROP_OLDEST,
+        )
+        self._task = asyncio.create_task(self._run(), name="system-chat-bridge")
+        log.info("SYSTEM_CHAT_BRIDGE | started | chats=%s", self.chat_ids)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._subscription.close()       # итератор завершится после дренажа
+        await self._task
+        self._task = None
+
+        await self._flush()
+        if self.planner.has_pending():
+            log.warning("SYSTEM_CHAT_BRIDGE | stopped with undelivered digests | %s", self.stats())
+
+    def add_chat(self, chat_id: int) -> None:
+        if chat_id not in self.chat_ids:
+            self.chat_ids.append(chat_id)
+
+    def remove_chat(self, chat_id: int) -> None:
+        if chat_id in self.chat_ids:
+            self.chat_ids.remove(chat_id)
+        self.planner.forget(chat_id)
+
+    def stats(self) -> Dict[str, object]:
+        data: Dict[str, object] = dict(self.planner.stats)
+        if self._subscription is not None:
+            data["subscription"] = self._subscription.stats()
+        return data
+
+    # -------------------------------------------------
+    # Loop: collect a burst → plan → send / edit
+    # -------------------------------------------------
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            if batch is None:
+                return
+
+            if batch:
+                for chat_id in self.chat_ids:
+                    self.planner.add(chat_id, batch)
+
+            try:
+                await self._flush()
+            except Exception:
+                log.exception("SYSTEM_CHAT_BRIDGE | flush failed")
+
+    async def _collect(self) -> Optional[List[Dict]]:
+        """
+        Wait for the first event, then gather everything within `window`.
+        With digests pending (quota), wake up after `window` anyway.
+        None once the subscription is closed and drained.
+        """
+        sub = self._subscription
+        first_timeout = self.window if self.planner.has_pending() else None
+
+        try:
+            first = await asyncio.wait_for(sub.__anext__(), first_timeout)
+        except asyncio.TimeoutError:
+            return []
+        except StopAsyncIteration:
+            return None
+
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(sub.__anext__(), remaining))
+            except asyncio.TimeoutError:
+                break
+            except StopAsyncIteration:
+                break
+
+        return batch
+
+    async def _flush(self) -> None:
+        for chat_id in self.planner.pending_chats():
+            action = self.planner.next_action(chat_id)
+            if action is not None:
+                await self._deliver(action)
+
+    async def _deliver(self, action: DigestAction) -> None:
+        try:
+            if action.kind == EDIT:
+                await self.bot.edit_message_text(
+                    action.text,
+                    chat_id=action.chat_id,
+                    message_id=action.message_id,
+                    parse_mode=None,
+                )
+                self.planner.confirm(action)
+            else:
+                sent = await self.bot.send_message(action.chat_id, action.text, parse_mode=None)
+                self.planner.confirm(action, sent.message_id)
+
+        except TelegramRetryAfter as e:
+            log.warning("SYSTEM_CHAT_BRIDGE | RetryAfter %ss | chat=%s", e.retry_after, action.chat_id)
+            self.planner.retry(action, e.retry_after)
+
+        except TelegramBadRequest as e:
+            if action.kind == EDIT:
+                if "not modified" in str(e):
+                    self.planner.confirm(action)
+                else:
+                    # live-сообщение удалено / слишком старое → следующий digest новым сообщением
+                    self.planner.retry(action, lost_live=True)
+            else:
+                # Telegram отверг само сообщение: повтор не поможет, строки считаем пропущенными
+                log.warning(
+                    "SYSTEM_CHAT_BRIDGE | send rejected | chat=%s | %s lines dropped | %s",
+                    action.chat_id, len(action.new_lines), e,
+                )
+                self.planner.drop(action)
+
+        except Exception as e:
+            # сеть / таймаут: строки вернутся в следующий digest
+            log.warning("SYSTEM_CHAT_BRIDGE | delivery failed | chat=%s | %s", action.chat_id, e)
+            self.planner.retry(action, self.window)
@@ -0,0 +1,267 @@
+# src/core/audit/batch.py
+"""
+File: src/core/audit/batch.py
+
+Purpose:
+Bounded queue drained in batches by one background worker thread.
+
+Responsibilities:
+- O(1) enqueue for producers (bot event loop, middlewares)
+- Batches of N items or M milliseconds, flush() barriers
+- Configurable backpressure policy when the queue is full
+- Durable close(): drain everything that was accepted
+
+IMPORTANT:
+- Shared by AuditWriter (SQLite group commit) and the queued audit bus
+  sinks; no import side effects (no DB, no threads until first enqueue)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+log = logging.getLogger("mindforge.audit.batch")
+
+
+# Backpressure policies (queue full)
+OVERFLOW_BLOCK = "block"              # caller waits for free space
+OVERFLOW_DROP_NEWEST = "drop_newest"  # incoming event is dropped
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # oldest queued event is dropped
+OVERFLOW_SYNC = "sync"                # caller writes the event inline
+
+OVERFLOW_POLICIES = {
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_SYNC,
+}
+
+BATCH_SIZE = 256
+FLUSH_INTERVAL_MS = 50
+MAX_QUEUE = 10_000
+BLOCK_TIMEOUT = 1.0  # seconds, then fall back to inline write
+
+
+class BatchQueue:
+    """
+    Bounded queue + one worker thread that drains it in batches.
+
+    Subclasses implement write(batch). Used by AuditWriter (SQLite group
+    commit) and by the queued audit bus sinks (src/core/audit/bus.py).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        batch_size: int = BATCH_SIZE,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+        max_queue: int = MAX_QUEUE,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_queue = max_queue
+        self.overflow = overflow
+
+        self._queue: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # sequence numbers for flush() barriers
+        self._enqueued = 0
+        self._written = 0
+        self._flush_target = 0
+
+        self._stats: Dict[str, int] = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "dropped": 0,
+            "inline": 0,
+            "failed": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # To implement
+    # ------------------------------------------------------------------
+    def write(self, batch: List[Any]) -> None:
+        raise NotImplementedError
+
+    def _commit(self, batch: List[Any]) -> int:
+        """
+        Write a batch, return the number of failed items.
+        """
+        try:
+            self.write(batch)
+            return 0
+        except Exception:
+            log.exception("%s | batch of %s failed", self.name.upper(), len(batch))
+            return len(batch)
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+    def enqueue(self, item: Any) -> bool:
+        """
+        Enqueue an item. Returns False if it was dropped.
+        """
+        if self._closed:
+            # after shutdown: never lose an item, write inline
+            self._write_inline(item)
+            return True
+
+        self._ensure_started()
+
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                if self.overflow == OVERFLOW_DROP_NEWEST:
+                    self._stats["dropped"] += 1
+                    return False
+
+                if self.overflow == OVERFLOW_DROP_OLDEST:
+                    self._queue.popleft()
+                    self._written += 1  # keep flush() barriers consistent
+                    self._stats["dropped"] += 1
+
+                elif self.overflow == OVERFLOW_BLOCK:
+                    self._flush_target = self._enqueued
+                    self._cond.notify_all()
+                    self._cond.wait_for(
+                        lambda: len(self._queue) < self.max_queue or self._closed,
+                        timeout=BLOCK_TIMEOUT,
+                    )
+
+            # OVERFLOW_SYNC, or BLOCK timed out → write inline below
+            if len(self._queue) < self.max_queue:
+                self._queue.append(item)
+                self._enqueued += 1
+                self._stats["enqueued"] += 1
+
+                if len(self._queue) >= self.batch_size:
+                    self._cond.notify_all()
+                return True
+
+        self._write_inline(item)
+        return True
+
+    # ------------------------------------------------------------------
+    # Flush / lifecycle
+    # ------------------------------------------------------------------
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Block until every item enqueued before this call is written.
+        """
+        with self._cond:
+            target = self._enqueued
+            if self._written >= target:
+                return True
+
+            if self._thread is None or not self._thread.is_alive():
+                # no worker (e.g. after close) → drain inline
+                batch = list(self._queue)
+                self._queue.clear()
+            else:
+                batch = None
+                self._flush_target = max(self._flush_target, target)
+                self._cond.notify_all()
+                return self._cond.wait_for(
+                    lambda: self._written >= target, timeout=timeout
+                )
+
+        self._write_batch(batch)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Durable shutdown: stop accepting, drain queue, join worker.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+        # anything left (worker never started / join timed out)
+        with self._cond:
+            batch = list(self._queue)
+            self._queue.clear()
+        self._write_batch(batch)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            data = dict(self._stats)
+            data["queued"] = len(self._queue)
+        return data
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name=self.name,
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # wait for the first item of a batch
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+
+                if self._closed and not self._queue:
+                    return
+
+                # collect until: batch full | interval elapsed | flush() | close()
+                deadline = time.monotonic() + self.flush_interval
+                while (
+                    len(self._queue) < self.batch_size
+                    and not self._closed
+                    and self._flush_target <= self._written
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                n = min(len(self._queue), self.batch_size)
+                batch = [self._queue.popleft() for _ in range(n)]
+
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Any]) -> None:
+        if not batch:
+            return
+
+        failed = self._commit(batch)
+
+        with self._cond:
+            self._written += len(batch)
+            self._stats["written"] += len(batch) - failed
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._cond.notify_all()
+
+    def _write_inline(self, item: Any) -> None:
+        self.write([item])
+        with self._cond:
+            self._stats["inline"] += 1
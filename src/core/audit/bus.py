@@ -0,0 +1,408 @@
+# src/core/audit/bus.py
+"""
+File: src/core/audit/bus.py
+
+Purpose:
+Unified audit event bus: one canonical event, many sinks.
+
+Responsibilities:
+- AuditEvent: the single canonical audit record (agent decisions, UAG
+  access decisions, gateway events); its JSON / text forms are built
+  at most once and shared by every sink
+- Pluggable sinks: SQLite ledger (AuditWriter), JSONL file
+  (DecisionLogWriter), in-memory ring, stdout (logger)
+- Per-sink bounded queue + worker (BatchQueue from core/audit/batch.py),
+  so a slow sink never delays the producer or the other sinks
+- Per-sink routing (kinds + EventSink level / sampling) and delivery metrics
+
+IMPORTANT:
+- publish() never touches disk: O(number of sinks) enqueue
+- Unqueued sinks: the ring (O(1)) and the ledger (AuditWriter is the queue)
+- A full sink queue drops its OLDEST event (counted in queue.dropped)
+- close() drains every queue (registered with atexit by the owners)
+"""
+
+import json
+import logging
+import sys
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import IO, Any, Dict, FrozenSet, Iterable, List, Optional
+
+from src.core.audit.batch import (
+    BATCH_SIZE,
+    FLUSH_INTERVAL_MS,
+    MAX_QUEUE,
+    OVERFLOW_DROP_OLDEST,
+    BatchQueue,
+)
+from src.core.events import INFO, WARN, EventSink
+
+log = logging.getLogger("mindforge.audit.bus")
+
+# kind → prefix of the text form (log line)
+TEXT_PREFIX = {"agent": "AUDIT", "uag": "UAG", "gateway": "UAG_GATEWAY"}
+
+
+# =====================================================
+# Canonical event
+# =====================================================
+class AuditEvent:
+    __slots__ = (
+        "ts",
+        "kind",
+        "agent_id",
+        "agent_role",
+        "action",
+        "decision",
+        "policy",
+        "reason",
+        "extra",
+        "level",
+        "_dict",
+        "_json",
+        "_text",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        *,
+        agent_id: Optional[str],
+        action: Optional[str],
+        decision: Optional[str],
+        agent_role: Optional[str] = None,
+        policy: Optional[str] = None,
+        reason: Optional[str] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        self.ts = time.time() if ts is None else ts
+        self.kind = kind
+        self.agent_id = agent_id
+        self.agent_role = agent_role
+        self.action = action
+        self.decision = decision
+        self.policy = policy
+        self.reason = reason
+        self.extra = extra or {}
+        self.level = WARN if decision in ("DENY", "WARN") else INFO
+
+        self._dict: Optional[Dict[str, Any]] = None
+        self._json: Optional[str] = None
+        self._text: Optional[str] = None
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.utcfromtimestamp(self.ts).isoformat()
+
+    # --- serialized forms: built lazily, once, shared by sinks ---
+    def to_dict(self) -> Dict[str, Any]:
+        if self._dict is None:
+            d = dict(self.extra)
+            d.update(
+                kind=self.kind,
+                agent_id=self.agent_id,
+                agent_role=self.agent_role,
+                action=self.action,
+                decision=self.decision,
+                policy=self.policy,
+                reason=self.reason,
+                timestamp=self.timestamp,
+            )
+            self._dict = d
+        return self._dict
+
+    def to_json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps(self.to_dict(), ensure_ascii=False)
+        return self._json
+
+    def to_text(self) -> str:
+        if self._text is None:
+            self._text = (
+                f"{TEXT_PREFIX.get(self.kind, self.kind.upper())} "
+                f"agent_id={self.agent_id} "
+                f"agent_role={self.agent_role} "
+                f"decision={self.decision} "
+                f"action={self.action} "
+                f"policy={self.policy} "
+                f"reason={self.reason} "
+                f"timestamp={datetime.utcfromtimestamp(self.ts).isoformat(timespec='seconds')}"
+            )
+        return self._text
+
+
+# =====================================================
+# Sink base: routing (EventSink) + queue (BatchQueue) + metrics
+# =====================================================
+class _SinkQueue(BatchQueue):
+    def __init__(self, sink: "AuditSink", **kwargs) -> None:
+        super().__init__(f"audit-sink-{sink.name}", **kwargs)
+        self.sink = sink
+
+    def write(self, batch: List["AuditEvent"]) -> None:
+        self.sink.write(batch)
+
+
+class AuditSink(EventSink, ABC):
+    """
+    Routing on top of EventSink (level, sampling) plus a `kinds` filter.
+
+    queued=True (default): events go to a bounded BatchQueue with its own
+    worker, so a slow sink never delays publish() or the other sinks.
+    queued=False only for O(1) sinks or backends that queue themselves.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        kinds: Optional[Iterable[str]] = None,
+        level: int | str = INFO,
+        sample_rate: float = 1.0,
+        queued: bool = True,
+        batch_size: int = BATCH_SIZE,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+        max_queue: int = MAX_QUEUE,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+    ) -> None:
+        super().__init__(name, self.offer, level=level, sample_rate=sample_rate, render="event")
+        self.kinds: Optional[FrozenSet[str]] = frozenset(kinds) if kinds is not None else None
+        self.filtered = 0
+
+        self._queue: Optional[BatchQueue] = None
+        if queued:
+            self._queue = _SinkQueue(
+                self,
+                batch_size=batch_size,
+                flush_interval_ms=flush_interval_ms,
+                max_queue=max_queue,
+                overflow=overflow,
+            )
+
+    # -------------------------------------------------
+    # To implement
+    # -------------------------------------------------
+    @abstractmethod
+    def write(self, batch: List[AuditEvent]) -> None:
+        ...
+
+    # -------------------------------------------------
+    # Routing
+    # -------------------------------------------------
+    def accepts(self, event: AuditEvent) -> bool:
+        if event.level < self.level or (self.kinds is not None and event.kind not in self.kinds):
+            self.filtered += 1
+            return False
+        return self.sample()
+
+    def offer(self, event: AuditEvent) -> None:
+        if self._queue is not None:
+            self._queue.enqueue(event)
+            self.delivered += 1
+            return
+
+        try:
+            self.write([event])
+            self.delivered += 1
+        except Exception:
+            # ошибки sink'а не доходят до publish()
+            self.errors += 1
+            log.exception("AUDIT_SINK_FAILED | %s", self.name)
+
+    # -------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        return self._queue is None or self._queue.flush(timeout)
+
+    def close(self) -> None:
+        if self._queue is not None:
+            self._queue.close()
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data["filtered"] = self.filtered
+        if self._queue is not None:
+            data["queue"] = self._queue.stats()
+        return data
+
+
+# =====================================================
+# Sinks
+# =====================================================
+class RingSink(AuditSink):
+    """
+    In-memory AuditRing (core/audit_log.get_events): O(1) append.
+    """
+
+    def __init__(self, ring, **kwargs) -> None:
+        kwargs.setdefault("level", 0)
+        kwargs.setdefault("queued", False)
+        super().__init__("ring", **kwargs)
+        self.ring = ring
+
+    def write(self, batch: List[AuditEvent]) -> None:
+        for e in batch:
+            self.ring.append(
+                ts=e.ts,
+                agent_id=e.agent_id,
+                agent_role=e.agent_role,
+                action=e.action,
+                decision=e.decision,
+                policy=e.policy,
+                reason=e.reason,
+            )
+
+
+class LedgerSink(AuditSink):
+    """
+    SQLite audit ledger through AuditWriter (group commit, its own queue).
+    """
+
+    def __init__(self, writer, **kwargs) -> None:
+        kwargs.setdefault("level", 0)
+        kwargs.setdefault("queued", False)
+        super().__init__("ledger", **kwargs)
+        self.writer = writer
+
+    @staticmethod
+    def row(e: AuditEvent) -> tuple:
+        # порядок колонок SQL_INSERT_EVENT (AuditDB.make_event_row);
+        # payload — та же JSON-строка, что уходит в JSONL
+        return (
+            e.timestamp,
+            e.extra.get("user_id"),
+            e.extra.get("username"),
+            e.extra.get("session_id"),
+            e.kind.upper(),
+            e.action or "",
+            e.extra.get("state"),
+            e.decision,
+            e.policy,
+            e.agent_id,
+            e.to_json(),
+        )
+
+    def write(self, batch: List[AuditEvent]) -> None:
+        for e in batch:
+            self.writer.enqueue(self.row(e))
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        return self.writer.flush(timeout)
+
+    def close(self) -> None:
+        # writer общий (audit_writer): закрывает его владелец
+        super().close()
+        self.writer.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data["writer"] = self.writer.stats()
+        return data
+
+
+class JSONLSink(AuditSink):
+    """
+    Rotating JSONL file (DecisionLogWriter): lines are pre-serialized;
+    flush / rotation / gzip run in the sink worker, not in publish().
+    """
+
+    def __init__(self, writer, **kwargs) -> None:
+        kwargs.setdefault("level", 0)
+        super().__init__("jsonl", **kwargs)
+        self.writer = writer
+
+    def write(self, batch: List[AuditEvent]) -> None:
+        self.writer.write_lines([e.to_json() for e in batch])
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        done = super().flush(timeout)
+        self.writer.flush()
+        return done
+
+    def close(self) -> None:
+        super().close()
+        self.writer.flush()
+
+
+class StdoutSink(AuditSink):
+    """
+    Human-readable lines: to a logger (default) or a raw stream.
+    DENY events are logged at WARNING, the rest at INFO.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        *,
+        stream: Optional[IO[str]] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__("stdout", **kwargs)
+        self.logger = logger
+        self.stream = stream
+
+    def write(self, batch: List[AuditEvent]) -> None:
+        if self.logger is not None:
+            for e in batch:
+                # уровни events совпадают с logging (INFO=20, WARN=30);
+                # текст строим, только если logger его пропустит
+                if self.logger.isEnabledFor(e.level):
+                    self.logger.log(e.level, e.to_text())
+            return
+
+        stream = self.stream or sys.stdout
+        stream.write("".join(e.to_text() + "\n" for e in batch))
+        stream.flush()
+
+
+# =====================================================
+# Bus
+# =====================================================
+class AuditBus:
+    def __init__(self) -> None:
+        self._sinks: tuple = ()
+
+    def add_sink(self, sink: AuditSink) -> AuditSink:
+        if any(s.name == sink.name for s in self._sinks):
+            raise ValueError(f"Audit sink already registered: {sink.name}")
+        # copy-on-write: publish итерирует снимок без блокировок
+        self._sinks = self._sinks + (sink,)
+        return sink
+
+    def remove_sink(self, name: str) -> Optional[AuditSink]:
+        sink = self.sink(name)
+        if sink is not None:
+            self._sinks = tuple(s for s in self._sinks if s is not sink)
+        return sink
+
+    def sink(self, name: str) -> Optional[AuditSink]:
+        return next((s for s in self._sinks if s.name == name), None)
+
+    @property
+    def sinks(self) -> List[AuditSink]:
+        return list(self._sinks)
+
+    def publish(self, event: AuditEvent) -> AuditEvent:
+        for sink in self._sinks:
+            if sink.accepts(event):
+                sink.offer(event)
+        return event
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        return all([s.flush(timeout) for s in self._sinks])
+
+    def close(self) -> None:
+        for s in self._sinks:
+            s.close()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {s.name: s.stats() for s in self._sinks}
+
+
+# Global bus (sinks are registered by their owners:
+# core/audit_log → ring + stdout, uag/core/audit → jsonl + ledger)
+audit_bus = AuditBus()
@@ -1,45 +1,118 @@
-import sqlite3
 import json
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from pathlib import Path
 from contextlib import contextmanager
 from datetime import datetime
 
+from src.core.audit.migrations import apply_migrations
+from src.core.sqlite_pool import SQLiteConnectionPool
+
 DB_PATH = "data/audit.db"
-SCHEMA_PATH = "src/core/audit/schema.sql"
+READER_POOL_SIZE = 4
+
+
+# =====================================================
+# SQL (static text → reused from sqlite3 statement cache)
+# =====================================================
+SQL_INSERT_SESSION = """
+    INSERT INTO sessions
+    (session_id, user_id, username, started_at, last_state, trust_level, mode)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_UPDATE_STATE = "UPDATE sessions SET last_state=? WHERE session_id=?"
+
+SQL_INSERT_EVENT = """
+    INSERT INTO audit_events
+    (
+        ts, user_id, username, session_id,
+        event_type, action, state,
+        decision, policy, source,
+        payload
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_LAST_SESSION_FOR_USER = """
+    SELECT *
+    FROM sessions
+    WHERE user_id = ?
+    ORDER BY started_at DESC
+    LIMIT 1
+"""
+
+SQL_EVENTS_TAIL = """
+    SELECT ts, event_type, action, state, decision, policy, source, payload
+    FROM audit_events
+    WHERE session_id = ?
+    ORDER BY ts DESC
+    LIMIT ?
+"""
+
+SQL_SESSIONS = """
+    SELECT *
+    FROM sessions
+    ORDER BY started_at DESC
+    LIMIT ?
+"""
+
+SQL_SESSION_TIMELINE = """
+    SELECT
+        ts,
+        event_type,
+        action,
+        state,
+        decision,
+        policy,
+        source,
+        payload
+    FROM audit_events
+    WHERE session_id = ?
+    ORDER BY ts ASC
+"""
 
 
 class AuditDB:
     """
     L1 Audit Ledger (append-only)
     Единая точка записи и чтения аудита
+
+    Соединения долгоживущие (SQLiteConnectionPool):
+    один writer + пул reader-ов, pragmas применяются один раз.
     """
 
-    def __init__(self, db_path: str = DB_PATH):
+    def __init__(self, db_path: str = DB_PATH, readers: int = READER_POOL_SIZE):
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if db_path != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._pool = SQLiteConnectionPool(db_path, readers=readers)
         self._init_db()
 
     def _init_db(self):
-        with self._conn() as conn:
-            with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
-                conn.executescript(f.read())
+        # версионные миграции (PRAGMA user_version)
+        with self._pool.writer() as conn:
+            apply_migrations(conn)
 
     @contextmanager
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-
-        # Ledger guarantees
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA foreign_keys=ON;")
+        """
+        Write connection (commit on success, rollback on error).
+        """
+        with self._pool.writer() as conn:
+            yield conn
 
-        try:
+    @contextmanager
+    def _read(self):
+        """
+        Read-only connection from the reader pool.
+        """
+        with self._pool.reader() as conn:
             yield conn
-            conn.commit()
-        finally:
-            conn.close()
+
+    def close(self):
+        self._pool.close()
 
     # =====================================================
     # SESSION
@@ -57,11 +130,7 @@ class AuditDB:
 
         with self._conn() as conn:
             conn.execute(
-                """
-                INSERT INTO sessions
-                (session_id, user_id, username, started_at, last_state, trust_level, mode)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+                SQL_INSERT_SESSION,
                 (
                     session_id,
                     user_id,
@@ -77,10 +146,7 @@ class AuditDB:
 
     def update_state(self, session_id: str, state: str):
         with self._conn() as conn:
-            conn.execute(
-                "UPDATE sessions SET last_state=? WHERE session_id=?",
-                (state, session_id),
-            )
+            conn.execute(SQL_UPDATE_STATE, (state, session_id))
 
     # =====================================================
     # AUDIT EVENT (WRITE PATH)
@@ -99,65 +165,79 @@ class AuditDB:
         source: Optional[str] = None,
         payload: Optional[Dict[str, Any]] = None,
     ):
-        now = datetime.utcnow().isoformat()
+        row = self.make_event_row(
+            session_id=session_id,
+            user_id=user_id,
+            username=username,
+            event_type=event_type,
+            action=action,
+            state=state,
+            decision=decision,
+            policy=policy,
+            source=source,
+            payload=payload,
+        )
 
         with self._conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO audit_events
-                (
-                    ts, user_id, username, session_id,
-                    event_type, action, state,
-                    decision, policy, source,
-                    payload
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    now,
-                    user_id,
-                    username,
-                    session_id,
-                    event_type,
-                    action,
-                    state,
-                    decision,
-                    policy,
-                    source,
-                    json.dumps(payload or {}, ensure_ascii=False),
-                ),
-            )
+            conn.execute(SQL_INSERT_EVENT, row)
+
+    def log_events_many(self, rows: Sequence[Tuple]) -> int:
+        """
+        Group commit: вставка пачки событий одной транзакцией.
+        rows — кортежи из make_event_row().
+        """
+        if not rows:
+            return 0
+
+        with self._conn() as conn:
+            conn.executemany(SQL_INSERT_EVENT, rows)
+
+        return len(rows)
+
+    @staticmethod
+    def make_event_row(
+        *,
+        session_id: str,
+        user_id: int,
+        username: str,
+        event_type: str,
+        action: str,
+        state: Optional[str] = None,
+        decision: Optional[str] = None,
+        policy: Optional[str] = None,
+        source: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        ts: Optional[str] = None,
+    ) -> Tuple:
+        """
+        Строка audit_events в порядке колонок SQL_INSERT_EVENT.
+        """
+        return (
+            ts or datetime.utcnow().isoformat(),
+            user_id,
+            username,
+            session_id,
+            event_type,
+            action,
+            state,
+            decision,
+            policy,
+            source,
+            json.dumps(payload or {}, ensure_ascii=False),
+        )
 
     # =====================================================
     # READ API
     # =====================================================
     def get_last_session_for_user(self, user_id: int) -> Optional[Dict[str, Any]]:
-        with self._conn() as conn:
-            row = conn.execute(
-                """
-                SELECT *
-                FROM sessions
-                WHERE user_id = ?
-                ORDER BY started_at DESC
-                LIMIT 1
-                """,
-                (user_id,),
-            ).fetchone()
+        with self._read() as conn:
+            row = conn.execute(SQL_LAST_SESSION_FOR_USER, (user_id,)).fetchone()
 
         return dict(row) if row else None
 
     def get_events(self, session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-        with self._conn() as conn:
-            rows = conn.execute(
-                """
-                SELECT ts, event_type, action, state, decision, policy, source, payload
-                FROM audit_events
-                WHERE session_id = ?
-                ORDER BY ts DESC
-                LIMIT ?
-                """,
-                (session_id, limit),
-            ).fetchall()
+        with self._read() as conn:
+            rows = conn.execute(SQL_EVENTS_TAIL, (session_id, limit)).fetchall()
 
         events: List[Dict[str, Any]] = []
         for r in rows:
@@ -171,16 +251,8 @@ class AuditDB:
         return events[::-1]
 
     def get_sessions(self, limit: int = 20) -> List[Dict[str, Any]]:
-        with self._conn() as conn:
-            rows = conn.execute(
-                """
-                SELECT *
-                FROM sessions
-                ORDER BY started_at DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
+        with self._read() as conn:
+            rows = conn.execute(SQL_SESSIONS, (limit,)).fetchall()
 
         return [dict(r) for r in rows]
 
@@ -188,24 +260,8 @@ class AuditDB:
     # SESSION REPLAY (READ ONLY)
     # =====================================================
     def get_session_timeline(self, session_id: str) -> List[Dict[str, Any]]:
-        with self._conn() as conn:
-            rows = conn.execute(
-                """
-                SELECT
-                    ts,
-                    event_type,
-                    action,
-                    state,
-                    decision,
-                    policy,
-                    source,
-                    payload
-                FROM audit_events
-                WHERE session_id = ?
-                ORDER BY ts ASC
-                """,
-                (session_id,),
-            ).fetchall()
+        with self._read() as conn:
+            rows = conn.execute(SQL_SESSION_TIMELINE, (session_id,)).fetchall()
 
         timeline: List[Dict[str, Any]] = []
         for r in rows:
@@ -0,0 +1,125 @@
+# src/core/audit/migrations.py
+"""
+File: src/core/audit/migrations.py
+
+Purpose:
+Versioned schema migrations for the Audit Ledger (data/audit.db).
+
+Responsibilities:
+- Track the schema version in PRAGMA user_version
+- Apply pending migrations in order, each one atomically
+- Keep indexes in sync with every query in AuditDB and audit_api.service
+
+IMPORTANT:
+- Migrations are append-only: never edit an applied one, add a new one
+- Query plans are guarded by tests/core/test_audit_query_plans.py
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+
+SCHEMA_PATH = Path(__file__).with_name("schema.sql")
+
+
+def _baseline() -> str:
+    return SCHEMA_PATH.read_text(encoding="utf-8")
+
+
+# (version, name, sql)
+Migration = Tuple[int, str, Callable[[], str]]
+
+MIGRATIONS: List[Migration] = [
+    (1, "baseline_ledger", _baseline),
+
+    # бывший src/core/audit/migrate.py (ad-hoc)
+    (2, "ui_events", lambda: """
+        CREATE TABLE IF NOT EXISTS ui_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            state TEXT,
+            source TEXT
+        );
+    """),
+
+    # композитные индексы под реальные запросы
+    (3, "composite_query_indexes", lambda: """
+        -- get_events / get_session_timeline: WHERE session_id=? ORDER BY ts
+        CREATE INDEX IF NOT EXISTS idx_audit_session_ts
+            ON audit_events(session_id, ts);
+
+        -- WHY: COUNT(*) ... GROUP BY decision (covering)
+        CREATE INDEX IF NOT EXISTS idx_audit_session_decision
+            ON audit_events(session_id, decision);
+
+        -- WHY: DISTINCT policy (covering)
+        CREATE INDEX IF NOT EXISTS idx_audit_session_policy
+            ON audit_events(session_id, policy);
+
+        -- get_last_session_for_user: WHERE user_id=? ORDER BY started_at DESC
+        CREATE INDEX IF NOT EXISTS idx_sessions_user_started
+            ON sessions(user_id, started_at);
+
+        -- get_sessions / list_sessions: ORDER BY started_at DESC LIMIT ?
+        CREATE INDEX IF NOT EXISTS idx_sessions_started
+            ON sessions(started_at);
+    """),
+]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(
+    conn: sqlite3.Connection,
+    migrations: Sequence[Migration] = MIGRATIONS,
+    label: str = "Audit",
+) -> List[int]:
+    """
+    Apply every migration newer than PRAGMA user_version.
+    Returns the list of applied versions.
+
+    Other SQLite stores pass their own migration list (one list per DB file).
+    """
+    applied: List[int] = []
+    version = current_version(conn)
+
+    for number, name, sql in migrations:
+        if number <= version:
+            continue
+
+        script = (
+            "BEGIN;\n"
+            f"{sql()}\n"
+            f"PRAGMA user_version = {number};\n"
+            "COMMIT;"
+        )
+
+        try:
+            conn.executescript(script)
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise RuntimeError(f"{label} migration {number:04d}_{name} failed")
+
+        applied.append(number)
+
+    return applied
+
+
+def migrate(db_path: str = "data/audit.db") -> List[int]:
+    """
+    CLI entry: python -m src.core.audit.migrate
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA foreign_keys=ON;")
+        return apply_migrations(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,220 @@
+# src/core/audit/ring.py
+"""
+File: src/core/audit/ring.py
+
+Purpose:
+Fixed-capacity in-memory store for agent audit events (core/audit_log).
+
+Responsibilities:
+- Preallocated ring buffer of __slots__ records, O(1) append
+- Secondary indexes by agent_id / decision / policy, kept consistent
+  on eviction (the evicted record is always the oldest in each index)
+- Indexed queries: "last N DENY for agent X" without scanning the ring
+
+IMPORTANT:
+- Memory is flat: capacity records + index entries ≤ capacity per field
+- Records are immutable once written; queries return dict copies
+- Timestamps are stored as floats, rendered to ISO only when read
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from src.core.events import iso
+
+DEFAULT_CAPACITY = 10_000
+
+INDEXED_FIELDS = ("agent_id", "decision", "policy")
+
+
+class AuditRecord:
+    __slots__ = (
+        "seq",
+        "ts",
+        "agent_id",
+        "agent_role",
+        "action",
+        "decision",
+        "policy",
+        "reason",
+    )
+
+    def __init__(
+        self,
+        seq: int,
+        ts: float,
+        agent_id: str,
+        agent_role: str,
+        action: str,
+        decision: str,
+        policy: Optional[str],
+        reason: Optional[str],
+    ) -> None:
+        self.seq = seq
+        self.ts = ts
+        self.agent_id = agent_id
+        self.agent_role = agent_role
+        self.action = action
+        self.decision = decision
+        self.policy = policy
+        self.reason = reason
+
+    @property
+    def timestamp_utc(self) -> str:
+        # строка времени строится только при чтении
+        return iso(self.ts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # формат событий audit_log.get_events (без seq)
+        return {
+            "timestamp_utc": self.timestamp_utc,
+            "agent_id": self.agent_id,
+            "agent_role": self.agent_role,
+            "action": self.action,
+            "decision": self.decision,
+            "policy": self.policy,
+            "reason": self.reason,
+        }
+
+
+class AuditRing:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+
+        self.capacity = capacity
+        self._slots: List[Optional[AuditRecord]] = [None] * capacity
+        self._next_seq = 0          # seq следующей записи; slot = seq % capacity
+
+        # field → value → seqs (по возрастанию, oldest слева)
+        self._indexes: Dict[str, Dict[Any, Deque[int]]] = {f: {} for f in INDEXED_FIELDS}
+        self._lock = threading.Lock()
+
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
+
+    @property
+    def _oldest_seq(self) -> int:
+        return max(0, self._next_seq - self.capacity)
+
+    # -------------------------------------------------
+    # Write
+    # -------------------------------------------------
+    def append(
+        self,
+        *,
+        ts: float,
+        agent_id: str,
+        agent_role: str,
+        action: str,
+        decision: str,
+        policy: Optional[str] = None,
+        reason: Optional[str] = None,
+    ) -> AuditRecord:
+        with self._lock:
+            seq = self._next_seq
+            slot = seq % self.capacity
+
+            evicted = self._slots[slot]
+            if evicted is not None:
+                self._unindex(evicted)
+                self.evictions += 1
+
+            record = AuditRecord(seq, ts, agent_id, agent_role, action, decision, policy, reason)
+            self._slots[slot] = record
+            self._next_seq = seq + 1
+
+            for field, index in self._indexes.items():
+                value = getattr(record, field)
+                seqs = index.get(value)
+                if seqs is None:
+                    seqs = index[value] = deque()
+                seqs.append(seq)
+
+            return record
+
+    def _unindex(self, record: AuditRecord) -> None:
+        for field, index in self._indexes.items():
+            value = getattr(record, field)
+            seqs = index[value]
+            seqs.popleft()          # самая старая запись ring — самая старая и в индексе
+            if not seqs:
+                del index[value]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots = [None] * self.capacity
+            self._next_seq = 0
+            for index in self._indexes.values():
+                index.clear()
+
+    # -------------------------------------------------
+    # Read
+    # -------------------------------------------------
+    def _iter_latest(self) -> Iterator[AuditRecord]:
+        for seq in range(self._next_seq - 1, self._oldest_seq - 1, -1):
+            yield self._slots[seq % self.capacity]
+
+    def latest(
+        self,
+        limit: int = 10,
+        *,
+        agent_id: Optional[str] = None,
+        decision: Optional[str] = None,
+        policy: Optional[str] = None,
+    ) -> List[AuditRecord]:
+        """
+        Most recent records first, optionally filtered by indexed fields.
+        Walks only the smallest matching index, newest to oldest.
+        """
+        if limit <= 0:
+            return []
+
+        filters = {
+            f: v for f, v in (("agent_id", agent_id), ("decision", decision), ("policy", policy))
+            if v is not None
+        }
+
+        with self._lock:
+            if not filters:
+                out = []
+                for record in self._iter_latest():
+                    out.append(record)
+                    if len(out) == limit:
+                        break
+                return out
+
+            candidates = []
+            for field, value in filters.items():
+                seqs = self._indexes[field].get(value)
+                if not seqs:
+                    return []
+                candidates.append((len(seqs), field, seqs))
+
+            _, driver, seqs = min(candidates)
+            rest = [(f, v) for f, v in filters.items() if f != driver]
+
+            out = []
+            for seq in reversed(seqs):
+                record = self._slots[seq % self.capacity]
+                if all(getattr(record, f) == v for f, v in rest):
+                    out.append(record)
+                    if len(out) == limit:
+                        break
+            return out
+
+    def count(self, field: str, value: Any) -> int:
+        with self._lock:
+            seqs = self._indexes[field].get(value)
+            return len(seqs) if seqs else 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self),
+            "capacity": self.capacity,
+            "appended": self._next_seq,
+            "evictions": self.evictions,
+        }
@@ -1,10 +1,9 @@
 -- =========================================================
 -- MindForge Audit Ledger (L1)
+-- Baseline schema = migration 0001 (src/core/audit/migrations.py)
+-- PRAGMA (WAL, foreign_keys, ...) задаются пулом соединений
 -- =========================================================
 
-PRAGMA journal_mode=WAL;
-PRAGMA foreign_keys=ON;
-
 -- ---------------------------------------------------------
 -- СЕССИИ
 -- ---------------------------------------------------------
@@ -0,0 +1,115 @@
+# src/core/audit/writer.py
+"""
+File: src/core/audit/writer.py
+
+Purpose:
+Asynchronous batched writer (group commit) in front of AuditDB.
+
+Responsibilities:
+- Accept audit events without touching the disk (O(1) enqueue)
+- Flush events in ONE transaction per N events or M milliseconds (executemany)
+- Apply a configurable backpressure policy when the queue is full
+- Flush everything durably on shutdown (close / atexit)
+
+IMPORTANT:
+- Default overflow policy is drop_oldest: producers live on the bot's
+  event loop and must never wait on the writer (block / sync are opt-in)
+- log_event() has the same signature as AuditDB.log_event()
+- Timestamp is captured at enqueue time, so ordering in the ledger is preserved
+- Queue / worker / backpressure live in BatchQueue (core/audit/batch.py)
+- Reads still go to AuditDB directly (events become visible after a flush)
+"""
+
+import atexit
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+# overflow policies re-exported: AuditWriter(db, overflow=...)
+from src.core.audit.batch import (
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_POLICIES,
+    OVERFLOW_SYNC,
+    BatchQueue,
+)
+from src.core.audit.db import AuditDB, audit_db
+
+log = logging.getLogger("mindforge.audit.writer")
+
+
+class AuditWriter(BatchQueue):
+    """
+    Group-commit audit sink.
+
+    Producers (middlewares, PolicyEngine, handlers) only append a prepared
+    row to an in-memory queue. A single background thread drains it and
+    writes batches through AuditDB.log_events_many().
+    """
+
+    def __init__(self, db: AuditDB, **kwargs) -> None:
+        super().__init__("audit-writer", **kwargs)
+        self.db = db
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+    def log_event(
+        self,
+        *,
+        session_id: str,
+        user_id: int,
+        username: str,
+        event_type: str,
+        action: str,
+        state: Optional[str] = None,
+        decision: Optional[str] = None,
+        policy: Optional[str] = None,
+        source: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Enqueue an audit event. Returns False if it was dropped.
+        """
+        row = AuditDB.make_event_row(
+            session_id=session_id,
+            user_id=user_id,
+            username=username,
+            event_type=event_type,
+            action=action,
+            state=state,
+            decision=decision,
+            policy=policy,
+            source=source,
+            payload=payload,
+        )
+        return self.enqueue(row)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def write(self, batch: List[Tuple]) -> None:
+        self.db.log_events_many(batch)
+
+    def _commit(self, batch: List[Tuple]) -> int:
+        try:
+            self.write(batch)
+            return 0
+        except Exception:
+            log.exception("AUDIT_WRITER | batch of %s failed, retrying per row", len(batch))
+            return self._write_rows_one_by_one(batch)
+
+    def _write_rows_one_by_one(self, batch: List[Tuple]) -> int:
+        failed = 0
+        for row in batch:
+            try:
+                self.db.log_events_many([row])
+            except Exception:
+                failed += 1
+                log.error("AUDIT_WRITER | dropped event action=%s", row[5])
+        return failed
+
+
+# ГЛОБАЛЬНЫЙ WRITER (group commit поверх audit_db)
+audit_writer = AuditWriter(audit_db)
+atexit.register(audit_writer.close)
@@ -9,23 +9,54 @@ Responsibilities:
 - Record ALLOW / DENY decisions from agents
 - Store agent_id, agent_role, action, policy, reason
 - Provide unified event format for dashboards
-- Emit structured logs (SOC / SIEM ready)
+- Emit structured logs (SOC / SIEM ready) through the audit bus
+  (src/core/audit/bus.py): DENY events are WARN, ALLOW events are INFO
 
 Storage:
-- In-memory (DEMO)
+- In-memory bounded ring (src/core/audit/ring.py): flat memory regardless
+  of uptime, oldest events are evicted
+- Indexed queries by agent_id / decision / policy (query_events)
 - Interface is stable for DB / MQ replacement
 """
 
-from datetime import datetime
+import atexit
 from typing import Dict, List
 
+from src.core.audit.bus import AuditEvent, RingSink, StdoutSink, audit_bus
+from src.core.audit.ring import DEFAULT_CAPACITY, AuditRing
+from src.core.events import level_no
 from src.core.logger import logger
 
 
 # ---------------------------------------------------------------------
-# In-memory audit storage (DEMO scope)
+# In-memory audit storage (bounded ring, indexed)
 # ---------------------------------------------------------------------
-_AUDIT_EVENTS: List[Dict] = []
+AUDIT_RING_CAPACITY = DEFAULT_CAPACITY
+
+_AUDIT_EVENTS = AuditRing(AUDIT_RING_CAPACITY)
+
+
+# ---------------------------------------------------------------------
+# Audit bus sinks owned by this module
+# ---------------------------------------------------------------------
+# ring — inline (get_events видит событие сразу)
+RING_SINK = audit_bus.add_sink(RingSink(_AUDIT_EVENTS, kinds=("agent",)))
+
+# текст "AUDIT agent_id=... timestamp=..." → logger: DENY — WARNING, ALLOW — INFO
+STDOUT_SINK = audit_bus.add_sink(StdoutSink(logger, kinds=("agent", "gateway")))
+
+atexit.register(audit_bus.close)
+
+
+def configure_logging(*, level: int | str | None = None, sample_rate: float | None = None) -> None:
+    """
+    Tune the stdout (logger) sink, e.g. level="WARN" logs DENY only,
+    sample_rate=0.1 logs every 10th event.
+    """
+    if level is not None:
+        STDOUT_SINK.level = level_no(level)
+    if sample_rate is not None:
+        STDOUT_SINK.sample_rate = min(1.0, max(0.0, sample_rate))
 
 
 # ---------------------------------------------------------------------
@@ -51,31 +82,18 @@ def record_event(
     :param reason: Human-readable explanation
     """
 
-    timestamp = datetime.utcnow().isoformat(timespec="seconds")
-
-    event = {
-        "timestamp_utc": timestamp,
-        "agent_id": agent_id,
-        "agent_role": agent_role,
-        "action": action,
-        "decision": decision,
-        "policy": policy,
-        "reason": reason,
-    }
-
-    # --- In-memory storage (DEMO) ---
-    _AUDIT_EVENTS.append(event)
-
-    # --- Centralized structured logging ---
-    logger.info(
-        "AUDIT "
-        f"agent_id={agent_id} "
-        f"agent_role={agent_role} "
-        f"decision={decision} "
-        f"action={action} "
-        f"policy={policy} "
-        f"reason={reason} "
-        f"timestamp={timestamp}"
+    # one canonical event → ring (inline) + logger (own queue, text only
+    # when the logger level lets it through), see audit/bus.py
+    audit_bus.publish(
+        AuditEvent(
+            "agent",
+            agent_id=agent_id,
+            agent_role=agent_role,
+            action=action,
+            decision=decision,
+            policy=policy,
+            reason=reason,
+        )
     )
 
 
@@ -85,4 +103,23 @@ def get_events(limit: int = 10) -> List[Dict]:
 
     :param limit: Max number of events
     """
-    return list(reversed(_AUDIT_EVENTS[-limit:]))
+    return [r.to_dict() for r in _AUDIT_EVENTS.latest(limit)]
+
+
+def query_events(
+    limit: int = 10,
+    *,
+    agent_id: str | None = None,
+    decision: str | None = None,
+    policy: str | None = None,
+) -> List[Dict]:
+    """
+    Return last audit events matching the filters (most recent first),
+    e.g. last 5 DENY for one agent. Uses the ring indexes, no scan.
+
+    :param limit: Max number of events
+    """
+    return [
+        r.to_dict()
+        for r in _AUDIT_EVENTS.latest(limit, agent_id=agent_id, decision=decision, policy=policy)
+    ]
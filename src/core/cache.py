@@ -0,0 +1,93 @@
+# src/core/cache.py
+"""
+File: src/core/cache.py
+
+Purpose:
+Generic bounded LRU + TTL in-memory cache.
+
+Responsibilities:
+- Memoize values by any hashable key (thread-safe)
+- Bound memory (maxsize, least recently used entry is evicted)
+- Expire entries after ttl seconds
+- Count hits / misses / evictions for observability
+
+IMPORTANT:
+- No dependencies on the rest of the project: importing it has no side
+  effects (used by PolicyEngine decisions and the LLM response cache)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL = 300.0  # seconds
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at < now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / total) if total else None,
+            }
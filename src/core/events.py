@@ -0,0 +1,215 @@
+# src/core/events.py
+"""
+File: src/core/events.py
+
+Purpose:
+Structured event pipeline for hot-path observability (SystemChat; EventSink
+routing is also the base of the audit bus sinks).
+
+Responsibilities:
+- Capture events as compact tuples: (ts, level, kind, values)
+- Render text / dict / JSON only when a sink at a matching level is attached
+- Per-sink level filter, topic filter (matches) and sampling
+- Render each format at most once per event, shared by all sinks
+
+IMPORTANT:
+- publish() with no interested sink costs one integer comparison:
+  no timestamp string, no dict, no f-string
+- Field names live in SCHEMAS, never in the event tuple
+- Sink errors never reach the publisher: they are counted and dropped
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+DEBUG, INFO, WARN, ERROR = 10, 20, 30, 40
+
+LEVELS: Dict[str, int] = {
+    "DEBUG": DEBUG,
+    "INFO": INFO,
+    "WARN": WARN,
+    "WARNING": WARN,
+    "ERROR": ERROR,
+}
+
+_DISABLED = 1 << 30
+
+# kind → field names of the values tuple (also the text / dict field order)
+SCHEMAS: Dict[str, Tuple[str, ...]] = {
+    "chat": ("source", "agent_id", "agent_role", "level", "message"),
+}
+
+# (ts, level, kind, values)
+Event = Tuple[float, int, str, Tuple[Any, ...]]
+
+
+def level_no(level: Union[int, str]) -> int:
+    if isinstance(level, int):
+        return level
+    return LEVELS.get(level.upper(), INFO)
+
+
+# =====================================================
+# Renderers (called lazily, once per format per event)
+# =====================================================
+def iso(ts: float) -> str:
+    return datetime.utcfromtimestamp(ts).isoformat(timespec="seconds")
+
+
+def as_dict(event: Event) -> Dict[str, Any]:
+    ts, _, kind, values = event
+    out: Dict[str, Any] = {"timestamp_utc": iso(ts)}
+    out.update(zip(SCHEMAS[kind], values))
+    return out
+
+
+def as_text(event: Event) -> str:
+    ts, _, kind, values = event
+    fields = " ".join(f"{k}={v}" for k, v in zip(SCHEMAS[kind], values))
+    return f"{kind.upper()} {fields} timestamp={iso(ts)}"
+
+
+def as_json(event: Event) -> str:
+    return json.dumps(as_dict(event), ensure_ascii=False)
+
+
+RENDERERS: Dict[str, Callable[[Event], Any]] = {
+    "event": lambda e: e,
+    "dict": as_dict,
+    "text": as_text,
+    "json": as_json,
+}
+
+
+# =====================================================
+# Sinks
+# =====================================================
+class EventSink:
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], None],
+        *,
+        level: Union[int, str] = INFO,
+        sample_rate: float = 1.0,
+        render: str = "dict",
+    ) -> None:
+        if render not in RENDERERS:
+            raise ValueError(f"Unknown render format: {render}")
+
+        self.name = name
+        self.handler = handler
+        self.level = level_no(level)
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.render = render
+
+        # детерминированный sampling: накопитель, без random на горячем пути
+        self._budget = 0.0
+
+        self.delivered = 0
+        self.sampled_out = 0
+        self.errors = 0
+
+    def matches(self, event: Event) -> bool:
+        # topic filter on the raw tuple (before sampling / rendering)
+        return True
+
+    def sample(self) -> bool:
+        if self.sample_rate >= 1.0:
+            return True
+
+        self._budget += self.sample_rate
+        if self._budget >= 1.0:
+            self._budget -= 1.0
+            return True
+
+        self.sampled_out += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "sample_rate": self.sample_rate,
+            "delivered": self.delivered,
+            "sampled_out": self.sampled_out,
+            "errors": self.errors,
+        }
+
+
+class EventPipeline:
+    def __init__(self) -> None:
+        self._sinks: Tuple[EventSink, ...] = ()
+        self._min_level = _DISABLED
+
+    def _refresh(self) -> None:
+        self._min_level = min((s.level for s in self._sinks), default=_DISABLED)
+
+    def add_sink(self, sink: EventSink) -> EventSink:
+        # copy-on-write: dispatch итерирует снимок без блокировок
+        self._sinks = self._sinks + (sink,)
+        self._refresh()
+        return sink
+
+    def remove_sink(self, sink: EventSink) -> bool:
+        if sink not in self._sinks:
+            return False
+        self._sinks = tuple(s for s in self._sinks if s is not sink)
+        self._refresh()
+        return True
+
+    def find(self, name: str) -> Optional[EventSink]:
+        return next((s for s in self._sinks if s.name == name), None)
+
+    def set_level(self, sink: EventSink, level: Union[int, str]) -> None:
+        sink.level = level_no(level)
+        self._refresh()
+
+    @property
+    def sinks(self) -> List[EventSink]:
+        return list(self._sinks)
+
+    def enabled(self, level: int) -> bool:
+        return level >= self._min_level
+
+    # -------------------------------------------------
+    # Hot path
+    # -------------------------------------------------
+    def publish(
+        self,
+        kind: str,
+        level: int,
+        values: Tuple[Any, ...],
+        ts: Optional[float] = None,
+    ) -> Optional[Event]:
+        if level < self._min_level:
+            return None
+
+        event = (time.time() if ts is None else ts, level, kind, values)
+        self.dispatch(event)
+        return event
+
+    def dispatch(self, event: Event) -> None:
+        level = event[1]
+        if level < self._min_level:
+            return
+
+        rendered: Dict[str, Any] = {}
+        for sink in self._sinks:
+            if level < sink.level or not sink.matches(event) or not sink.sample():
+                continue
+
+            payload = rendered.get(sink.render)
+            if payload is None:
+                payload = rendered[sink.render] = RENDERERS[sink.render](event)
+
+            try:
+                sink.handler(payload)
+                sink.delivered += 1
+            except Exception:
+                # sink errors must NOT break the publisher
+                sink.errors += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {s.name: s.stats() for s in self._sinks}
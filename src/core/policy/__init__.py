@@ -1,5 +1,9 @@
 from src.core.policy.engine import PolicyEngine
+from src.core.policy.reloader import PolicyReloader
 
 policy_engine = PolicyEngine(
     rules_path="src/core/policy/rules.yaml"
 )
+
+# hot reload rules.yaml (запускается в src/bot/bot.py)
+policy_reloader = PolicyReloader(policy_engine)
@@ -0,0 +1,199 @@
+# src/core/policy/compiler.py
+"""
+File: src/core/policy/compiler.py
+
+Purpose:
+Compile YAML policy rules into an indexed decision structure.
+
+Responsibilities:
+- Partition rules by `mode` (plus a partition for rules without mode)
+- Index exact `action` rules in a hash map
+- Index `action_prefix` rules in a prefix trie
+- Keep `min_trust` as a pre-extracted integer threshold per rule
+- Preserve first-match semantics of the original linear scan
+
+Complexity:
+- evaluate = O(len(action)) trie walk + merge of a few short candidate lists
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class CompiledRule:
+    """
+    Rule with its `when` clause pre-extracted into plain attributes.
+    """
+
+    __slots__ = ("order", "rule", "mode", "action", "action_prefix", "min_trust")
+
+    def __init__(self, order: int, rule: Dict[str, Any]) -> None:
+        when = rule.get("when") or {}
+
+        self.order = order
+        self.rule = rule
+        self.mode = when.get("mode")
+        self.action = when.get("action")
+        self.action_prefix = when.get("action_prefix")
+        self.min_trust = when.get("min_trust")
+
+    def residual_match(self, action: str, trust_level: int) -> bool:
+        """
+        Checks not covered by the index the rule was found in.
+        (exact-action rules may also carry a prefix; trust is always checked)
+        """
+        if self.min_trust is not None and trust_level < self.min_trust:
+            return False
+
+        if (
+            self.action is not None
+            and self.action_prefix is not None
+            and not action.startswith(self.action_prefix)
+        ):
+            return False
+
+        return True
+
+
+class _TrieNode:
+    __slots__ = ("children", "rules")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.rules: List[CompiledRule] = []
+
+
+class _Partition:
+    """
+    All rules sharing the same `mode` constraint (or no mode constraint).
+    """
+
+    __slots__ = ("exact", "trie", "wildcard")
+
+    def __init__(self) -> None:
+        self.exact: Dict[str, List[CompiledRule]] = {}
+        self.trie = _TrieNode()
+        self.wildcard: List[CompiledRule] = []
+
+    def add(self, rule: CompiledRule) -> None:
+        if rule.action is not None:
+            self.exact.setdefault(rule.action, []).append(rule)
+
+        elif rule.action_prefix is not None:
+            node = self.trie
+            for ch in rule.action_prefix:
+                node = node.children.setdefault(ch, _TrieNode())
+            node.rules.append(rule)
+
+        else:
+            self.wildcard.append(rule)
+
+    def candidates(self, action: str) -> Iterable[List[CompiledRule]]:
+        exact = self.exact.get(action)
+        if exact:
+            yield exact
+
+        node = self.trie
+        if node.rules:
+            yield node.rules          # empty prefix "" matches everything
+        for ch in action:
+            node = node.children.get(ch)
+            if node is None:
+                break
+            if node.rules:
+                yield node.rules
+
+        if self.wildcard:
+            yield self.wildcard
+
+
+class CompiledRuleSet:
+    """
+    Indexed, immutable view over a list of YAML rules.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]) -> None:
+        self.rules = rules
+        self._any_mode = _Partition()
+        self._by_mode: Dict[Any, _Partition] = {}
+
+        for order, raw in enumerate(rules):
+            rule = CompiledRule(order, raw)
+
+            if rule.mode is None:
+                self._any_mode.add(rule)
+            else:
+                self._by_mode.setdefault(rule.mode, _Partition()).add(rule)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(
+        self,
+        *,
+        mode: str,
+        action: str,
+        trust_level: int,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the FIRST rule (in YAML order) matching the inputs, or None.
+        """
+        lists: List[List[CompiledRule]] = list(self._any_mode.candidates(action))
+
+        partition = self._by_mode.get(mode)
+        if partition is not None:
+            lists.extend(partition.candidates(action))
+
+        if not lists:
+            return None
+
+        if len(lists) == 1:
+            ordered: Iterable[CompiledRule] = lists[0]
+        else:
+            # every candidate list is already in YAML order → k-way merge
+            ordered = heapq.merge(*lists, key=_order)
+
+        for rule in ordered:
+            if rule.residual_match(action, trust_level):
+                return rule.rule
+
+        return None
+
+
+def _order(rule: CompiledRule) -> int:
+    return rule.order
+
+
+def compile_rules(rules: List[Dict[str, Any]]) -> CompiledRuleSet:
+    return CompiledRuleSet(rules)
+
+
+def linear_match(
+    rules: List[Dict[str, Any]],
+    *,
+    mode: str,
+    action: str,
+    trust_level: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Reference (pre-compilation) semantics. Used by tests and for debugging.
+    """
+    for rule in rules:
+        when = rule.get("when", {})
+
+        if "mode" in when and when["mode"] != mode:
+            continue
+
+        if "action" in when and when["action"] != action:
+            continue
+
+        if "action_prefix" in when and not action.startswith(when["action_prefix"]):
+            continue
+
+        if "min_trust" in when and trust_level < when["min_trust"]:
+            continue
+
+        return rule
+
+    return None
+
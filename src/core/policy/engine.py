@@ -1,7 +1,13 @@
+import hashlib
 import yaml
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from src.core.audit.writer import audit_writer
+from src.core.cache import LRUTTLCache
+from src.core.policy.compiler import compile_rules
+
+_NOT_CACHED = object()
 
-from src.core.audit.db import audit_db
 
 class PolicyDecision:
     def __init__(self, decision: str, rule_id: str, policy: str, message: str):
@@ -11,10 +17,107 @@ class PolicyDecision:
         self.message = message
 
 
+DEFAULT_DECISION = PolicyDecision(
+    decision="ALLOW",
+    rule_id="DEFAULT",
+    policy="NONE",
+    message="No policy restrictions",
+)
+
+
+class RuleSet:
+    """
+    Immutable snapshot: parsed rules + compiled index + version.
+    Swapped as ONE reference, so evaluate() never mixes two rulesets.
+    """
+
+    __slots__ = ("version", "rules", "compiled")
+
+    def __init__(self, version: str, rules: List[Dict[str, Any]]):
+        self.version = version
+        self.rules = rules
+        # индексированная структура (hash / trie / mode partitions)
+        self.compiled = compile_rules(rules)
+
+
+def load_ruleset(rules_path: str) -> RuleSet:
+    """
+    Read + parse + compile. Pure function: safe to run in a worker thread.
+    """
+    with open(rules_path, "rb") as f:
+        raw = f.read()
+
+    rules = yaml.safe_load(raw.decode("utf-8"))["rules"]
+
+    # версия ruleset = хэш содержимого файла (ключ кэша решений)
+    return RuleSet(hashlib.sha256(raw).hexdigest()[:12], rules)
+
+
 class PolicyEngine:
-    def __init__(self, rules_path: str):
-        with open(rules_path, "r", encoding="utf-8") as f:
-            self.rules = yaml.safe_load(f)["rules"]
+    def __init__(self, rules_path: str, cache: Optional[LRUTTLCache] = None):
+        self.rules_path = rules_path
+        self.cache = cache if cache is not None else LRUTTLCache()
+        self._ruleset = load_ruleset(rules_path)
+
+    # ------------------------------------------------------------------
+    # Ruleset (hot reload)
+    # ------------------------------------------------------------------
+    @property
+    def rules(self) -> List[Dict[str, Any]]:
+        return self._ruleset.rules
+
+    @property
+    def version(self) -> str:
+        return self._ruleset.version
+
+    def swap(self, ruleset: RuleSet) -> bool:
+        """
+        Atomically install a new ruleset. Returns False if unchanged.
+        """
+        if ruleset.version == self._ruleset.version:
+            return False
+
+        self._ruleset = ruleset
+        # старые ключи и так недостижимы (версия в ключе) — освобождаем память
+        self.cache.clear()
+        return True
+
+    def reload(self) -> bool:
+        return self.swap(load_ruleset(self.rules_path))
+
+    def _decide(
+        self,
+        ruleset: RuleSet,
+        mode: str,
+        action: str,
+        trust_level: int,
+    ) -> Optional[PolicyDecision]:
+        """
+        Memoized rule lookup. None → no rule matched (DEFAULT ALLOW).
+        """
+        key = (ruleset.version, mode, action, trust_level)
+        decision = self.cache.get(key, _NOT_CACHED)
+
+        if decision is not _NOT_CACHED:
+            return decision
+
+        rule = ruleset.compiled.match(
+            mode=mode,
+            action=action,
+            trust_level=trust_level,
+        )
+
+        decision = None
+        if rule is not None:
+            decision = PolicyDecision(
+                decision=rule["decision"],
+                rule_id=rule["id"],
+                policy=rule["policy"],
+                message=rule.get("message", ""),
+            )
+
+        self.cache.put(key, decision)
+        return decision
 
     def evaluate(
         self,
@@ -29,31 +132,14 @@ class PolicyEngine:
         payload: Optional[Dict[str, Any]] = None,
     ) -> PolicyDecision:
 
-        for rule in self.rules:
-            when = rule.get("when", {})
-
-            if "mode" in when and when["mode"] != mode:
-                continue
-
-            if "action" in when and when["action"] != action:
-                continue
-
-            if "action_prefix" in when and not action.startswith(when["action_prefix"]):
-                continue
-
-            if "min_trust" in when and trust_level < when["min_trust"]:
-                continue
+        ruleset = self._ruleset
+        decision = self._decide(ruleset, mode, action, trust_level)
 
+        if decision is not None:
             # 🔐 RULE MATCHED
-            decision = PolicyDecision(
-                decision=rule["decision"],
-                rule_id=rule["id"],
-                policy=rule["policy"],
-                message=rule.get("message", ""),
-            )
 
-            # 🧾 AUDIT
-            audit_db.log_event(
+            # 🧾 AUDIT (на каждый вызов, даже при попадании в кэш)
+            audit_writer.log_event(
                 session_id=session_id,
                 user_id=user_id,
                 username=username,
@@ -63,15 +149,10 @@ class PolicyEngine:
                 decision=decision.decision,
                 policy=decision.policy,
                 source=decision.rule_id,
-                payload=payload or {},
+                payload={**(payload or {}), "rules_version": ruleset.version},
             )
 
             return decision
 
         # DEFAULT: ALLOW
-        return PolicyDecision(
-            decision="ALLOW",
-            rule_id="DEFAULT",
-            policy="NONE",
-            message="No policy restrictions",
-        )
+        return DEFAULT_DECISION
@@ -0,0 +1,116 @@
+# src/core/policy/reloader.py
+"""
+File: src/core/policy/reloader.py
+
+Purpose:
+Hot reload of policy rules (rules.yaml) without restarting the bot.
+
+Responsibilities:
+- Poll the rules file (mtime + size) from a background thread
+- Parse and compile the new ruleset OFF the event loop
+- Swap it into PolicyEngine atomically (single reference assignment)
+- Keep the previous ruleset if the new file is invalid
+
+IMPORTANT:
+- The event loop only ever pays for one attribute read per evaluate()
+- FSM sessions are untouched: the bot process keeps running
+"""
+
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+from src.core.policy.engine import PolicyEngine, load_ruleset
+
+log = logging.getLogger("mindforge.policy.reloader")
+
+POLL_INTERVAL = 1.0  # seconds
+
+
+class PolicyReloader:
+    def __init__(self, engine: PolicyEngine, interval: float = POLL_INTERVAL) -> None:
+        self.engine = engine
+        self.interval = interval
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = self._stat()
+
+        self.reloads = 0
+        self.failures = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="policy-reloader",
+            daemon=True,
+        )
+        self._thread.start()
+
+        log.info(
+            "POLICY_RELOADER | watching %s | version=%s",
+            self.engine.rules_path,
+            self.engine.version,
+        )
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.engine.rules_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check(self) -> bool:
+        """
+        One polling step. Returns True if a new ruleset was installed.
+        """
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+
+        self._signature = signature
+
+        try:
+            ruleset = load_ruleset(self.engine.rules_path)
+        except Exception:
+            # битый YAML не должен ронять политику — остаёмся на старой версии
+            self.failures += 1
+            log.exception(
+                "POLICY_RELOAD_FAILED | keeping version=%s",
+                self.engine.version,
+            )
+            return False
+
+        previous = self.engine.version
+        if not self.engine.swap(ruleset):
+            return False
+
+        self.reloads += 1
+        log.info(
+            "POLICY_RELOADED | %s -> %s | rules=%s",
+            previous,
+            ruleset.version,
+            len(ruleset.rules),
+        )
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -0,0 +1,165 @@
+# src/core/sqlite_pool.py
+"""
+File: src/core/sqlite_pool.py
+
+Purpose:
+Long-lived SQLite connection pool for MindForge storage layers.
+
+Responsibilities:
+- Open connections ONCE and configure them with pragmas (WAL, synchronous, cache)
+- Serialize writes through a single writer connection
+- Hand out reader connections from a small bounded pool
+- Be safe for threads and for sync code running inside the asyncio loop
+
+IMPORTANT:
+- Checkout never awaits: hold a connection only for the duration of a query
+- Statement caching is done by sqlite3 per connection (cached_statements)
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+
+DEFAULT_PRAGMAS: Sequence[str] = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA foreign_keys=ON;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-8000;",     # ~8 MB page cache per connection
+    "PRAGMA busy_timeout=5000;",
+)
+
+STATEMENT_CACHE_SIZE = 256
+CHECKOUT_TIMEOUT = 5.0  # seconds
+
+
+class PoolClosedError(RuntimeError):
+    pass
+
+
+class SQLiteConnectionPool:
+    """
+    One writer + N readers over the same database file.
+
+    In WAL mode readers never block the writer and see the last
+    committed state. For ":memory:" databases every connection would be
+    a separate database, so readers share the writer connection.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        readers: int = 4,
+        pragmas: Sequence[str] = DEFAULT_PRAGMAS,
+        checkout_timeout: float = CHECKOUT_TIMEOUT,
+    ) -> None:
+        self.db_path = str(db_path)
+        self.pragmas = tuple(pragmas)
+        self.checkout_timeout = checkout_timeout
+
+        self._closed = False
+        self._write_lock = threading.RLock()
+        self._writer = self._connect()
+
+        self._shared = self.db_path == ":memory:" or readers <= 0
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all_readers: List[sqlite3.Connection] = []
+
+        if not self._shared:
+            for _ in range(readers):
+                conn = self._connect()
+                self._all_readers.append(conn)
+                self._readers.put(conn)
+
+    # ------------------------------------------------------------------
+    # Connection setup (once per connection)
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+
+        return conn
+
+    # ------------------------------------------------------------------
+    # Checkout API
+    # ------------------------------------------------------------------
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        Exclusive access to the writer connection.
+        Commits on success, rolls back on error.
+        """
+        self._ensure_open()
+
+        with self._write_lock:
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection from the pool.
+        """
+        self._ensure_open()
+
+        if self._shared:
+            with self._write_lock:
+                yield self._writer
+            return
+
+        try:
+            conn = self._readers.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No free SQLite reader for {self.db_path} "
+                f"after {self.checkout_timeout}s"
+            )
+
+        try:
+            yield conn
+        finally:
+            # Close any implicit read transaction before returning to pool
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        if self._closed:
+            return
+
+        with self._write_lock:
+            self._closed = True
+
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+
+            self._writer.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise PoolClosedError(f"Connection pool for {self.db_path} is closed")
+
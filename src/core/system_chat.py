@@ -7,17 +7,210 @@ Central System Chat for MindForge Agent Ecosystem.
 
 Responsibilities:
 - Act as a shared "room" where all agents publish messages
-- Preserve message history for DEMO / dashboards
-- Emit structured events for UI layers (Telegram / Web later)
+- Preserve a bounded message history (ring) for DEMO / dashboards
+- Pub/sub for UI layers (Telegram / Web): every subscriber has its own
+  bounded queue with a drop / coalesce policy and a topic filter
+  (agent_role, minimal level)
+- Async iterator subscriptions (`async for event in chat.subscribe_async()`)
+- Store messages as compact tuples; dicts are built only for readers
+  (history) and for subscribers whose filters accept them
 
 IMPORTANT:
 - NO Telegram code here
 - NO agent logic here
 - This is an infrastructure / observability layer
+- emit() never awaits and never runs subscriber code when the subscriber
+  lives on an event loop: it only appends to queues (thread-safe)
+- Callback subscribers created outside an event loop are called inline
+  (scripts / tests, legacy behaviour)
 """
 
-from datetime import datetime
-from typing import Dict, List, Callable, Optional
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Union
+
+from src.core.events import DEBUG, EventPipeline, EventSink, Event, as_dict, level_no
+
+HISTORY_SIZE = 1000
+SUBSCRIBER_QUEUE = 256
+
+# Queue-full policies
+POLICY_DROP_OLDEST = "drop_oldest"    # newest wins, oldest pending is lost
+POLICY_DROP_NEWEST = "drop_newest"    # pending wins, incoming is lost
+POLICY_COALESCE = "coalesce"          # latest message per agent replaces its pending one
+
+POLICIES = {POLICY_DROP_OLDEST, POLICY_DROP_NEWEST, POLICY_COALESCE}
+
+
+def _event_key(event: Dict) -> tuple:
+    return event.get("agent_id"), event.get("agent_role")
+
+
+class Subscription(EventSink):
+    """
+    One subscriber: filters + bounded queue + delivery.
+
+    - callback is None → consumed with `async for` / get_nowait()
+    - callback set     → drained on its event loop (or inline if none)
+    """
+
+    def __init__(
+        self,
+        chat: "SystemChat",
+        callback: Optional[Callable[[Dict], Any]] = None,
+        *,
+        name: Optional[str] = None,
+        level: Union[int, str] = DEBUG,
+        roles: Optional[Iterable[str]] = None,
+        sample_rate: float = 1.0,
+        maxsize: int = SUBSCRIBER_QUEUE,
+        policy: str = POLICY_DROP_OLDEST,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+
+        if name is None:
+            name = getattr(callback, "__qualname__", None) or f"subscription-{id(self):x}"
+
+        super().__init__(name, self._push, level=level, sample_rate=sample_rate, render="dict")
+
+        self.chat = chat
+        self.callback = callback
+        self.roles = frozenset(roles) if roles is not None else None
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+
+        self._loop = loop
+        self._queue: Deque[Dict] = deque()
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = asyncio.Event() if loop is not None else None
+        self._drain_scheduled = False
+        self.closed = False
+
+        self.dropped = 0
+        self.coalesced = 0
+
+    # ------------------------------------------------------------------
+    # Producer side (emit thread)
+    # ------------------------------------------------------------------
+    def matches(self, event: Event) -> bool:
+        # values = (source, agent_id, agent_role, level, message)
+        return self.roles is None or event[3][2] in self.roles
+
+    def _push(self, payload: Dict) -> None:
+        if self.closed:
+            return
+
+        if self._loop is None and self.callback is not None:
+            self.callback(payload)              # no loop → inline (legacy)
+            return
+
+        with self._lock:
+            if len(self._queue) >= self.maxsize and not self._make_room(payload):
+                return
+            self._queue.append(payload)
+
+        self._notify()
+
+    def _make_room(self, payload: Dict) -> bool:
+        """
+        Queue is full (lock held). Returns False if `payload` must be dropped.
+        """
+        if self.policy == POLICY_DROP_NEWEST:
+            self.dropped += 1
+            return False
+
+        if self.policy == POLICY_COALESCE:
+            key = _event_key(payload)
+            for i in range(len(self._queue) - 1, -1, -1):
+                if _event_key(self._queue[i]) == key:
+                    del self._queue[i]
+                    self.coalesced += 1
+                    return True
+
+        self._queue.popleft()
+        self.dropped += 1
+        return True
+
+    def _notify(self) -> None:
+        try:
+            if self.callback is None:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            elif not self._drain_scheduled:
+                self._drain_scheduled = True
+                self._loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # loop закрыт — подписчик мёртв, отписываемся
+            self.close()
+
+    # ------------------------------------------------------------------
+    # Consumer side (subscriber's loop)
+    # ------------------------------------------------------------------
+    def _drain(self) -> None:
+        self._drain_scheduled = False
+        for event in self.drain():
+            try:
+                result = self.callback(event)
+                if inspect.isawaitable(result):
+                    self._loop.create_task(result)
+            except Exception:
+                # Subscriber errors must NOT break system
+                self.errors += 1
+
+    def drain(self) -> List[Dict]:
+        with self._lock:
+            events = list(self._queue)
+            self._queue.clear()
+        return events
+
+    def get_nowait(self) -> Optional[Dict]:
+        with self._lock:
+            return self._queue.popleft() if self._queue else None
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Dict:
+        if self._wakeup is None:
+            raise RuntimeError("Subscription is not bound to an event loop")
+
+        while True:
+            with self._lock:
+                if self._queue:
+                    return self._queue.popleft()
+                if self.closed:
+                    raise StopAsyncIteration
+                self._wakeup.clear()
+            await self._wakeup.wait()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.chat._remove(self)
+        if self._wakeup is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data.update(
+            queued=len(self._queue),
+            maxsize=self.maxsize,
+            policy=self.policy,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+        )
+        return data
 
 
 class SystemChat:
@@ -25,9 +218,9 @@ class SystemChat:
     Central event bus / shared chat for all agents.
     """
 
-    def __init__(self) -> None:
-        self._messages: List[Dict] = []
-        self._subscribers: List[Callable[[Dict], None]] = []
+    def __init__(self, history_size: int = HISTORY_SIZE) -> None:
+        self._messages: Deque[Event] = deque(maxlen=history_size)
+        self._subscribers = EventPipeline()
 
     # ------------------------------------------------------------------
     # Core API
@@ -51,25 +244,20 @@ class SystemChat:
         :param level: INFO | WARN | ERROR
         """
 
-        event = {
-            "timestamp_utc": datetime.utcnow().isoformat(timespec="seconds"),
-            "source": source,
-            "agent_id": agent_id,
-            "agent_role": agent_role,
-            "level": level,
-            "message": message,
-        }
+        event = (
+            time.time(),
+            level_no(level),
+            "chat",
+            (source, agent_id, agent_role, level, message),
+        )
 
-        # Store in memory (DEMO)
+        # Store in memory (bounded ring), compact tuple
         self._messages.append(event)
 
-        # Notify subscribers (Telegram bridge, WebSocket, etc.)
-        for subscriber in self._subscribers:
-            try:
-                subscriber(event)
-            except Exception:
-                # Subscriber errors must NOT break system
-                pass
+        # Fan out to subscriber queues (Telegram bridge, WebSocket, etc.);
+        # the dict is rendered once, only if some subscriber accepts it.
+        # Nothing here awaits or waits for a subscriber.
+        self._subscribers.dispatch(event)
 
     # ------------------------------------------------------------------
     # Compatibility alias (older code)
@@ -101,7 +289,10 @@ class SystemChat:
         """
         Return last N system chat messages.
         """
-        return self._messages[-limit:]
+        if limit <= 0:
+            return []
+        messages = list(self._messages)
+        return [as_dict(e) for e in messages[-limit:]]
 
     def clear(self) -> None:
         """
@@ -112,17 +303,101 @@ class SystemChat:
     # ------------------------------------------------------------------
     # Subscription API (Telegram / Web)
     # ------------------------------------------------------------------
-    def subscribe(self, callback: Callable[[Dict], None]) -> None:
+    def subscribe(
+        self,
+        callback: Callable[[Dict], Any],
+        *,
+        level: str = "DEBUG",
+        roles: Optional[Iterable[str]] = None,
+        sample_rate: float = 1.0,
+        maxsize: int = SUBSCRIBER_QUEUE,
+        policy: str = POLICY_DROP_OLDEST,
+    ) -> Subscription:
         """
         Subscribe to new messages.
 
-        callback(event: Dict) -> None
+        callback(event: Dict) -> None (or a coroutine)
+
+        Inside a running event loop the callback is called on that loop,
+        from its own bounded queue; outside of a loop it is called inline.
+
+        :param level: minimal level delivered (INFO | WARN | ERROR)
+        :param roles: agent_role filter (None = all)
+        :param sample_rate: fraction of messages delivered (1.0 = all)
+        :param maxsize: subscriber queue size
+        :param policy: drop_oldest | drop_newest | coalesce
+        """
+        return self._add(
+            Subscription(
+                self,
+                callback,
+                level=level,
+                roles=roles,
+                sample_rate=sample_rate,
+                maxsize=maxsize,
+                policy=policy,
+                loop=self._running_loop(),
+            )
+        )
+
+    def subscribe_async(
+        self,
+        *,
+        name: Optional[str] = None,
+        level: str = "DEBUG",
+        roles: Optional[Iterable[str]] = None,
+        maxsize: int = SUBSCRIBER_QUEUE,
+        policy: str = POLICY_DROP_OLDEST,
+    ) -> Subscription:
+        """
+        Async iterator subscription (call from a running event loop):
+
+            sub = SYSTEM_CHAT.subscribe_async(roles={"master"})
+            async for event in sub:
+                ...
+            sub.close()
         """
-        self._subscribers.append(callback)
+        return self._add(
+            Subscription(
+                self,
+                name=name,
+                level=level,
+                roles=roles,
+                maxsize=maxsize,
+                policy=policy,
+                loop=asyncio.get_running_loop(),
+            )
+        )
+
+    def unsubscribe(self, callback: Union[Subscription, Callable[[Dict], Any]]) -> None:
+        if isinstance(callback, Subscription):
+            callback.close()
+            return
+
+        for sub in self._subscribers.sinks:
+            if sub.callback == callback:
+                sub.close()
+                return
+
+    def subscriber_stats(self) -> Dict[str, Dict]:
+        return self._subscribers.stats()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _add(self, subscription: Subscription) -> Subscription:
+        self._subscribers.add_sink(subscription)
+        return subscription
 
-    def unsubscribe(self, callback: Callable[[Dict], None]) -> None:
-        if callback in self._subscribers:
-            self._subscribers.remove(callback)
+    def _remove(self, subscription: Subscription) -> None:
+        self._subscribers.remove_sink(subscription)
 
 
 # ------------------------------------------------------------------
@@ -1,8 +1,14 @@
+from src.core.audit.bus import AuditEvent, audit_bus
+
+
 def audit_log(request, status, reason):
-    print({
-        "agent": request.get("agent_id"),
-        "intent": request.get("intent"),
-        "target": request.get("target"),
-        "status": status,
-        "reason": reason
-    })
+    audit_bus.publish(
+        AuditEvent(
+            "gateway",
+            agent_id=request.get("agent_id"),
+            action=request.get("intent"),
+            decision=status,
+            reason=reason,
+            extra={"target": request.get("target")},
+        )
+    )
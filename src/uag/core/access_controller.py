@@ -1,7 +1,7 @@
 from .rbac import is_intent_allowed
 from .validator import validate_request, UAGValidationError
 from .audit import log_decision
-from src.agents.loader import load_agent_spec
+from .agent_specs import agent_specs
 
 class UAGAccessController:
     def handle(self, payload: dict, role: str = "agent_l0") -> dict:
@@ -30,36 +30,23 @@ def check_agent_permission(payload: dict) -> tuple[bool, str]:
     intent = payload.get("intent")
     env = payload.get("env")
 
-    spec = load_agent_spec(agent_id)
-
-    role = spec.get("role", {})
-    level = role.get("level", 0)
-
-    capabilities = spec.get("capabilities", {})
-    constraints = spec.get("constraints", {})
+    # предвычисленный view: только set-lookup'ы, без YAML
+    spec = agent_specs.get(agent_id)
 
     # 1. Проверка окружения
-    allowed_envs = constraints.get("allowed_envs", [])
-    if env not in allowed_envs:
+    if env not in spec.allowed_envs:
         return False, f"env '{env}' not allowed"
 
     # 2. Запрещённые интенты
-    if intent in constraints.get("forbidden_intents", []):
+    if intent in spec.forbidden_intents:
         return False, f"intent '{intent}' is forbidden"
 
     # 3. Capabilities
-    flat_caps = {
-        cap
-        for group in capabilities.values()
-        for cap in group
-    }
-
-    if intent not in flat_caps:
+    if intent not in spec.capabilities:
         return False, f"intent '{intent}' not in agent capabilities"
 
     # 4. Минимальный уровень (пример логики)
-    if intent == "build_foundation" and level < 3:
+    if intent == "build_foundation" and spec.level < 3:
         return False, "insufficient agent level"
 
     return True, "allowed"
-
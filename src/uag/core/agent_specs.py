@@ -0,0 +1,131 @@
+# src/uag/core/agent_specs.py
+"""
+File: src/uag/core/agent_specs.py
+
+Purpose:
+Cache of parsed AgentSpec.yaml files with precomputed permission views.
+
+Responsibilities:
+- Parse each AgentSpec ONCE (YAML is never parsed on the hot path),
+  from the cache's own registry directory
+- Precompute frozen sets: capabilities (flattened), forbidden intents, envs
+- Invalidate an entry when its spec file changes (mtime / size)
+
+IMPORTANT:
+- AgentSpecView is immutable and shared between callers
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+import yaml
+
+from src.agent.loader import AGENT_REGISTRY, AgentNotFound
+
+CHECK_INTERVAL = 2.0  # seconds between mtime checks per agent
+
+
+@dataclass(frozen=True)
+class AgentSpecView:
+    agent_id: str
+    role_name: Optional[str]
+    level: int
+    version: str
+    capabilities: FrozenSet[str]
+    forbidden_intents: FrozenSet[str]
+    allowed_envs: FrozenSet[str]
+    spec: Mapping[str, Any]
+
+    @classmethod
+    def from_spec(cls, agent_id: str, spec: Dict[str, Any]) -> "AgentSpecView":
+        role = spec.get("role", {}) or {}
+        capabilities = spec.get("capabilities", {}) or {}
+        constraints = spec.get("constraints", {}) or {}
+
+        return cls(
+            agent_id=agent_id,
+            role_name=role.get("name"),
+            level=role.get("level", 0),
+            version=spec.get("version", "unknown"),
+            capabilities=frozenset(
+                cap
+                for group in capabilities.values()
+                for cap in (group or [])
+            ),
+            forbidden_intents=frozenset(constraints.get("forbidden_intents", []) or []),
+            allowed_envs=frozenset(constraints.get("allowed_envs", []) or []),
+            spec=MappingProxyType(spec),
+        )
+
+
+class AgentSpecCache:
+    def __init__(
+        self,
+        registry: Path = AGENT_REGISTRY,
+        check_interval: float = CHECK_INTERVAL,
+    ) -> None:
+        self.registry = Path(registry)
+        self.check_interval = check_interval
+
+        # agent_id → (view, file signature, last check)
+        self._entries: Dict[str, Tuple[AgentSpecView, Optional[Tuple[int, int]], float]] = {}
+        self._lock = threading.Lock()
+
+        self.loads = 0
+
+    def _path(self, agent_id: str) -> Path:
+        return self.registry / f"{agent_id}.yaml"
+
+    def _signature(self, agent_id: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = self._path(agent_id).stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self, agent_id: str) -> Dict[str, Any]:
+        # как load_agent_spec(), но из self.registry
+        path = self._path(agent_id)
+        if not path.exists():
+            raise AgentNotFound(f"AgentSpec not found: {agent_id}")
+
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+
+    def get(self, agent_id: str) -> AgentSpecView:
+        """
+        Precomputed view of an AgentSpec. Raises AgentNotFound like the loader.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(agent_id)
+
+        if entry is not None and now - entry[2] < self.check_interval:
+            return entry[0]
+
+        with self._lock:
+            signature = self._signature(agent_id)
+            entry = self._entries.get(agent_id)
+
+            if entry is not None and signature == entry[1]:
+                self._entries[agent_id] = (entry[0], signature, now)
+                return entry[0]
+
+            view = AgentSpecView.from_spec(agent_id, self._load(agent_id))
+            self._entries[agent_id] = (view, signature, now)
+            self.loads += 1
+            return view
+
+    def invalidate(self, agent_id: Optional[str] = None) -> None:
+        with self._lock:
+            if agent_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(agent_id, None)
+
+
+# Global cache
+agent_specs = AgentSpecCache()
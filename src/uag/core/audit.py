@@ -1,16 +1,39 @@
-import json
-from datetime import datetime
+import atexit
 from pathlib import Path
 
+from src.core.audit.bus import AuditEvent, JSONLSink, LedgerSink, audit_bus
+from src.core.audit.writer import audit_writer
+from src.uag.core.decision_log import DecisionLogWriter
+
 AUDIT_LOG = Path("src/uag/audit.log")
 
+# файл держится открытым, строки буферизуются, ротация по размеру/дате
+decision_log = DecisionLogWriter(AUDIT_LOG)
+
+# одно событие → JSONL (TeacherAgent) + SQLite ledger (group commit audit_writer)
+JSONL_SINK = audit_bus.add_sink(JSONLSink(decision_log, kinds=("uag",)))
+LEDGER_SINK = audit_bus.add_sink(LedgerSink(audit_writer, kinds=("uag",)))
+
+# порядок atexit обратный: сначала дренируем bus, потом закрываем файл
+atexit.register(decision_log.close)
+atexit.register(audit_bus.close)
+
 
 def log_decision(record: dict):
     """
     Записывает audit event.
     Ожидает полностью сформированный record.
     """
-    record["timestamp"] = datetime.utcnow().isoformat()
-
-    with open(AUDIT_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    event = audit_bus.publish(
+        AuditEvent(
+            "uag",
+            agent_id=record.get("agent_id"),
+            agent_role=record.get("agent_role"),
+            action=record.get("intent"),
+            decision=record.get("decision"),
+            policy="UAG",
+            reason=record.get("reason"),
+            extra=dict(record),
+        )
+    )
+    record["timestamp"] = event.timestamp
@@ -0,0 +1,242 @@
+# src/uag/core/decision_log.py
+"""
+File: src/uag/core/decision_log.py
+
+Purpose:
+Buffered, rotating JSONL writer for UAG access decisions.
+
+Responsibilities:
+- Keep the log file open (no open/close per decision)
+- Buffer lines and flush on size / time thresholds and at shutdown
+- Rotate by size and by date, gzip rotated segments, keep N backups
+- Be safe for concurrent callers (threads, asyncio handlers)
+
+IMPORTANT:
+- Readers (TeacherAgent) see records after the next flush (<= flush_interval)
+- Compression of rotated segments runs in a background thread
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import IO, List, Optional
+
+log = logging.getLogger("mindforge.uag.decision_log")
+
+MAX_BYTES = 10 * 1024 * 1024   # rotate after 10 MB
+FLUSH_BYTES = 64 * 1024        # flush buffer after 64 KB
+FLUSH_INTERVAL = 1.0           # ... or after 1 second
+BACKUP_COUNT = 14              # rotated segments to keep
+
+
+class DecisionLogWriter:
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = MAX_BYTES,
+        rotate_daily: bool = True,
+        compress: bool = True,
+        backup_count: int = BACKUP_COUNT,
+        flush_bytes: int = FLUSH_BYTES,
+        flush_interval: float = FLUSH_INTERVAL,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.backup_count = backup_count
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._buffer: List[str] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+
+        self._file: Optional[IO[str]] = None
+        self._size = 0
+        self._day: Optional[date] = None
+
+        self._closed = False
+        self._timer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._compressors: List[threading.Thread] = []
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def write(self, record: dict) -> None:
+        self.write_lines([json.dumps(record, ensure_ascii=False)])
+
+    def write_lines(self, lines: List[str]) -> None:
+        """
+        Append already serialized JSON records (one per line, no newline).
+        """
+        data = [line + "\n" for line in lines]
+        size = sum(len(line.encode("utf-8")) for line in data)
+
+        with self._lock:
+            if self._closed:
+                # после shutdown — пишем сразу, запись не теряем
+                self._buffer.extend(data)
+                self._buffered_bytes += size
+                self._flush_locked()
+                self._close_file()
+                return
+
+            self._ensure_timer()
+            self._buffer.extend(data)
+            self._buffered_bytes += size
+
+            if (
+                self._buffered_bytes >= self.flush_bytes
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        self._stop.set()
+
+        with self._lock:
+            self._flush_locked()
+            self._close_file()
+            self._closed = True
+
+        if self._timer is not None:
+            self._timer.join(timeout=2)
+            self._timer = None
+
+        for t in self._compressors:
+            t.join(timeout=10)
+        self._compressors.clear()
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds self._lock)
+    # ------------------------------------------------------------------
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+
+        if not self._buffer:
+            return
+
+        data = "".join(self._buffer)
+        size = self._buffered_bytes
+        self._buffer.clear()
+        self._buffered_bytes = 0
+
+        if self._should_rotate(size):
+            self._rotate()
+
+        f = self._open_file()
+        f.write(data)
+        f.flush()
+        self._size += size
+
+    def _open_file(self) -> IO[str]:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            st = self.path.stat()
+            self._size = st.st_size
+            self._day = date.fromtimestamp(st.st_mtime) if st.st_size else date.today()
+        return self._file
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _should_rotate(self, incoming: int) -> bool:
+        self._open_file()
+
+        if self._size == 0:
+            return False
+
+        if self.max_bytes and self._size + incoming > self.max_bytes:
+            return True
+
+        return self.rotate_daily and self._day != date.today()
+
+    def _rotate(self) -> None:
+        self._close_file()
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        target = self.path.with_name(f"{self.path.name}.{stamp}")
+        n = 1
+        while target.exists() or target.with_name(target.name + ".gz").exists():
+            target = self.path.with_name(f"{self.path.name}.{stamp}.{n}")
+            n += 1
+
+        os.replace(self.path, target)
+        log.info("UAG_DECISION_LOG_ROTATED | %s", target)
+
+        if self.compress:
+            t = threading.Thread(
+                target=self._compress_and_prune,
+                args=(target,),
+                name="decision-log-gzip",
+                daemon=True,
+            )
+            self._compressors = [c for c in self._compressors if c.is_alive()]
+            self._compressors.append(t)
+            t.start()
+        else:
+            self._prune()
+
+    def _compress_and_prune(self, segment: Path) -> None:
+        try:
+            with open(segment, "rb") as src, gzip.open(f"{segment}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            segment.unlink()
+        except OSError:
+            log.exception("UAG_DECISION_LOG_GZIP_FAILED | %s", segment)
+        self._prune()
+
+    def _prune(self) -> None:
+        if self.backup_count <= 0:
+            return
+
+        segments = []
+        for p in self.path.parent.glob(f"{self.path.name}.*"):
+            try:
+                segments.append((p.stat().st_mtime, p))
+            except OSError:
+                continue  # удалён параллельным prune
+
+        segments.sort()
+        for _, old in segments[:-self.backup_count]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Background time-based flush
+    # ------------------------------------------------------------------
+    def _ensure_timer(self) -> None:
+        if self._timer is not None:
+            return
+
+        self._timer = threading.Thread(
+            target=self._run_timer,
+            name="decision-log-flush",
+            daemon=True,
+        )
+        self._timer.start()
+
+    def _run_timer(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            with self._lock:
+                if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
@@ -0,0 +1,140 @@
+# src/uag/core/schema_registry.py
+"""
+File: src/uag/core/schema_registry.py
+
+Purpose:
+Registry of compiled JSON Schema validators for UAG contracts.
+
+Responsibilities:
+- Load each contract schema ONCE and check it (check_schema) at startup
+- Cache a ready Draft*Validator instance per schema file
+- Fast path: is_valid() / iter_errors() without rebuilding validator classes
+- Reload a schema when its file changes (mtime / size)
+
+IMPORTANT:
+- File stat is throttled (check_interval) so the hot path is a dict lookup
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from jsonschema import validators
+from jsonschema.exceptions import ValidationError, best_match
+
+log = logging.getLogger("mindforge.uag.schema")
+
+CHECK_INTERVAL = 2.0  # seconds between mtime checks per schema
+
+
+class _Entry:
+    __slots__ = ("validator", "signature", "checked_at")
+
+    def __init__(self, validator: Any, signature: Tuple[int, int], checked_at: float):
+        self.validator = validator
+        self.signature = signature
+        self.checked_at = checked_at
+
+
+class SchemaRegistry:
+    def __init__(self, check_interval: float = CHECK_INTERVAL) -> None:
+        self.check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _signature(path: Path) -> Tuple[int, int]:
+        st = path.stat()
+        return st.st_mtime_ns, st.st_size
+
+    def _compile(self, path: Path) -> _Entry:
+        signature = self._signature(path)
+
+        with open(path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+
+        # validator class по $schema (Draft4/6/7/2019-09/2020-12)
+        cls = validators.validator_for(schema)
+        cls.check_schema(schema)  # SchemaError → битый контракт
+
+        log.info("UAG_SCHEMA_LOADED | %s | %s", path, cls.__name__)
+        return _Entry(cls(schema), signature, time.monotonic())
+
+    def preload(self, *paths: str | Path) -> None:
+        """
+        Startup: compile + check_schema. Missing files are reported and
+        loaded lazily on first use; invalid schemas raise SchemaError.
+        """
+        for p in paths:
+            path = Path(p)
+            if not path.exists():
+                log.warning("UAG_SCHEMA_MISSING | %s", path)
+                continue
+
+            entry = self._compile(path)
+            with self._lock:
+                self._entries[str(path)] = entry
+
+    def get(self, path: str | Path) -> Any:
+        """
+        Compiled validator for a schema file (reloaded if the file changed).
+        """
+        key = str(path)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry.validator
+
+        with self._lock:
+            entry = self._entries.get(key)
+            p = Path(path)
+
+            if entry is not None:
+                try:
+                    changed = self._signature(p) != entry.signature
+                except OSError:
+                    changed = False  # файл пропал — работаем на последней версии
+
+                if not changed:
+                    entry.checked_at = now
+                    return entry.validator
+
+            entry = self._compile(p)
+            self._entries[key] = entry
+            return entry.validator
+
+    # ------------------------------------------------------------------
+    # Validation API
+    # ------------------------------------------------------------------
+    def is_valid(self, path: str | Path, instance: Any) -> bool:
+        return self.get(path).is_valid(instance)
+
+    def iter_errors(self, path: str | Path, instance: Any) -> Iterator[ValidationError]:
+        return self.get(path).iter_errors(instance)
+
+    def best_error(self, path: str | Path, instance: Any) -> Optional[ValidationError]:
+        """
+        Most relevant error (same choice as jsonschema.validate), or None.
+        """
+        validator = self.get(path)
+        if validator.is_valid(instance):
+            return None
+        return best_match(validator.iter_errors(instance))
+
+    def invalidate(self, path: Optional[str | Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(path), None)
+
+
+# Global registry
+schema_registry = SchemaRegistry()
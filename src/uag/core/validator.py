@@ -1,14 +1,16 @@
-import json
 from pathlib import Path
-from jsonschema import validate, ValidationError
 
 from src.uag.core.access_controller import check_agent_permission
 from src.uag.core.audit import log_decision
-from src.agents.loader import load_agent_spec
+from src.uag.core.schema_registry import schema_registry
+from src.uag.core.agent_specs import agent_specs
 
 
 SCHEMA_PATH = Path("contracts/uag/uag_request_schema.json")
 
+# компиляция + check_schema один раз при старте
+schema_registry.preload(SCHEMA_PATH)
+
 
 class UAGValidationError(Exception):
     pass
@@ -25,13 +27,9 @@ def validate_request(payload: dict) -> dict:
     # --------------------------------------------------
     # 1. JSON Schema validation
     # --------------------------------------------------
-    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
-        schema = json.load(f)
-
-    try:
-        validate(instance=payload, schema=schema)
-    except ValidationError as e:
-        raise UAGValidationError(f"Schema validation error: {e.message}")
+    error = schema_registry.best_error(SCHEMA_PATH, payload)
+    if error is not None:
+        raise UAGValidationError(f"Schema validation error: {error.message}")
 
     # --------------------------------------------------
     # 2. Agent permission check (AgentSpec)
@@ -42,8 +40,8 @@ def validate_request(payload: dict) -> dict:
     intent = payload.get("intent")
     env = payload.get("env")
 
-    # Загружаем AgentSpec ОДИН РАЗ
-    spec = load_agent_spec(agent_id)
+    # AgentSpec из кэша (тот же view, что в check_agent_permission)
+    spec = agent_specs.get(agent_id)
 
     decision = "ALLOW" if allowed else "DENY"
 
@@ -58,9 +56,9 @@ def validate_request(payload: dict) -> dict:
         "reason": reason,
 
         # Контекст агента
-        "agent_role": spec["role"]["name"],
-        "agent_level": spec["role"]["level"],
-        "agent_spec_version": spec.get("version", "unknown"),
+        "agent_role": spec.role_name,
+        "agent_level": spec.level,
+        "agent_spec_version": spec.version,
     }
 
     log_decision(audit_record)
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from src.audit_api import service
+from src.core.audit.db import AuditDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = AuditDB(str(tmp_path / "audit.db"))
+    yield db
+    db.close()
+
+
+def _fill(db, n):
+    session_id = db.start_session(user_id=1, username="tester")
+    rows = [
+        AuditDB.make_event_row(
+            session_id=session_id,
+            user_id=1,
+            username="tester",
+            event_type="POLICY",
+            action=f"a{i}",
+            decision="DENY" if i % 3 == 0 else "ALLOW",
+            policy="DEMO" if i % 2 else "TRUST",
+            payload={"i": i, "text": "привет"},
+        )
+        for i in range(n)
+    ]
+    db.log_events_many(rows)
+    return session_id
+
+
+def test_keyset_pages_cover_timeline_once(db):
+    session_id = _fill(db, 25)
+
+    seen, cursor = [], 0
+    while True:
+        page = service.get_timeline_page(db, session_id, cursor, limit=10)
+        seen += [e["payload"]["i"] for e in page["items"]]
+        if page["next_cursor"] is None:
+            break
+        cursor = page["next_cursor"]
+
+    assert seen == list(range(25))
+
+
+def test_ndjson_export_streams_valid_lines(db):
+    session_id = _fill(db, 7)
+
+    lines = list(service.iter_session_ndjson(db, session_id, page_size=3))
+
+    assert [json.loads(line)["payload"]["i"] for line in lines] == list(range(7))
+    assert json.loads(lines[0])["payload"]["text"] == "привет"
+
+
+def test_why_summary_is_aggregated_in_sql(db):
+    session_id = _fill(db, 9)
+
+    summary = service.explain_session(db, session_id)
+
+    assert summary["total_events"] == 9
+    assert summary["denies"] == 3
+    assert summary["allows"] == 6
+    assert sorted(summary["policies_triggered"]) == ["DEMO", "TRUST"]
+
+
+def test_full_timeline_is_not_truncated_to_one_page(db, monkeypatch):
+    monkeypatch.setattr(service, "DEFAULT_PAGE_SIZE", 4)
+    session_id = _fill(db, 10)
+
+    timeline = service.get_session_timeline(db, session_id)
+
+    assert [e["payload"]["i"] for e in timeline] == list(range(10))
+
+
+def test_timeline_is_ordered_by_ts_across_pages(db):
+    session_id = db.start_session(user_id=1, username="tester")
+    # inline write after a batch: higher id, earlier ts
+    stamps = ["2026-01-01T00:00:03", "2026-01-01T00:00:01", "2026-01-01T00:00:02"]
+    db.log_events_many([
+        AuditDB.make_event_row(
+            session_id=session_id,
+            user_id=1,
+            username="tester",
+            event_type="POLICY",
+            action=ts[-2:],
+            ts=ts,
+        )
+        for ts in stamps
+    ])
+
+    first = service.get_timeline_page(db, session_id, limit=2)
+    rest = service.get_timeline_page(db, session_id, first["next_cursor"], limit=2)
+
+    assert [e["action"] for e in first["items"] + rest["items"]] == ["01", "02", "03"]
+    assert rest["next_cursor"] is None
+
+
+def test_session_has_events(db):
+    session_id = _fill(db, 1)
+
+    assert service.session_has_events(db, session_id)
+    assert not service.session_has_events(db, "unknown")
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+
+from src.bot.ai import categorizer as cat
+from src.bot.ai.categorizer import (
+    PATH_CLASSIFIER,
+    PATH_DEFAULT,
+    PATH_KEYWORDS,
+    PATH_LLM,
+    SOURCE_USER,
+    NaiveBayesClassifier,
+    TaskCategorizer,
+    keyword_guess,
+)
+from src.bot.ai.task_store import TaskRepository
+
+
+def _categorizer(**kwargs):
+    c = TaskCategorizer(min_training_tasks=4, **kwargs)
+    c._trained_at = float("inf")  # без автотренировки из глобального task_store
+    return c
+
+
+def test_keywords_answer_confident_tasks_without_llm(monkeypatch):
+    async def no_llm(prompt):
+        raise AssertionError("LLM must not be called")
+
+    monkeypatch.setattr("src.bot.ai.llm_router.generate_answer", no_llm)
+    c = _categorizer()
+
+    decision = asyncio.run(c.categorize("Залить фундамент и заказать бетон"))
+
+    assert decision.category == "build"
+    assert decision.path == PATH_KEYWORDS
+    assert decision.confidence >= c.threshold
+    assert c.stats()["paths"] == {PATH_KEYWORDS: 1}
+
+
+def test_ambiguous_text_falls_back_to_llm(monkeypatch):
+    prompts = []
+
+    async def fake_route(prompt):
+        prompts.append(prompt)
+        return "OSINT"
+
+    monkeypatch.setattr("src.bot.ai.llm_router.generate_answer", fake_route)
+    c = _categorizer()
+
+    decision = asyncio.run(c.categorize("что-то непонятное"))
+
+    assert (decision.category, decision.path, decision.confidence) == ("osint", PATH_LLM, None)
+    assert len(prompts) == 1
+
+
+def test_unparseable_llm_answer_uses_default(monkeypatch):
+    async def fake_route(prompt):
+        return "не знаю"
+
+    monkeypatch.setattr("src.bot.ai.llm_router.generate_answer", fake_route)
+
+    decision = asyncio.run(_categorizer().categorize("???"))
+    assert (decision.category, decision.path) == (cat.DEFAULT_CATEGORY, PATH_DEFAULT)
+
+
+def test_llm_answer_must_name_exactly_one_category():
+    assert cat.parse_category(" OSINT.\n") == "osint"
+    assert cat.parse_category("Категория: build") == "build"
+    assert cat.parse_category("llmish marketing") is None        # только целые слова
+    assert cat.parse_category("market, osint, analysis") is None  # эхо списка
+
+
+def test_llm_errors_and_echoes_are_not_stored_as_llm_labels(tmp_path, monkeypatch):
+    from src.bot.ai import task_engine
+
+    repo = TaskRepository(str(tmp_path / "tasks.db"), legacy_json=None)
+    monkeypatch.setattr(task_engine, "task_store", repo)
+    monkeypatch.setattr(task_engine, "task_categorizer", _categorizer())
+
+    async def failing(prompt):
+        raise RuntimeError("llm provider down")
+
+    async def echo(prompt):
+        return prompt
+
+    for fake in (failing, echo):
+        monkeypatch.setattr("src.bot.ai.llm_router.generate_answer", fake)
+        task = asyncio.run(task_engine.add_task("что-то непонятное", user_id=1))
+        assert (task["category"], task["category_source"]) == (cat.DEFAULT_CATEGORY, PATH_DEFAULT)
+
+    assert repo.labeled(cat.TRAINING_SOURCES, 100) == []
+    repo.close()
+
+
+def test_mixed_keywords_are_not_confident():
+    category, confidence = keyword_guess("проанализировать цены")
+    assert confidence < cat.CONFIDENCE_THRESHOLD
+
+
+def test_classifier_trained_from_task_store(tmp_path):
+    repo = TaskRepository(str(tmp_path / "tasks.db"), legacy_json=None)
+    for text in ("пробить владельца номера", "пробить владельца сайта", "пробить адрес владельца"):
+        repo.add(text, "osint", category_source=PATH_LLM)
+    for text in ("рецепт борща", "рецепт пирога", "рецепт салата"):
+        repo.add(text, "llm", category_source=SOURCE_USER)
+
+    c = _categorizer()
+    assert c.train_from_store(repo)
+
+    decision = c.categorize_local("пробить владельца машины")
+    assert decision is not None
+    assert (decision.category, decision.path) == ("osint", PATH_CLASSIFIER)
+    repo.close()
+
+
+def test_own_labels_are_not_training_data(tmp_path):
+    repo = TaskRepository(str(tmp_path / "tasks.db"), legacy_json=None)
+    for text in ("пробить владельца номера", "пробить владельца сайта"):
+        repo.add(text, "osint", category_source=PATH_LLM)
+    for text in ("пробить владельца машины", "пробить владельца дома", "пробить адрес"):
+        repo.add(text, "market", category_source=PATH_CLASSIFIER)   # своя ошибка
+    repo.add("рецепт борща", "llm", category_source=PATH_KEYWORDS)
+    repo.add("рецепт пирога", "llm")                                # до миграции
+
+    assert repo.labeled((PATH_LLM, SOURCE_USER), 100) == [
+        ("пробить владельца сайта", "osint"),
+        ("пробить владельца номера", "osint"),
+    ]
+    assert not _categorizer().train_from_store(repo)               # 2 < min_training_tasks
+    repo.close()
+
+
+def test_retrain_runs_in_background(monkeypatch):
+    c = TaskCategorizer(min_training_tasks=1, retrain_interval=3600)
+    gate = threading.Event()
+    trained = []
+
+    def slow_retrain():
+        gate.wait(2)
+        trained.append(1)
+
+    monkeypatch.setattr(c, "_retrain", slow_retrain)
+
+    async def main():
+        first = await c.categorize("Залить фундамент и заказать бетон")   # не ждёт обучения
+        second = await c.categorize("Залить фундамент")
+        gate.set()
+        await c._refresh
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first.category == second.category == "build"
+    assert trained == [1]                                           # одно обучение на двоих
+
+
+def test_classifier_needs_enough_samples():
+    c = _categorizer()
+    assert not c.train([("a task", "market")])
+    assert c.classifier.predict("a task") is None
+
+
+def test_naive_bayes_probabilities():
+    model = NaiveBayesClassifier().fit([
+        ("котлован кран", "build"),
+        ("котлован экскаватор", "build"),
+        ("промпт модель", "llm"),
+    ])
+    category, p = model.predict("экскаватор")
+    assert category == "build"
+    assert 0.5 < p <= 1.0
@@ -0,0 +1,150 @@
+import pytest
+
+from src.bot.utils.chat_digest import EDIT, SEND, DigestPlanner, build_lines
+from src.bot.utils.rate_limit import TokenBucket
+
+
+def _event(agent_id, message, role="store", level="INFO"):
+    return {
+        "timestamp_utc": "2026-01-01T12:00:01",
+        "source": agent_id,
+        "agent_id": agent_id,
+        "agent_role": role,
+        "level": level,
+        "message": message,
+    }
+
+
+def _planner(global_burst=100, chat_burst=100, **kwargs):
+    return DigestPlanner(
+        global_bucket=TokenBucket(0, global_burst),
+        chat_rate=0,
+        chat_burst=chat_burst,
+        **kwargs,
+    )
+
+
+def test_burst_is_coalesced_into_one_line_per_message():
+    events = [_event("master", "🧠 Начинаю подбор\nМатериал: `brick`", role="master")]
+    events += [_event(f"store_{i}", "📦 Отправляю прайс-лист") for i in range(1, 6)]
+    events.append(_event("master", "❌ Нет предложений", role="master", level="WARN"))
+
+    lines = build_lines(events)
+
+    assert lines == [
+        "12:00:01 [master] 🧠 Начинаю подбор · Материал: `brick`",
+        "12:00:01 [store ×5: store_1, store_2, store_3, +2] 📦 Отправляю прайс-лист",
+        "12:00:01 ⚠️ [master] ❌ Нет предложений",
+    ]
+
+
+def test_live_message_is_edited_in_place():
+    planner = _planner()
+
+    planner.add(1, [_event("s1", "a")])
+    first = planner.next_action(1, now=0.0)
+    assert first.kind == SEND
+    planner.confirm(first, message_id=42, now=0.0)
+
+    planner.add(1, [_event("s2", "b")])
+    second = planner.next_action(1, now=1.0)
+
+    assert (second.kind, second.message_id) == (EDIT, 42)
+    assert second.text.splitlines()[1:] == ["12:00:01 [s1] a", "12:00:01 [s2] b"]
+    planner.confirm(second, now=1.0)
+    assert planner.stats["sent"] == 1 and planner.stats["edited"] == 1
+
+
+def test_new_message_when_live_is_full_or_stale():
+    planner = _planner(max_lines=2, live_ttl=10.0)
+
+    planner.add(1, [_event("s1", "a")])
+    planner.confirm(planner.next_action(1, now=0.0), message_id=1, now=0.0)
+
+    planner.add(1, [_event("s2", "b"), _event("s3", "c")])
+    assert planner.next_action(1, now=1.0).kind == SEND      # 3 lines > max_lines
+
+    planner = _planner(live_ttl=10.0)
+    planner.add(1, [_event("s1", "a")])
+    planner.confirm(planner.next_action(1, now=0.0), message_id=1, now=0.0)
+    planner.add(1, [_event("s2", "b")])
+    assert planner.next_action(1, now=11.0).kind == SEND     # stale
+
+
+def test_quota_defers_and_merges_pending_lines():
+    planner = _planner(global_burst=1)
+
+    planner.add(1, [_event("s1", "a")])
+    planner.add(2, [_event("s1", "a")])
+
+    assert planner.next_action(1, now=0.0) is not None
+    assert planner.next_action(2, now=0.0) is None           # global quota spent
+    assert planner.stats["deferred"] == 1
+
+    planner.global_bucket.reset()
+    planner.add(2, [_event("s2", "b")])
+    action = planner.next_action(2, now=0.0)
+    assert action.new_lines == ["12:00:01 [s1] a", "12:00:01 [s2] b"]
+
+
+def test_per_chat_quota_is_independent():
+    planner = _planner(chat_burst=1)
+
+    planner.add(1, [_event("s1", "a")])
+    planner.confirm(planner.next_action(1, now=0.0), message_id=1, now=0.0)
+    planner.add(1, [_event("s1", "b")])
+    planner.add(2, [_event("s1", "b")])
+
+    assert planner.next_action(1, now=0.0) is None
+    assert planner.next_action(2, now=0.0) is not None
+
+
+def test_retry_requeues_lines_and_drops_lost_live_message():
+    planner = _planner()
+
+    planner.add(1, [_event("s1", "a")])
+    planner.confirm(planner.next_action(1, now=0.0), message_id=7, now=0.0)
+
+    planner.add(1, [_event("s2", "b")])
+    edit = planner.next_action(1, now=1.0)
+    planner.retry(edit, 5.0, lost_live=True, now=1.0)
+
+    assert planner.next_action(1, now=2.0) is None           # RetryAfter pause
+    action = planner.next_action(1, now=6.5)
+    assert action.kind == SEND and action.new_lines == ["12:00:01 [s2] b"]
+
+
+def test_skipped_header_survives_edits():
+    planner = _planner(max_pending=2)
+
+    planner.add(1, [_event(f"s{i}", f"m{i}") for i in range(4)])      # 2 lines overflow
+    first = planner.next_action(1, now=0.0)
+    assert first.text.splitlines()[0] == "🛰 System Chat (+2 пропущено)"
+    planner.confirm(first, message_id=5, now=0.0)
+
+    planner.add(1, [_event("s9", "late")])
+    edit = planner.next_action(1, now=1.0)
+    assert edit.kind == EDIT
+    assert edit.text.splitlines()[0] == "🛰 System Chat (+2 пропущено)"
+
+    planner.confirm(edit, now=1.0)
+    planner.add(1, [_event(f"t{i}", f"n{i}") for i in range(3)])    # +1 more overflow
+    again = planner.next_action(1, now=2.0)
+    assert again.text.splitlines()[0] == "🛰 System Chat (+3 пропущено)"
+
+
+def test_rejected_send_is_dropped_not_made_live():
+    planner = _planner()
+
+    planner.add(1, [_event("s1", "a"), _event("s2", "b")])
+    send = planner.next_action(1, now=0.0)
+
+    with pytest.raises(ValueError):
+        planner.confirm(send, now=0.0)                       # SEND без message_id
+
+    planner.drop(send)
+    assert planner.stats["skipped"] == 2
+    assert planner.stats["sent"] == 0 and not planner.has_pending()
+
+    planner.add(1, [_event("s3", "c")])
+    assert planner.next_action(1, now=1.0).kind == SEND     # нет live-сообщения с id=None
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from src.bot.ai import task_engine
+from src.bot.ai.task_store import TaskRepository
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = TaskRepository(str(tmp_path / "tasks.db"), legacy_json=None)
+    monkeypatch.setattr(task_engine, "task_store", store)
+
+    async def fake_generate(prompt, **kwargs):
+        return f"ok: {prompt}"
+
+    monkeypatch.setattr(task_engine, "generate_answer", fake_generate)
+    yield store
+    store.close()
+
+
+def test_new_and_failed_tasks_run(store):
+    new_id = store.add("a", "llm")["id"]
+    failed_id = store.add("b", "llm")["id"]
+    store.claim(failed_id)
+    store.fail(failed_id, "boom")
+
+    for task_id in (new_id, failed_id):
+        result, err = asyncio.run(task_engine.run_task(task_id))
+        assert err is None and result.startswith("ok:")
+        assert store.get(task_id)["status"] == "done"
+
+
+@pytest.mark.parametrize(
+    "status, message",
+    [("done", "уже выполнена"), ("queued", "в очереди"), ("cancelled", "отменена"), ("running", "уже выполняется")],
+)
+def test_other_statuses_are_not_rerun(store, status, message):
+    task_id = store.add("a", "llm")["id"]
+    store.transition(task_id, status)
+    before = store.get(task_id)
+
+    result, err = asyncio.run(task_engine.run_task(task_id))
+
+    assert result is None and message in err
+    assert store.get(task_id) == before
+
+
+def test_llm_failure_marks_task_failed_and_rerunnable(store, monkeypatch):
+    from src.bot.ai.llm_router import AllProvidersFailed
+
+    task_id = store.add("a", "llm")["id"]
+
+    async def down(prompt, **kwargs):
+        raise AllProvidersFailed({"llama": RuntimeError("down")})
+
+    monkeypatch.setattr(task_engine, "generate_answer", down)
+    result, err = asyncio.run(task_engine.run_task(task_id))
+
+    assert result is None and "down" in err
+    assert store.get(task_id)["status"] == "error"
+
+    async def ok(prompt, **kwargs):
+        return "fixed"
+
+    monkeypatch.setattr(task_engine, "generate_answer", ok)
+    assert asyncio.run(task_engine.run_task(task_id)) == ("fixed", None)
+    assert store.get(task_id)["status"] == "done"
+
+
+def test_unknown_task(store):
+    assert asyncio.run(task_engine.run_task(42)) == (None, "Задача не найдена")
+
+
+def test_add_task_records_category_source(store, monkeypatch):
+    async def no_llm(prompt):
+        raise AssertionError("LLM must not be called")
+
+    monkeypatch.setattr("src.bot.ai.llm_router.generate_answer", no_llm)
+
+    explicit = asyncio.run(task_engine.add_task("что-то", user_id=1, category="market"))
+    detected = asyncio.run(task_engine.add_task("Залить фундамент и заказать бетон", user_id=1))
+
+    assert (explicit["category"], explicit["category_source"]) == ("market", "user")
+    assert (detected["category"], detected["category_source"]) == ("build", "keywords")
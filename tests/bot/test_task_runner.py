@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+from src.bot.ai.task_runner import TaskRunner
+from src.bot.ai.task_store import TaskRepository
+
+
+def _store(tmp_path):
+    return TaskRepository(str(tmp_path / "tasks.db"), legacy_json=None)
+
+
+def test_bulk_run_is_parallel(tmp_path):
+    store = _store(tmp_path)
+    for i in range(4):
+        store.add(f"t{i}", "llm")
+
+    async def execute(task):
+        await asyncio.sleep(0.2)
+        return f"done {task['id']}"
+
+    runner = TaskRunner(store, execute, concurrency=4)
+    assert runner.enqueue_new() == 4
+
+    started = time.monotonic()
+    outcomes = asyncio.run(runner.run_pending())
+
+    assert time.monotonic() - started < 0.6     # ~max, а не сумма
+    assert {s for s, _ in outcomes.values()} == {"done"}
+    assert store.get(1)["result"] == "done 1"
+    store.close()
+
+
+def test_priority_by_category(tmp_path):
+    store = _store(tmp_path)
+    store.add("chat", "llm")
+    store.add("foundation", "build")
+    store.add("competitors", "market")
+    order = []
+
+    async def execute(task):
+        order.append(task["category"])
+        return "ok"
+
+    runner = TaskRunner(store, execute, concurrency=1)
+    runner.enqueue_new()
+    asyncio.run(runner.run_pending())
+
+    assert order == ["build", "market", "llm"]
+    store.close()
+
+
+def test_retry_with_backoff_then_success_and_timeout_failure(tmp_path):
+    store = _store(tmp_path)
+    flaky_id = store.add("flaky", "llm")["id"]
+    slow_id = store.add("slow", "llm")["id"]
+    calls = {}
+
+    async def execute(task):
+        calls[task["id"]] = calls.get(task["id"], 0) + 1
+        if task["id"] == slow_id:
+            await asyncio.sleep(1)
+        if calls[task["id"]] == 1:
+            raise RuntimeError("model busy")
+        return "ok"
+
+    runner = TaskRunner(store, execute, concurrency=2, max_attempts=2, timeout=0.05, backoff=0.01)
+    runner.enqueue_new()
+    outcomes = asyncio.run(runner.run_pending())
+
+    assert outcomes[flaky_id] == ("done", "ok")
+    assert outcomes[slow_id] == ("error", "timeout")
+    assert store.get(flaky_id)["attempts"] == 2
+    assert store.get(slow_id)["status"] == "error"
+    store.close()
+
+
+def test_cancel_running_task(tmp_path):
+    store = _store(tmp_path)
+    task_id = store.add("long", "llm")["id"]
+    other_id = store.add("short", "llm")["id"]
+
+    async def execute(task):
+        await asyncio.sleep(0.3 if task["id"] == task_id else 0.01)
+        return "ok"
+
+    runner = TaskRunner(store, execute, concurrency=2)
+    runner.enqueue_new()
+
+    async def main():
+        run = asyncio.ensure_future(runner.run_pending())
+        await asyncio.sleep(0.05)
+        assert runner.cancel(task_id)
+        return await run
+
+    outcomes = asyncio.run(main())
+    assert outcomes[task_id] == ("cancelled", None)
+    assert outcomes[other_id] == ("done", "ok")
+    assert store.get(task_id)["status"] == "cancelled"
+    store.close()
+
+
+def test_restart_resumes_interrupted_tasks(tmp_path):
+    store = _store(tmp_path)
+    a = store.add("a", "llm")["id"]
+    b = store.add("b", "llm")["id"]
+
+    runner = TaskRunner(store, None, concurrency=1)
+    runner.enqueue_new()
+    store.claim(a, from_statuses=("queued",))   # процесс упал посреди задачи a
+
+    async def execute(task):
+        return "ok"
+
+    restarted = TaskRunner(store, execute, concurrency=2)
+    assert restarted.resume() == 2
+
+    outcomes = asyncio.run(restarted.run_pending())
+    assert set(outcomes) == {a, b}
+    store.close()
+
+
+def test_overlapping_runs_share_one_pool(tmp_path):
+    store = _store(tmp_path)
+    for i in range(6):
+        store.add(f"t{i}", "llm")
+    active, peak = 0, 0
+
+    async def execute(task):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return "ok"
+
+    runner = TaskRunner(store, execute, concurrency=2)
+
+    async def main():
+        runner.enqueue(store.list(status="new")[:3])
+        first = asyncio.ensure_future(runner.run_pending())     # resume
+        await asyncio.sleep(0)
+        runner.enqueue_new()
+        second = await runner.run_pending()                     # /taskrunall
+        return await first, second
+
+    first, second = asyncio.run(main())
+
+    assert peak == 2
+    assert set(first) == {1, 2, 3} and set(second) == {4, 5, 6}
+    assert {s for s, _ in {**first, **second}.values()} == {"done"}
+    store.close()
+
+
+def test_stop_requeues_running_tasks(tmp_path):
+    store = _store(tmp_path)
+    task_id = store.add("long", "llm")["id"]
+
+    async def execute(task):
+        await asyncio.sleep(10)
+
+    runner = TaskRunner(store, execute, concurrency=1)
+    runner.enqueue_new()
+
+    async def main():
+        run = asyncio.ensure_future(runner.run_pending())
+        await asyncio.sleep(0.05)
+        await runner.stop()
+        return await asyncio.gather(run, return_exceptions=True)
+
+    (result,) = asyncio.run(main())
+    assert isinstance(result, asyncio.CancelledError)
+    assert store.get(task_id)["status"] == "queued"
+    store.close()
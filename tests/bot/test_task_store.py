@@ -0,0 +1,75 @@
+import json
+import threading
+
+from src.bot.ai.task_store import TaskRepository
+
+
+def _repo(tmp_path, legacy=None):
+    return TaskRepository(str(tmp_path / "tasks.db"), legacy_json=legacy)
+
+
+def test_add_get_and_filtered_list(tmp_path):
+    repo = _repo(tmp_path)
+
+    a = repo.add("рынок", "market", user_id=1)
+    b = repo.add("фундамент", "build", user_id=2)
+
+    assert (a["id"], b["id"]) == (1, 2)
+    assert repo.get(b["id"])["category"] == "build"
+    assert [t["id"] for t in repo.list(category="market")] == [1]
+    assert [t["id"] for t in repo.list(user_id=2, status="new")] == [2]
+    repo.close()
+
+
+def test_status_transitions_are_atomic(tmp_path):
+    repo = _repo(tmp_path)
+    task_id = repo.add("x", "llm")["id"]
+
+    claims = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        claims.append(repo.claim(task_id))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # ровно один обработчик получил задачу
+    assert sum(1 for c in claims if c is not None) == 1
+    assert repo.complete(task_id, "ok")
+    assert not repo.complete(task_id, "again")   # уже не running
+    assert repo.get(task_id)["result"] == "ok"
+    repo.close()
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "tasks.json"
+    legacy.write_text(json.dumps([
+        {"id": 3, "task": "old", "category": "osint", "status": "done", "result": "r"},
+        {"id": 7, "task": "older", "category": "llm", "status": "new", "result": None},
+    ]), encoding="utf-8")
+
+    repo = _repo(tmp_path, legacy=str(legacy))
+    assert [t["id"] for t in repo.list()] == [3, 7]
+    assert repo.add("new", "llm")["id"] == 8   # AUTOINCREMENT продолжает после импорта
+    assert repo.import_json(str(legacy)) == 0
+    repo.close()
+
+    reopened = _repo(tmp_path, legacy=str(legacy))
+    assert len(reopened.list()) == 3
+    reopened.close()
+
+
+def test_status_query_uses_index(tmp_path):
+    repo = _repo(tmp_path)
+    with repo._pool.reader() as conn:
+        plan = [r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE status = ? ORDER BY id", ("new",)
+        )]
+    assert any("idx_tasks_status" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+    repo.close()
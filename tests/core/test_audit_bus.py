@@ -0,0 +1,209 @@
+import io
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from src.core.audit.bus import (
+    AuditBus,
+    AuditEvent,
+    AuditSink,
+    JSONLSink,
+    LedgerSink,
+    RingSink,
+    StdoutSink,
+)
+from src.core.audit.ring import AuditRing
+from src.core.audit.writer import AuditWriter
+from src.uag.core.decision_log import DecisionLogWriter
+
+
+class _ListSink(AuditSink):
+    def __init__(self, name, gate=None, **kwargs):
+        super().__init__(name, **kwargs)
+        self.events = []
+        self.gate = gate
+
+    def write(self, batch):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.events.extend(batch)
+
+
+class _FakeDB:
+    def __init__(self, gate=None):
+        self.rows = []
+        self.gate = gate
+
+    def log_events_many(self, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.rows.extend(rows)
+        return len(rows)
+
+
+def _event(i=0, kind="uag", decision="ALLOW"):
+    return AuditEvent(
+        kind,
+        agent_id=f"agent{i}",
+        agent_role="store",
+        action="build_foundation",
+        decision=decision,
+        policy="UAG",
+        reason="ok",
+        extra={"intent": "build_foundation", "env": "dev"},
+    )
+
+
+def test_event_is_serialized_once_for_all_sinks(tmp_path):
+    bus = AuditBus()
+    writer = DecisionLogWriter(tmp_path / "audit.log", compress=False)
+    db = _FakeDB()
+    ledger = AuditWriter(db)
+    bus.add_sink(JSONLSink(writer))
+    bus.add_sink(LedgerSink(ledger))
+
+    event = bus.publish(_event())
+    assert bus.flush(timeout=2)
+    bus.close()
+    writer.close()
+    ledger.close()
+
+    line = (tmp_path / "audit.log").read_text(encoding="utf-8").strip()
+    assert db.rows[0][-1] is event.to_json()
+    assert line == event.to_json()
+
+    record = json.loads(line)
+    assert (record["agent_id"], record["intent"], record["decision"], record["env"]) == (
+        "agent0", "build_foundation", "ALLOW", "dev",
+    )
+    assert db.rows[0][4] == "UAG"
+
+
+def test_sink_is_abstract():
+    with pytest.raises(TypeError):
+        AuditSink("bare")
+
+
+def test_slow_sink_does_not_delay_others():
+    gate = threading.Event()
+    bus = AuditBus()
+    slow = bus.add_sink(_ListSink("slow", gate=gate))
+    fast = bus.add_sink(_ListSink("fast"))
+    inline = bus.add_sink(_ListSink("inline", queued=False))
+
+    started = time.monotonic()
+    for i in range(50):
+        bus.publish(_event(i))
+    assert time.monotonic() - started < 0.5
+
+    assert len(inline.events) == 50                 # immediately, in publish()
+    assert fast.flush(timeout=2)
+    assert len(fast.events) == 50
+    assert not slow.flush(timeout=0.1)
+
+    gate.set()
+    bus.close()
+    assert bus.stats()["slow"]["queue"]["written"] == 50
+
+
+def test_slow_ledger_does_not_delay_publish():
+    gate = threading.Event()
+    ledger = AuditWriter(_FakeDB(gate=gate), max_queue=5, batch_size=1)
+    bus = AuditBus()
+    bus.add_sink(LedgerSink(ledger))
+
+    started = time.monotonic()
+    for i in range(50):
+        bus.publish(_event(i))
+    assert time.monotonic() - started < 0.5       # AuditWriter drops oldest, never waits
+    assert not bus.flush(timeout=0.1)
+
+    gate.set()
+    bus.close()
+    ledger.close()
+
+    stats = bus.stats()["ledger"]["writer"]
+    assert stats["dropped"] > 0
+    assert stats["written"] + stats["dropped"] == 50
+
+
+def test_routing_overflow_and_failure_metrics():
+    class Broken(_ListSink):
+        def write(self, batch):
+            raise OSError("disk full")
+
+    gate = threading.Event()
+    bus = AuditBus()
+    deny_only = bus.add_sink(_ListSink("deny", level="WARN", kinds=("agent",)))
+    sampled = bus.add_sink(_ListSink("sampled", sample_rate=0.5))
+    bus.add_sink(_ListSink("bounded", gate=gate, max_queue=2, batch_size=1))
+    bus.add_sink(Broken("broken"))
+
+    bus.publish(_event(0, kind="agent", decision="ALLOW"))
+    bus.publish(_event(1, kind="agent", decision="DENY"))
+    bus.publish(_event(2, kind="uag", decision="DENY"))
+    for i in range(3, 10):
+        bus.publish(_event(i))
+
+    gate.set()
+    bus.close()
+
+    assert [e.agent_id for e in deny_only.events] == ["agent1"]
+    assert len(sampled.events) == 5
+    stats = bus.stats()
+    assert stats["deny"]["filtered"] == 9
+    assert stats["sampled"]["sampled_out"] == 5
+    assert stats["bounded"]["queue"]["dropped"] > 0
+    assert stats["bounded"]["queue"]["written"] + stats["bounded"]["queue"]["dropped"] == 10
+    assert stats["broken"]["queue"]["failed"] == 10
+
+
+def test_stdout_logs_deny_as_warning(caplog):
+    logger = logging.getLogger("test.audit.bus")
+    bus = AuditBus()
+    bus.add_sink(StdoutSink(logger))
+
+    with caplog.at_level(logging.INFO, logger="test.audit.bus"):
+        bus.publish(_event(0, kind="agent", decision="ALLOW"))
+        bus.publish(_event(1, kind="agent", decision="DENY"))
+        bus.close()
+
+    assert [r.levelno for r in caplog.records] == [logging.INFO, logging.WARNING]
+    assert caplog.records[1].getMessage().startswith("AUDIT agent_id=agent1")
+
+
+def test_stdout_does_not_render_filtered_levels():
+    logger = logging.getLogger("test.audit.bus.quiet")
+    logger.setLevel(logging.WARNING)
+    bus = AuditBus()
+    bus.add_sink(StdoutSink(logger, level=0))
+
+    allow = bus.publish(_event(0, kind="agent", decision="ALLOW"))
+    deny = bus.publish(_event(1, kind="agent", decision="DENY"))
+    bus.close()
+
+    assert allow._text is None
+    assert deny._text is not None
+
+
+def test_ring_sink_is_inline_and_stdout_renders_text():
+    ring = AuditRing(capacity=4)
+    out = io.StringIO()
+    bus = AuditBus()
+    bus.add_sink(RingSink(ring))
+    bus.add_sink(StdoutSink(stream=out))
+
+    event = _event(kind="agent")
+    event.ts = 0.0
+    bus.publish(event)
+
+    assert [r.agent_id for r in ring.latest(5)] == ["agent0"]   # no flush needed
+
+    bus.close()
+    assert out.getvalue() == (
+        "AUDIT agent_id=agent0 agent_role=store decision=ALLOW action=build_foundation "
+        "policy=UAG reason=ok timestamp=1970-01-01T00:00:00\n"
+    )
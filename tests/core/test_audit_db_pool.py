@@ -0,0 +1,69 @@
+import threading
+
+from src.core.audit.db import AuditDB
+
+
+def _log(db, session_id, action):
+    db.log_event(
+        session_id=session_id,
+        user_id=1,
+        username="tester",
+        event_type="UI_EVENT",
+        action=action,
+        decision="INFO",
+        policy="DEMO",
+        payload={"n": action},
+    )
+
+
+def test_connections_are_reused(tmp_path):
+    db = AuditDB(str(tmp_path / "audit.db"), readers=2)
+
+    session_id = db.start_session(user_id=1, username="tester")
+    with db._conn() as first:
+        pass
+    _log(db, session_id, "a")
+    with db._conn() as second:
+        pass
+
+    assert first is second
+    assert db.get_last_session_for_user(1)["session_id"] == session_id
+    assert [e["action"] for e in db.get_session_timeline(session_id)] == ["a"]
+
+    db.close()
+
+
+def test_concurrent_writers_and_readers(tmp_path):
+    db = AuditDB(str(tmp_path / "audit.db"), readers=2)
+    session_id = db.start_session(user_id=1, username="tester")
+
+    def worker(n):
+        for i in range(50):
+            _log(db, session_id, f"{n}-{i}")
+            db.get_events(session_id, limit=5)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(db.get_session_timeline(session_id)) == 200
+
+    db.close()
+
+
+def test_failed_write_is_rolled_back(tmp_path):
+    db = AuditDB(str(tmp_path / "audit.db"))
+    session_id = db.start_session(user_id=1, username="tester")
+
+    try:
+        with db._conn() as conn:
+            conn.execute("UPDATE sessions SET last_state='x' WHERE session_id=?", (session_id,))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert db.get_last_session_for_user(1)["last_state"] is None
+
+    db.close()
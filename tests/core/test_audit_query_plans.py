@@ -0,0 +1,56 @@
+import sqlite3
+
+import pytest
+
+from src.audit_api import service
+from src.core.audit import db as ledger
+from src.core.audit.migrations import MIGRATIONS, apply_migrations, current_version
+
+
+# Every query the ledger runs, with sample parameters
+QUERIES = {
+    "last_session_for_user": (ledger.SQL_LAST_SESSION_FOR_USER, (1,)),
+    "events_tail": (ledger.SQL_EVENTS_TAIL, ("s", 50)),
+    "sessions": (ledger.SQL_SESSIONS, (20,)),
+    "session_timeline": (ledger.SQL_SESSION_TIMELINE, ("s",)),
+    "update_state": (ledger.SQL_UPDATE_STATE, ("dashboard", "s")),
+    "api_list_sessions": (service.SQL_LIST_SESSIONS, (50,)),
+    "api_timeline_first": (service.SQL_TIMELINE_FIRST, ("s", 500)),
+    "api_timeline_page": (service.SQL_TIMELINE_PAGE, ("s", 1, 500)),
+    "api_session_has_events": (service.SQL_SESSION_HAS_EVENTS, ("s",)),
+    "api_decision_counts": (service.SQL_DECISION_COUNTS, ("s",)),
+    "api_distinct_policies": (service.SQL_DISTINCT_POLICIES, ("s",)),
+}
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = ledger.AuditDB(str(tmp_path / "audit.db"))
+    yield db
+    db.close()
+
+
+def _plan(db, sql, params):
+    with db._read() as conn:
+        return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+@pytest.mark.parametrize("name", sorted(QUERIES))
+def test_query_uses_index_without_temp_sort(db, name):
+    sql, params = QUERIES[name]
+    plan = _plan(db, sql, params)
+
+    for step in plan:
+        assert "TEMP B-TREE" not in step, f"{name}: {plan}"
+        if step.startswith("SCAN "):
+            assert "USING" in step and "INDEX" in step, f"{name}: full scan {plan}"
+
+
+def test_migrations_are_versioned_and_idempotent(tmp_path):
+    conn = sqlite3.connect(tmp_path / "audit.db")
+
+    assert apply_migrations(conn) == [m[0] for m in MIGRATIONS]
+    assert current_version(conn) == MIGRATIONS[-1][0]
+    assert apply_migrations(conn) == []
+
+    conn.close()
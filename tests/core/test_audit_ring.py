@@ -0,0 +1,69 @@
+from src.core import audit_log
+from src.core.audit.ring import AuditRing
+
+
+def _append(ring, i, agent="a1", decision="ALLOW", policy=None):
+    return ring.append(
+        ts=1_700_000_000.0 + i,
+        agent_id=agent,
+        agent_role="store",
+        action=f"act{i}",
+        decision=decision,
+        policy=policy,
+    )
+
+
+def test_ring_is_bounded_and_keeps_latest():
+    ring = AuditRing(capacity=3)
+    for i in range(10):
+        _append(ring, i)
+
+    assert len(ring) == 3
+    assert [r.action for r in ring.latest(10)] == ["act9", "act8", "act7"]
+    assert ring.stats()["evictions"] == 7
+
+
+def test_indexes_stay_consistent_on_eviction():
+    ring = AuditRing(capacity=4)
+    _append(ring, 0, agent="x", decision="DENY", policy="P1")
+    for i in range(1, 4):
+        _append(ring, i, agent="y")
+
+    assert ring.count("agent_id", "x") == 1
+
+    _append(ring, 4, agent="y")          # evicts the only "x" record
+
+    assert ring.count("agent_id", "x") == 0
+    assert ring.count("decision", "DENY") == 0
+    assert ring.latest(5, policy="P1") == []
+    assert ring.count("agent_id", "y") == 4
+
+
+def test_last_n_deny_for_agent():
+    ring = AuditRing(capacity=100)
+    for i in range(30):
+        _append(ring, i, agent="x" if i % 2 else "y", decision="DENY" if i % 3 == 0 else "ALLOW")
+
+    records = ring.latest(3, agent_id="x", decision="DENY")
+
+    assert [r.action for r in records] == ["act27", "act21", "act15"]
+    assert all(r.agent_id == "x" and r.decision == "DENY" for r in records)
+
+
+def test_audit_log_api_is_compatible(monkeypatch):
+    ring = AuditRing(capacity=5)
+    monkeypatch.setattr(audit_log, "_AUDIT_EVENTS", ring)
+    monkeypatch.setattr(audit_log.RING_SINK, "ring", ring)
+
+    for i in range(7):
+        audit_log.record_event(
+            agent_id="m", agent_role="master", action=f"a{i}",
+            decision="DENY" if i == 6 else "ALLOW", policy="P",
+        )
+
+    events = audit_log.get_events(limit=2)
+    assert [e["action"] for e in events] == ["a6", "a5"]
+    assert set(events[0]) == {
+        "timestamp_utc", "agent_id", "agent_role", "action", "decision", "policy", "reason",
+    }
+    assert [e["action"] for e in audit_log.query_events(agent_id="m", decision="DENY")] == ["a6"]
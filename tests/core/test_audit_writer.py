@@ -0,0 +1,81 @@
+from src.core.audit.db import AuditDB
+from src.core.audit.writer import AuditWriter, OVERFLOW_DROP_NEWEST
+
+
+def _event(writer, session_id, action):
+    return writer.log_event(
+        session_id=session_id,
+        user_id=1,
+        username="tester",
+        event_type="POLICY",
+        action=action,
+        decision="ALLOW",
+    )
+
+
+def test_group_commit_and_flush(tmp_path):
+    db = AuditDB(str(tmp_path / "audit.db"))
+    session_id = db.start_session(user_id=1, username="tester")
+    writer = AuditWriter(db, batch_size=10, flush_interval_ms=1000)
+
+    for i in range(25):
+        _event(writer, session_id, f"a{i}")
+
+    assert writer.flush(timeout=5)
+
+    actions = [e["action"] for e in db.get_session_timeline(session_id)]
+    assert actions == [f"a{i}" for i in range(25)]
+    assert writer.stats()["batches"] < 25
+
+    writer.close()
+    db.close()
+
+
+def test_close_drains_queue(tmp_path):
+    db = AuditDB(str(tmp_path / "audit.db"))
+    session_id = db.start_session(user_id=1, username="tester")
+    writer = AuditWriter(db, batch_size=1000, flush_interval_ms=60_000)
+
+    for i in range(5):
+        _event(writer, session_id, f"a{i}")
+    writer.close()
+
+    assert len(db.get_session_timeline(session_id)) == 5
+    db.close()
+
+
+def test_drop_newest_when_full(tmp_path):
+    db = AuditDB(str(tmp_path / "audit.db"))
+    session_id = db.start_session(user_id=1, username="tester")
+    writer = AuditWriter(
+        db,
+        batch_size=1000,
+        flush_interval_ms=60_000,
+        max_queue=3,
+        overflow=OVERFLOW_DROP_NEWEST,
+    )
+
+    results = [_event(writer, session_id, f"a{i}") for i in range(5)]
+
+    assert results == [True, True, True, False, False]
+    assert writer.stats()["dropped"] == 2
+
+    writer.close()
+    assert len(db.get_session_timeline(session_id)) == 3
+    db.close()
+
+
+def test_default_policy_never_blocks_the_producer(tmp_path):
+    db = AuditDB(str(tmp_path / "audit.db"))
+    session_id = db.start_session(user_id=1, username="tester")
+    writer = AuditWriter(db, batch_size=1000, flush_interval_ms=60_000, max_queue=3)
+
+    results = [_event(writer, session_id, f"a{i}") for i in range(5)]
+
+    assert results == [True] * 5
+    assert writer.stats()["dropped"] == 2
+
+    writer.close()
+    actions = [e["action"] for e in db.get_session_timeline(session_id)]
+    assert actions == ["a2", "a3", "a4"]
+    db.close()
@@ -0,0 +1,78 @@
+from src.core import events
+from src.core.events import ERROR, INFO, WARN, EventPipeline, EventSink
+from src.core.system_chat import SystemChat
+
+
+def _counting_renderers(monkeypatch):
+    calls = {"dict": 0, "text": 0}
+    for name, fn in (("dict", events.as_dict), ("text", events.as_text)):
+        def wrapped(event, fn=fn, name=name):
+            calls[name] += 1
+            return fn(event)
+        monkeypatch.setitem(events.RENDERERS, name, wrapped)
+    return calls
+
+
+def test_no_interested_sink_renders_nothing(monkeypatch):
+    calls = _counting_renderers(monkeypatch)
+    pipeline = EventPipeline()
+    pipeline.add_sink(EventSink("errors", lambda e: None, level=ERROR, render="text"))
+
+    assert pipeline.publish("chat", INFO, ("a", "a", "store", "INFO", "x")) is None
+    assert calls == {"dict": 0, "text": 0}
+
+
+def test_each_format_rendered_once_and_filtered_per_sink(monkeypatch):
+    calls = _counting_renderers(monkeypatch)
+    pipeline = EventPipeline()
+    got = {"a": [], "b": [], "warn": []}
+    pipeline.add_sink(EventSink("a", got["a"].append, render="text"))
+    pipeline.add_sink(EventSink("b", got["b"].append, render="text"))
+    pipeline.add_sink(EventSink("warn", got["warn"].append, level=WARN))
+
+    pipeline.publish("chat", INFO, ("m", "m", "master", "INFO", "hi"), ts=0.0)
+
+    assert calls == {"dict": 0, "text": 1}
+    assert got["a"] == got["b"] == [
+        "CHAT source=m agent_id=m agent_role=master level=INFO message=hi "
+        "timestamp=1970-01-01T00:00:00"
+    ]
+    assert got["warn"] == []
+
+
+def test_sampling_is_deterministic():
+    pipeline = EventPipeline()
+    got = []
+    sink = pipeline.add_sink(EventSink("s", got.append, sample_rate=0.25, render="event"))
+
+    for i in range(8):
+        pipeline.publish("chat", INFO, (i,))
+
+    assert len(got) == 2
+    assert sink.stats()["sampled_out"] == 6
+
+
+def test_system_chat_history_and_level_filtered_subscribers():
+    chat = SystemChat()
+    received, failing = [], []
+
+    def broken(event):
+        failing.append(event)
+        raise RuntimeError("boom")
+
+    chat.subscribe(received.append, level="WARN")
+    chat.subscribe(broken)
+
+    chat.emit(source="m", agent_id="m", agent_role="master", message="hi")
+    chat.emit(source="m", agent_id="m", agent_role="master", message="careful", level="WARN")
+
+    assert [e["message"] for e in received] == ["careful"]
+    assert len(failing) == 2
+
+    history = chat.history()
+    assert list(history[0]) == ["timestamp_utc", "source", "agent_id", "agent_role", "level", "message"]
+    assert [e["level"] for e in history] == ["INFO", "WARN"]
+
+    chat.unsubscribe(received.append)
+    chat.emit(source="m", agent_id="m", agent_role="master", message="again", level="ERROR")
+    assert len(received) == 1
@@ -0,0 +1,52 @@
+import random
+
+import yaml
+
+from src.core.policy.compiler import compile_rules, linear_match
+
+
+ACTIONS = ["execute_buy", "execute_", "exec", "demo_activate_pro", "why_dashboard", "menu", ""]
+MODES = ["DEMO", "PROD"]
+
+
+def _random_rule(rng, i):
+    when = {}
+    if rng.random() < 0.5:
+        when["mode"] = rng.choice(MODES)
+    kind = rng.random()
+    if kind < 0.4:
+        when["action"] = rng.choice(ACTIONS)
+    elif kind < 0.8:
+        when["action_prefix"] = rng.choice(["", "e", "exec", "execute_", "demo_", "why"])
+    if rng.random() < 0.2:
+        when["action_prefix"] = rng.choice(["", "exec", "demo_"])
+    if rng.random() < 0.4:
+        when["min_trust"] = rng.randint(0, 5)
+    return {"id": f"R{i}", "when": when, "decision": "DENY", "policy": "T"}
+
+
+def test_repo_rules_match_linear_scan():
+    with open("src/core/policy/rules.yaml", "r", encoding="utf-8") as f:
+        rules = yaml.safe_load(f)["rules"]
+
+    compiled = compile_rules(rules)
+
+    for mode in MODES:
+        for action in ACTIONS:
+            for trust in range(7):
+                expected = linear_match(rules, mode=mode, action=action, trust_level=trust)
+                assert compiled.match(mode=mode, action=action, trust_level=trust) is expected
+
+
+def test_first_match_order_is_preserved():
+    rng = random.Random(42)
+
+    for _ in range(200):
+        rules = [_random_rule(rng, i) for i in range(rng.randint(0, 30))]
+        compiled = compile_rules(rules)
+
+        for mode in MODES:
+            for action in ACTIONS:
+                trust = rng.randint(0, 6)
+                expected = linear_match(rules, mode=mode, action=action, trust_level=trust)
+                assert compiled.match(mode=mode, action=action, trust_level=trust) is expected
@@ -0,0 +1,95 @@
+import pytest
+
+from src.core.policy import engine as engine_module
+from src.core.policy.engine import PolicyEngine
+
+
+RULES_V1 = """
+rules:
+  - id: RULE-DEMO-01
+    when:
+      mode: DEMO
+      action_prefix: "execute_"
+    decision: DENY
+    policy: DEMO
+    message: "blocked"
+"""
+
+RULES_V2 = """
+rules:
+  - id: RULE-DEMO-02
+    when:
+      action_prefix: "execute_"
+    decision: INFO
+    policy: DEMO
+    message: "allowed with notice"
+"""
+
+
+class _RecordingWriter:
+    def __init__(self):
+        self.events = []
+
+    def log_event(self, **kwargs):
+        self.events.append(kwargs)
+        return True
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    rec = _RecordingWriter()
+    monkeypatch.setattr(engine_module, "audit_writer", rec)
+    return rec
+
+
+def _evaluate(engine, action="execute_buy"):
+    return engine.evaluate(
+        session_id="s1",
+        user_id=1,
+        username="tester",
+        action=action,
+        state=None,
+        mode="DEMO",
+        trust_level=0,
+    )
+
+
+def test_cache_hits_still_audit_every_call(tmp_path, writer):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text(RULES_V1, encoding="utf-8")
+    engine = PolicyEngine(str(rules))
+
+    for _ in range(3):
+        assert _evaluate(engine).decision == "DENY"
+
+    assert engine.cache.hits == 2
+    assert engine.cache.misses == 1
+    assert len(writer.events) == 3
+    assert writer.events[0]["payload"]["rules_version"] == engine.version
+
+
+def test_reloaded_rules_never_serve_stale_decisions(tmp_path, writer):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text(RULES_V1, encoding="utf-8")
+    engine = PolicyEngine(str(rules))
+    v1 = engine.version
+
+    assert _evaluate(engine).decision == "DENY"
+
+    rules.write_text(RULES_V2, encoding="utf-8")
+    engine.reload()
+
+    assert engine.version != v1
+    assert _evaluate(engine).decision == "INFO"
+
+
+def test_default_allow_is_cached_and_not_audited(tmp_path, writer):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text(RULES_V1, encoding="utf-8")
+    engine = PolicyEngine(str(rules))
+
+    assert _evaluate(engine, "menu").rule_id == "DEFAULT"
+    assert _evaluate(engine, "menu").rule_id == "DEFAULT"
+
+    assert engine.cache.hits == 1
+    assert writer.events == []
@@ -0,0 +1,45 @@
+from src.core.policy.engine import PolicyEngine
+from src.core.policy.reloader import PolicyReloader
+
+
+RULES = """
+rules:
+  - id: RULE-{n}
+    when:
+      action: "{action}"
+    decision: DENY
+    policy: TEST
+"""
+
+
+def test_reload_swaps_ruleset_on_file_change(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text(RULES.format(n=1, action="a"), encoding="utf-8")
+
+    engine = PolicyEngine(str(path))
+    reloader = PolicyReloader(engine)
+    v1 = engine.version
+
+    assert reloader.check() is False
+
+    path.write_text(RULES.format(n=2, action="bbbb"), encoding="utf-8")
+
+    assert reloader.check() is True
+    assert engine.version != v1
+    assert engine.rules[0]["id"] == "RULE-2"
+    assert reloader.reloads == 1
+
+
+def test_invalid_rules_keep_previous_version(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text(RULES.format(n=1, action="a"), encoding="utf-8")
+
+    engine = PolicyEngine(str(path))
+    reloader = PolicyReloader(engine)
+    v1 = engine.version
+
+    path.write_text("rules: [this is: not: valid", encoding="utf-8")
+
+    assert reloader.check() is False
+    assert engine.version == v1
+    assert reloader.failures == 1
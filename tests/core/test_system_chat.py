@@ -0,0 +1,97 @@
+import asyncio
+
+from src.core.system_chat import (
+    POLICY_COALESCE,
+    POLICY_DROP_NEWEST,
+    POLICY_DROP_OLDEST,
+    SystemChat,
+)
+
+
+def _emit(chat, agent_id="m", role="master", message="hi", level="INFO"):
+    chat.emit(source=agent_id, agent_id=agent_id, agent_role=role, message=message, level=level)
+
+
+def test_history_is_bounded():
+    chat = SystemChat(history_size=3)
+    for i in range(10):
+        _emit(chat, message=str(i))
+
+    assert [e["message"] for e in chat.history()] == ["7", "8", "9"]
+    assert [e["message"] for e in chat.history(limit=1)] == ["9"]
+
+
+def test_async_iterator_with_topic_filters():
+    async def scenario():
+        chat = SystemChat()
+        sub = chat.subscribe_async(roles={"store"}, level="WARN")
+
+        _emit(chat, "s1", "store", "info is filtered")
+        _emit(chat, "m", "master", "other role", level="ERROR")
+        _emit(chat, "s1", "store", "low stock", level="WARN")
+        _emit(chat, "s2", "store", "down", level="ERROR")
+
+        got = []
+        async for event in sub:
+            got.append((event["agent_id"], event["message"]))
+            if len(got) == 2:
+                sub.close()
+        return got
+
+    assert asyncio.run(scenario()) == [("s1", "low stock"), ("s2", "down")]
+
+
+def test_emit_never_runs_loop_subscribers_inline():
+    async def scenario():
+        chat = SystemChat()
+        received = []
+
+        async def slow(event):
+            await asyncio.sleep(0.01)
+            received.append(event["message"])
+
+        chat.subscribe(slow)
+
+        # emit from a worker thread (agents) and from the loop itself
+        await asyncio.to_thread(_emit, chat, "m", "master", "from thread")
+        _emit(chat, message="from loop")
+        assert received == []          # nothing ran during emit
+
+        await asyncio.sleep(0.1)
+        return received
+
+    assert sorted(asyncio.run(scenario())) == ["from loop", "from thread"]
+
+
+def test_queue_policies():
+    async def scenario():
+        chat = SystemChat()
+        oldest = chat.subscribe_async(maxsize=2, policy=POLICY_DROP_OLDEST)
+        newest = chat.subscribe_async(maxsize=2, policy=POLICY_DROP_NEWEST)
+        coalesce = chat.subscribe_async(maxsize=2, policy=POLICY_COALESCE)
+
+        _emit(chat, "a", message="a1")
+        _emit(chat, "b", message="b1")
+        _emit(chat, "a", message="a2")
+
+        return [[e["message"] for e in s.drain()] for s in (oldest, newest, coalesce)], coalesce.stats()
+
+    (oldest, newest, coalesce), stats = asyncio.run(scenario())
+
+    assert oldest == ["b1", "a2"]
+    assert newest == ["a1", "b1"]
+    assert coalesce == ["b1", "a2"]
+    assert stats["coalesced"] == 1 and stats["dropped"] == 0
+
+
+def test_unsubscribe_stops_delivery():
+    chat = SystemChat()
+    received = []
+    chat.subscribe(received.append)
+
+    _emit(chat, message="one")
+    chat.unsubscribe(received.append)
+    _emit(chat, message="two")
+
+    assert [e["message"] for e in received] == ["one"]
+    assert chat.subscriber_stats() == {}
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import subprocess
+import threading
+import sys
+from pathlib import Path
+
+from src.bot.ai.llm_cache import LLMResponseCache, make_key
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_key_normalizes_user_text_and_keeps_params():
+    params = {"max_tokens": 256, "temperature": 0.7}
+
+    k1 = make_key("SYSTEM", "кто   ты?\n", params)
+    k2 = make_key("SYSTEM", " кто ты? ", dict(reversed(params.items())))
+
+    assert k1 == k2
+    assert k1 != make_key("SYSTEM", "кто ты?", {**params, "temperature": 0.2})
+    assert k1 != make_key("OTHER", "кто ты?", params)
+
+
+def test_memory_hits_and_misses():
+    cache = LLMResponseCache(maxsize=2)
+    key = make_key("s", "hello")
+
+    assert cache.get(key) is None
+    cache.put(key, "world")
+    assert cache.get(key) == "world"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["disk"] is False
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    db_path = tmp_path / "llm_cache.db"
+    key = make_key("s", "hello")
+
+    first = LLMResponseCache(db_path=db_path)
+    first.put(key, "world")
+    first.close()
+
+    second = LLMResponseCache(db_path=db_path)
+    assert second.get(key) == "world"   # с диска
+    assert second.get(key) == "world"   # уже из памяти
+
+    stats = second.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 0
+    second.close()
+
+
+def test_async_disk_tier_runs_off_the_event_loop(tmp_path):
+    cache = LLMResponseCache(db_path=tmp_path / "llm_cache.db")
+    key = make_key("s", "hello")
+    threads = []
+
+    for name in ("_get_disk", "_put_disk"):
+        original = getattr(cache, name)
+
+        def spy(*args, original=original):
+            threads.append(threading.get_ident())
+            return original(*args)
+
+        setattr(cache, name, spy)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        await cache.put_async(key, "world")
+        cache.memory.clear()
+        assert await cache.get_async(key) == "world"    # с диска
+        assert await cache.get_async(key) == "world"    # из памяти, без потока
+        return loop_thread
+
+    loop_thread = asyncio.run(main())
+
+    assert len(threads) == 2 and loop_thread not in threads
+    assert cache.stats()["disk_hits"] == 1
+    cache.close()
+
+
+def test_disk_entries_expire(tmp_path):
+    cache = LLMResponseCache(db_path=tmp_path / "llm_cache.db", disk_ttl=-1)
+    key = make_key("s", "hello")
+
+    cache.put(key, "world")
+    cache.memory.clear()
+
+    assert cache.get(key) is None
+    cache.close()
+
+
+def test_import_has_no_policy_or_audit_side_effects(tmp_path):
+    # другой cwd: rules.yaml / data/audit.db не должны понадобиться
+    code = (
+        "import sys, src.bot.ai.llm_cache; "
+        "print(sorted(m for m in sys.modules if m.startswith(('src.core.policy', 'src.core.audit'))))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT), *sys.path])}
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True, check=True
+    )
+
+    assert out.stdout.strip() == "[]"
+    assert not (tmp_path / "data").exists()
@@ -0,0 +1,75 @@
+from src.bot.ai.llm_prefix import PrefixStateCache
+
+
+class FakeLlama:
+    """Minimal llama-cpp surface: tokens in KV = input_ids[:n_tokens]."""
+
+    def __init__(self, n_ctx=64):
+        self.n_ctx = n_ctx
+        self.input_ids = []
+        self.n_tokens = 0
+        self.evaluated = 0
+
+    def tokenize(self, data, add_bos=True):
+        return ([1] if add_bos else []) + list(data)
+
+    def reset(self):
+        self.n_tokens = 0
+
+    def eval(self, tokens):
+        if self.n_tokens + len(tokens) > self.n_ctx:
+            raise ValueError("context overflow")
+        self.input_ids = self.input_ids[: self.n_tokens] + list(tokens)
+        self.n_tokens += len(tokens)
+        self.evaluated += len(tokens)
+
+    def save_state(self):
+        return (list(self.input_ids), self.n_tokens)
+
+    def load_state(self, state):
+        self.input_ids, self.n_tokens = list(state[0]), state[1]
+
+    def complete(self, suffix):
+        # как create_completion после prepare(): дописывает суффикс в KV
+        self.eval(list(suffix.encode("utf-8")))
+
+
+def test_prefix_is_evaluated_once_and_restored_after_other_prompts():
+    cache = PrefixStateCache()
+    model = FakeLlama(n_ctx=256)
+    prefix = "SYSTEM\n\n"
+
+    assert cache.prepare(0, model, prefix)
+    built = model.evaluated
+
+    model.complete("question one")
+    assert cache.prepare(0, model, prefix)      # KV всё ещё начинается с префикса
+    assert model.evaluated == built + len("question one")
+
+    model.reset()
+    model.eval([9, 9, 9])                       # чужой промпт затёр KV
+    assert cache.prepare(0, model, prefix)
+    assert model.input_ids[: model.n_tokens] == model.tokenize(prefix.encode())
+
+    assert cache.stats() == {"slots": 1, "builds": 1, "restores": 1, "reuses": 1}
+
+
+def test_changed_prefix_rebuilds_state():
+    cache = PrefixStateCache()
+    model = FakeLlama(n_ctx=256)
+
+    cache.prepare(0, model, "OLD\n\n")
+    cache.prepare(0, model, "NEW PROMPT\n\n")
+
+    assert cache.builds == 2
+    assert bytes(model.input_ids[1:model.n_tokens]) == b"NEW PROMPT\n\n"
+
+
+def test_prefix_longer_than_context_is_disabled():
+    cache = PrefixStateCache()
+    model = FakeLlama(n_ctx=4)
+
+    assert cache.prepare(0, model, "way too long prefix") is False
+    assert cache.prepare(0, model, "way too long prefix") is False
+    assert cache.builds == 0
+    assert model.n_tokens == 0
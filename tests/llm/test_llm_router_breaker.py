@@ -0,0 +1,138 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.bot.ai.llm_providers import LLMProvider, MockProvider
+from src.bot.ai.llm_router import AllProvidersFailed, LLMRouter
+
+
+class RealProvider(LLMProvider):
+    def __init__(self, name, reply="ok"):
+        self.name = name
+        self.reply = reply
+
+    def ask(self, prompt, **params):
+        return f"[{self.name}] {self.reply}"
+
+
+def _router(**providers):
+    return LLMRouter(providers=providers, default=next(iter(providers)))
+
+
+def test_provider_without_ask_fails_at_construction():
+    class Incomplete(LLMProvider):
+        async def ask_async(self, prompt, **params):
+            return "never"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_circuit_opens_after_repeated_failures():
+    router = _router(a=RealProvider("a"), b=RealProvider("b"))
+    router.providers["a"].ask = MagicMock(side_effect=RuntimeError("down"))
+
+    for i in range(3):
+        assert router.ask(f"q{i}", use_cache=False) == "[b] ok"
+
+    # breaker открыт: упавший провайдер больше не вызывается
+    router.ask("q3", use_cache=False)
+    assert router.providers["a"].ask.call_count == 3
+
+    metrics = router.get_metrics()
+    assert metrics["providers"]["a"]["circuit"] == "open"
+    assert metrics["providers"]["b"]["fallbacks"] == 4
+    assert metrics["error_count"] == 3
+
+
+def test_rate_limited_provider_sheds_to_fallback():
+    router = LLMRouter(
+        providers={"a": RealProvider("a"), "b": RealProvider("b")},
+        default="a",
+        rate_limits={"a": (0.0, 1), "b": (0.0, 10)},
+    )
+
+    assert router.ask("q1", use_cache=False) == "[a] ok"
+    assert router.ask("q2", use_cache=False) == "[b] ok"
+    assert router.get_metrics()["providers"]["a"]["rate_limited"] == 1
+
+
+def test_real_provider_never_falls_back_to_mock():
+    router = _router(a=RealProvider("a"), mock=MockProvider("mock"))
+    router.providers["a"].ask = MagicMock(side_effect=RuntimeError("down"))
+
+    with pytest.raises(AllProvidersFailed) as e:
+        router.ask("q", use_cache=False)
+
+    assert list(e.value.errors) == ["a"]
+
+
+def test_metrics_report_latency_percentiles():
+    router = _router(a=RealProvider("a"))
+    for i in range(5):
+        router.ask(f"q{i}")
+
+    stats = router.get_metrics()["providers"]["a"]
+    assert stats["requests"] == 5
+    assert stats["latency_ms_p50"] is not None
+    assert stats["latency_ms_p99"] >= stats["latency_ms_p50"]
+
+
+def test_identical_async_prompts_are_coalesced():
+    import asyncio
+
+    class SlowProvider(RealProvider):
+        calls = 0
+
+        async def ask_async(self, prompt, **params):
+            SlowProvider.calls += 1
+            await asyncio.sleep(0.05)
+            return self.ask(prompt)
+
+    router = _router(a=SlowProvider("a"))
+
+    async def main():
+        return await asyncio.gather(*(router.ask_async("same") for _ in range(5)))
+
+    assert asyncio.run(main()) == ["[a] ok"] * 5
+    assert SlowProvider.calls == 1
+    assert router.get_metrics()["single_flight"]["coalesced"] == 4
+
+
+def _open_breaker(router, name):
+    router.providers[name].ask = MagicMock(side_effect=RuntimeError("down"))
+    for i in range(3):
+        router.ask(f"fail{i}", use_cache=False)
+    assert router.get_metrics()["providers"][name]["circuit"] == "open"
+    router._breakers[name].cooldown = 0.0     # следующий вызов — пробный
+
+
+def test_rate_limited_probe_does_not_wedge_the_breaker():
+    router = LLMRouter(
+        providers={"a": RealProvider("a"), "b": RealProvider("b")},
+        default="a",
+        rate_limits={"a": (0.0, 3), "b": (0.0, 100)},
+    )
+    _open_breaker(router, "a")
+
+    # пробный запрос отклонён лимитом → half-open слот свободен
+    assert router.ask("q1", use_cache=False) == "[b] ok"
+    router._buckets["a"].reset()
+
+    router.providers["a"].ask = MagicMock(return_value="[a] back")
+    assert router.ask("q2", use_cache=False) == "[a] back"
+    assert router.get_metrics()["providers"]["a"]["circuit"] == "closed"
+
+
+def test_saturated_probe_releases_the_half_open_slot():
+    from src.bot.ai.llm_scheduler import SchedulerBusy
+
+    router = _router(a=RealProvider("a"), b=RealProvider("b"))
+    _open_breaker(router, "a")
+
+    router.providers["a"].ask = MagicMock(side_effect=SchedulerBusy("queue full"))
+    assert router.ask("q1", use_cache=False) == "[b] ok"
+
+    router.providers["a"].ask = MagicMock(return_value="[a] back")
+    assert router.ask("q2", use_cache=False) == "[a] back"
+    assert router.get_metrics()["providers"]["a"]["circuit"] == "closed"
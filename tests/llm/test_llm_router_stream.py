@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.bot.ai import llm_router as router_module
+from src.bot.ai.llm_client import ModelWarmingUp
+from src.bot.ai.llm_providers import LLMProvider
+from src.bot.ai.llm_router import BUSY_MESSAGE, AllProvidersFailed, LLMRouter
+
+
+class StreamingProvider(LLMProvider):
+    def __init__(self, name, chunks=("a", "b"), fail_after=None):
+        self.name = name
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    def ask(self, prompt, **params):
+        return "".join(self.chunks)
+
+    async def ask_stream(self, prompt, **params):
+        for i, chunk in enumerate(self.chunks):
+            if self.fail_after == i:
+                raise RuntimeError("down")
+            yield chunk
+
+
+def _collect(router, prompt="q"):
+    async def main():
+        return [chunk async for chunk in router.ask_stream(prompt)]
+
+    return asyncio.run(main())
+
+
+def test_stream_falls_back_before_first_chunk():
+    router = LLMRouter(
+        providers={"a": StreamingProvider("a", fail_after=0), "b": StreamingProvider("b", ("x", "y"))},
+        default="a",
+    )
+
+    assert _collect(router) == ["x", "y"]
+    stats = router.get_metrics()["providers"]
+    assert stats["a"]["errors"] == 1 and stats["b"]["fallbacks"] == 1
+
+
+def test_stream_error_after_first_chunk_is_raised():
+    router = LLMRouter(
+        providers={"a": StreamingProvider("a", fail_after=1), "b": StreamingProvider("b")},
+        default="a",
+    )
+
+    with pytest.raises(RuntimeError, match="down"):
+        _collect(router)
+
+
+def test_stream_respects_rate_limits():
+    router = LLMRouter(providers={"a": StreamingProvider("a")}, rate_limits={"a": (0.0, 1)})
+
+    assert _collect(router) == ["a", "b"]
+    with pytest.raises(AllProvidersFailed, match="rate limited"):
+        _collect(router)
+
+
+def test_route_maps_skips_to_busy_message(monkeypatch):
+    router = LLMRouter(providers={"a": StreamingProvider("a")}, rate_limits={"a": (0.0, 0)})
+    monkeypatch.setattr(router_module, "llm_router", router)
+
+    async def main():
+        answer = await router_module.route("hi", use_cache=False)
+        streamed = [c async for c in router_module.route_stream("hi", use_cache=False)]
+        return answer, streamed
+
+    assert asyncio.run(main()) == (BUSY_MESSAGE, [BUSY_MESSAGE])
+
+
+def test_async_health_check_runs_inside_the_event_loop():
+    class Warming(StreamingProvider):
+        async def ask_async(self, prompt, **params):
+            raise ModelWarmingUp("loading")
+
+    router = LLMRouter(providers={"a": StreamingProvider("a"), "w": Warming("w")}, default="a")
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            router.health_check()            # sync API refuses to block the loop
+        return await router.health_check_async()
+
+    report = asyncio.run(main())
+    assert report["a"]["status"] == "healthy"
+    assert report["w"] == {"status": "busy", "error": "loading", "circuit": "closed"}
+
+
+def test_identical_route_streams_are_coalesced(monkeypatch):
+    class Slow(StreamingProvider):
+        calls = 0
+
+        async def ask_stream(self, prompt, **params):
+            Slow.calls += 1
+            for chunk in self.chunks:
+                await asyncio.sleep(0.01)
+                yield chunk
+
+    monkeypatch.setattr(router_module, "llm_router", LLMRouter(providers={"a": Slow("a")}))
+    monkeypatch.setattr(router_module, "response_cache", router_module.LLMResponseCache())
+
+    async def read():
+        return [c async for c in router_module.route_stream("same question")]
+
+    async def main():
+        return await asyncio.gather(*(read() for _ in range(3)))
+
+    assert asyncio.run(main()) == [["a", "b"]] * 3
+    assert Slow.calls == 1
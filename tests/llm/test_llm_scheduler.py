@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.bot.ai.llm_scheduler import InferenceScheduler, SchedulerBusy
+
+
+def test_round_robin_across_users():
+    scheduler = InferenceScheduler(workers=1, max_queue=16)
+    gate = threading.Event()
+    order = []
+
+    def job(tag):
+        def run(slot):
+            gate.wait(2)
+            order.append(tag)
+            return tag
+        return run
+
+    async def main():
+        # первый job занимает воркер, остальные копятся в очереди
+        first = asyncio.ensure_future(scheduler.submit(job("warmup"), user_id="x"))
+        await asyncio.sleep(0.05)
+
+        tasks = [
+            asyncio.ensure_future(scheduler.submit(job(f"a{i}"), user_id="a"))
+            for i in range(3)
+        ] + [
+            asyncio.ensure_future(scheduler.submit(job("b0"), user_id="b"))
+        ]
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.gather(first, *tasks)
+
+    asyncio.run(main())
+    scheduler.close()
+
+    # b не ждёт, пока a выберет всю свою очередь
+    assert order == ["warmup", "a0", "b0", "a1", "a2"]
+
+
+def test_full_queue_rejects_fast():
+    scheduler = InferenceScheduler(workers=1, max_queue=1)
+    gate = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(scheduler.submit(lambda slot: gate.wait(2), user_id=1))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(scheduler.submit(lambda slot: "ok", user_id=2))
+        await asyncio.sleep(0)
+
+        with pytest.raises(SchedulerBusy):
+            await scheduler.submit(lambda slot: "late", user_id=3)
+
+        gate.set()
+        return await asyncio.gather(running, queued)
+
+    assert asyncio.run(main()) == [True, "ok"]
+
+    stats = scheduler.stats()
+    scheduler.close()
+
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["max_depth"] == 1
+    assert stats["wait_max"] is not None
+
+
+def test_workers_get_distinct_slots_and_errors_propagate():
+    scheduler = InferenceScheduler(workers=2, max_queue=8)
+    barrier = threading.Barrier(2, timeout=2)
+
+    def slot_of(slot):
+        barrier.wait()   # оба воркера заняты одновременно
+        return slot
+
+    def boom(slot):
+        raise ValueError("model failed")
+
+    async def main():
+        slots = await asyncio.gather(
+            scheduler.submit(slot_of, user_id=1),
+            scheduler.submit(slot_of, user_id=2),
+        )
+        with pytest.raises(ValueError):
+            await scheduler.submit(boom)
+        return slots
+
+    assert sorted(asyncio.run(main())) == [0, 1]
+    assert scheduler.stats()["failed"] == 1
+    scheduler.close()
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+from src.bot.ai.llm_client import LocalLLMClient
+
+
+class FakeLlama:
+    def __init__(self, tokens, gate=None):
+        self.tokens = tokens
+        self.gate = gate
+        self.emitted = 0
+
+    def __call__(self, prompt, stream=False, **params):
+        assert stream is True
+        for token in self.tokens:
+            if self.gate is not None:
+                self.gate.wait(2)
+            self.emitted += 1
+            yield {"choices": [{"text": token}]}
+
+
+def _client(model):
+    client = LocalLLMClient(workers=1, max_queue=4)
+    client._models[0] = model
+    return client
+
+
+def test_stream_yields_chunks_in_order():
+    client = _client(FakeLlama(["При", "вет", "", "!"]))
+
+    async def main():
+        return [chunk async for chunk in client.generate_stream("hi", user_id=1)]
+
+    assert asyncio.run(main()) == ["При", "вет", "!"]
+    client.scheduler.close()
+
+
+def test_consumer_stop_releases_worker():
+    gate = threading.Event()
+    model = FakeLlama([str(i) for i in range(1000)], gate=gate)
+    client = _client(model)
+
+    async def main():
+        gate.set()
+        stream = client.generate_stream("hi")
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.1)
+        return first
+
+    assert asyncio.run(main()) == "0"
+    assert model.emitted < 1000
+    client.scheduler.close()
+
+
+def test_stream_errors_propagate():
+    def broken(prompt, **params):
+        raise RuntimeError("model failed")
+
+    client = _client(broken)
+
+    async def main():
+        return [chunk async for chunk in client.generate_stream("hi")]
+
+    try:
+        asyncio.run(main())
+    except RuntimeError as e:
+        assert "model failed" in str(e)
+    else:
+        raise AssertionError("error was swallowed")
+    finally:
+        client.scheduler.close()
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.bot.ai.llm_client import LocalLLMClient, ModelWarmingUp
+
+
+class SlowLlama:
+    def __init__(self):
+        self.gate = threading.Event()
+        self.calls = []
+
+    def __call__(self, prompt, **params):
+        self.gate.wait(2)
+        self.calls.append((prompt, params))
+        return {"choices": [{"text": " ok "}]}
+
+
+def test_requests_fail_fast_while_warming_up():
+    model = SlowLlama()
+    client = LocalLLMClient(workers=1, max_queue=4)
+    client._models[0] = model
+
+    thread = client.start_warmup()
+    assert client.warming_up and not client.is_ready
+
+    with pytest.raises(ModelWarmingUp):
+        asyncio.run(client.generate("hi"))
+
+    model.gate.set()
+    thread.join(2)
+
+    assert client.is_ready
+    assert model.calls[0][1]["max_tokens"] == 1   # крошечный прогревочный промпт
+    assert asyncio.run(client.generate("hi")) == "ok"
+    client.scheduler.close()
+
+
+def test_failed_warmup_falls_back_to_lazy_loading():
+    client = LocalLLMClient(workers=1, max_queue=4)
+
+    def broken(slot=0):
+        raise RuntimeError("model not found")
+
+    client._load_model = broken
+    client.start_warmup().join(2)
+
+    assert not client.is_ready
+    assert not client.warming_up
+    assert isinstance(client.warmup_error, RuntimeError)
+    client.scheduler.close()
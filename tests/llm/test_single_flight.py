@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from src.bot.ai.single_flight import SingleFlight, StreamFlights
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        return await asyncio.gather(*(flights.do("k", work) for _ in range(10)))
+
+    assert asyncio.run(main()) == ["answer"] * 10
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 9}
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        first = asyncio.ensure_future(flights.do("k", work))
+        second = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "answer"
+
+
+def test_last_waiter_gone_cancels_shared_task():
+    flights = SingleFlight()
+    finished = []
+
+    async def work():
+        await asyncio.sleep(1)
+        finished.append(1)
+
+    async def main():
+        waiter = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+        return len(flights)
+
+    assert asyncio.run(main()) == 0
+    assert finished == []
+
+
+def test_errors_are_fanned_out_and_key_is_released():
+    flights = SingleFlight()
+    calls = []
+
+    async def boom():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model failed")
+
+    async def main():
+        results = await asyncio.gather(
+            flights.do("k", boom), flights.do("k", boom), return_exceptions=True
+        )
+        again = await asyncio.gather(flights.do("k", boom), return_exceptions=True)
+        return results + again
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(calls) == 2   # второй вызов — новая попытка, не закэшированная ошибка
+
+
+async def _chunks(calls, n=3, delay=0.01):
+    calls.append(1)
+    for i in range(n):
+        await asyncio.sleep(delay)
+        yield str(i)
+
+
+def test_concurrent_streams_share_one_producer():
+    flights = StreamFlights()
+    calls = []
+
+    async def read():
+        return [c async for c in flights.stream("k", lambda: _chunks(calls))]
+
+    async def main():
+        first = asyncio.ensure_future(read())
+        await asyncio.sleep(0.015)                 # второй подключается посреди потока
+        return await asyncio.gather(first, read())
+
+    assert asyncio.run(main()) == [["0", "1", "2"]] * 2
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 1}
+
+
+def test_stream_error_reaches_every_listener():
+    flights = StreamFlights()
+
+    async def broken():
+        yield "0"
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model failed")
+
+    async def read():
+        got = []
+        try:
+            async for c in flights.stream("k", broken):
+                got.append(c)
+        except RuntimeError as e:
+            got.append(str(e))
+        return got
+
+    async def main():
+        return await asyncio.gather(read(), read())
+
+    assert asyncio.run(main()) == [["0", "model failed"]] * 2
+
+
+def test_last_listener_gone_stops_the_producer():
+    flights = StreamFlights()
+    calls = []
+
+    async def main():
+        stream = flights.stream("k", lambda: _chunks(calls, n=100))
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        again = [c async for c in flights.stream("k", lambda: _chunks(calls, n=1))]
+        return first, again
+
+    assert asyncio.run(main()) == ("0", ["0"])
+    assert len(calls) == 2
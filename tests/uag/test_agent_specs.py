@@ -0,0 +1,81 @@
+import dataclasses
+import os
+
+import pytest
+
+from src.agent.loader import AgentNotFound
+from src.uag.core.agent_specs import AgentSpecCache
+
+SPEC = """
+version: "1.0"
+role:
+  name: {role}
+  level: 1
+capabilities:
+  git: [read_repo, open_pr]
+  io: [read_file]
+constraints:
+  forbidden_intents: [delete_repo]
+  allowed_envs: [dev, stage]
+"""
+
+
+def _write_spec(registry, agent_id, role="builder", mtime_ns=None):
+    path = registry / f"{agent_id}.yaml"
+    path.write_text(SPEC.format(role=role), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_view_is_precomputed_and_frozen(tmp_path):
+    _write_spec(tmp_path, "agent_git")
+    cache = AgentSpecCache(registry=tmp_path)
+
+    view = cache.get("agent_git")
+
+    assert view.capabilities == frozenset({"read_repo", "open_pr", "read_file"})
+    assert view.forbidden_intents == frozenset({"delete_repo"})
+    assert view.allowed_envs == frozenset({"dev", "stage"})
+    assert (view.role_name, view.level, view.version) == ("builder", 1, "1.0")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        view.level = 5
+    with pytest.raises(TypeError):
+        view.spec["version"] = "2.0"
+
+
+def test_spec_is_parsed_once_until_the_file_changes(tmp_path):
+    _write_spec(tmp_path, "agent_git", mtime_ns=1_000_000_000)
+    cache = AgentSpecCache(registry=tmp_path, check_interval=0)
+
+    first = cache.get("agent_git")
+    assert cache.get("agent_git") is first
+    assert cache.loads == 1
+
+    _write_spec(tmp_path, "agent_git", role="reviewer", mtime_ns=2_000_000_000)
+
+    assert cache.get("agent_git").role_name == "reviewer"
+    assert cache.loads == 2
+
+
+def test_invalidate_forces_reload(tmp_path):
+    _write_spec(tmp_path, "agent_git")
+    _write_spec(tmp_path, "agent_io")
+    cache = AgentSpecCache(registry=tmp_path, check_interval=3600)
+
+    git, io = cache.get("agent_git"), cache.get("agent_io")
+
+    cache.invalidate("agent_git")
+    assert cache.get("agent_git") is not git
+    assert cache.get("agent_io") is io
+
+    cache.invalidate()
+    assert cache.get("agent_io") is not io
+    assert cache.loads == 4
+
+
+def test_unknown_agent_raises_like_the_loader(tmp_path):
+    cache = AgentSpecCache(registry=tmp_path)
+
+    with pytest.raises(AgentNotFound):
+        cache.get("ghost")
@@ -0,0 +1,60 @@
+import gzip
+import json
+import threading
+
+from src.uag.core.decision_log import DecisionLogWriter
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_lines_are_buffered_until_flush(tmp_path):
+    path = tmp_path / "audit.log"
+    writer = DecisionLogWriter(path, flush_bytes=10_000, flush_interval=60)
+
+    writer.write({"agent_id": "a", "decision": "ALLOW"})
+    assert not path.exists() or path.read_text(encoding="utf-8") == ""
+
+    writer.flush()
+    assert _read_lines(path) == [{"agent_id": "a", "decision": "ALLOW"}]
+
+    writer.close()
+
+
+def test_size_rotation_compresses_segments(tmp_path):
+    path = tmp_path / "audit.log"
+    writer = DecisionLogWriter(path, max_bytes=200, flush_bytes=1, backup_count=50)
+
+    for i in range(20):
+        writer.write({"i": i, "pad": "x" * 40})
+    writer.close()
+
+    segments = sorted(tmp_path.glob("audit.log.*.gz"))
+    assert segments
+
+    records = []
+    for seg in segments:
+        with gzip.open(seg, "rt", encoding="utf-8") as f:
+            records += [json.loads(line) for line in f]
+    records += _read_lines(path)
+
+    assert sorted(r["i"] for r in records) == list(range(20))
+
+
+def test_concurrent_writers_do_not_interleave_lines(tmp_path):
+    path = tmp_path / "audit.log"
+    writer = DecisionLogWriter(path, flush_bytes=512)
+
+    def worker(n):
+        for i in range(200):
+            writer.write({"worker": n, "i": i})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+
+    assert len(_read_lines(path)) == 800
@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+from jsonschema.exceptions import SchemaError
+
+from src.uag.core.schema_registry import SchemaRegistry
+
+
+def _write_schema(path, required, mtime_ns=None):
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "type": "object",
+        "required": required,
+    }
+    path.write_text(json.dumps(schema), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_validator_is_compiled_once(tmp_path):
+    path = tmp_path / "request.json"
+    _write_schema(path, ["agent_id"])
+    registry = SchemaRegistry(check_interval=0)
+
+    first = registry.get(path)
+    assert registry.get(path) is first
+    assert registry.is_valid(path, {"agent_id": "a"})
+    assert registry.best_error(path, {}).validator == "required"
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    path = tmp_path / "request.json"
+    _write_schema(path, ["agent_id"], mtime_ns=1_000_000_000)
+    registry = SchemaRegistry(check_interval=0)
+
+    first = registry.get(path)
+    _write_schema(path, ["agent_id", "intent"], mtime_ns=2_000_000_000)
+
+    assert registry.get(path) is not first
+    assert not registry.is_valid(path, {"agent_id": "a"})
+
+
+def test_stat_is_throttled_and_invalidate_forces_reload(tmp_path):
+    path = tmp_path / "request.json"
+    _write_schema(path, ["agent_id"], mtime_ns=1_000_000_000)
+    registry = SchemaRegistry(check_interval=3600)
+
+    first = registry.get(path)
+    _write_schema(path, ["agent_id", "intent"], mtime_ns=2_000_000_000)
+    assert registry.get(path) is first            # within check_interval
+
+    registry.invalidate(path)
+    assert registry.get(path) is not first
+
+
+def test_removed_file_keeps_last_validator(tmp_path):
+    path = tmp_path / "request.json"
+    _write_schema(path, ["agent_id"])
+    registry = SchemaRegistry(check_interval=0)
+
+    first = registry.get(path)
+    path.unlink()
+
+    assert registry.get(path) is first
+
+
+def test_preload_rejects_invalid_schema_and_skips_missing(tmp_path):
+    broken = tmp_path / "broken.json"
+    broken.write_text(json.dumps({"type": 42}), encoding="utf-8")
+    registry = SchemaRegistry()
+
+    registry.preload(tmp_path / "missing.json")
+    with pytest.raises(SchemaError):
+        registry.preload(broken)